@@ -5,12 +5,26 @@ CLI-приложение "Персональный трекер прогресс
 - Создание пользователя (если не существует).
 - Управление темами: добавление, просмотр.
 - Добавление ресурсов, заметок и прогресса к теме.
+- Полнотекстовый поиск по темам, заметкам и ресурсам.
+- Статистика прогресса: скорость, скользящее среднее, прогноз до 100%.
+- Пакетный импорт из CSV, JSON Lines и HTML-закладок:
+  python app.py import FILE [--format csv|jsonl|bookmarks]
+- Потоковый экспорт в Markdown, CSV и JSON Lines:
+  python app.py export FILE [--format markdown|csv|jsonl]
+- Неинтерактивные команды (add-topic, add-resource, add-note, progress,
+  list, show, info) и пакетный режим --batch FILE: все команды файла
+  выполняются в одной FileStorage.session() (одна загрузка и запись).
+- Несколько пользователей: --user NAME работает с разделом пользователя
+  в data/users (см. storage.multi_user) вместо data/data.json.
 - Сохранение в JSON через FileStorage (автосохранение в конце session()).
 """
 
 from __future__ import annotations
 
-from typing import Callable
+import argparse
+import shlex
+import sys
+from typing import Callable, TextIO, TYPE_CHECKING
 
 from core.utils import validate_url, find_topic_by_title
 from models.note import Note
@@ -19,6 +33,12 @@ from models.resource import  Resource
 from models.topic import Topic
 from storage.file_storage import FileStorage
 
+if TYPE_CHECKING:
+    from models.user import User
+
+# Импорт/экспорт, статистика и поиск подключаются внутри команд, которые
+# их используют: запуск меню и простых команд не платит за их импорт.
+
 def _input_non_empty(promt:str) -> str:
     """Запрашивает непустую строку у пользователя
     
@@ -86,17 +106,21 @@ def _chose_topic(user) -> Topic | None:
     for i , t in enumerate(user.topics , start=1):
         print(f"{i}. {t.title}")
 
-        title = _input_non_empty("Введите точное название темы")
-        topic = find_topic_by_title(user,title)
-        if topic is None:
-            print("Тема не найдена")
-        return topic
+    title = _input_non_empty("Введите точное название темы")
+    topic = find_topic_by_title(user,title)
+    if topic is None:
+        print("Тема не найдена")
+    return topic
 
 def cmd_show_user(storage: FileStorage) -> None:
-    """Показывает пользователя и краткую статистику"""
-    with storage.session() as user:
-        print(f"Пользователь. {user.username}")
-        print(f"Тем: {len(user.topics)}")
+    """Показывает пользователя и количество тем (без загрузки тем)"""
+    summary = storage.summary()
+    if summary is None:
+        print("Пользователь не найден")
+        return
+
+    print(f"Пользователь: {summary['username']}")
+    print(f"Тем: {summary['topics']}")
 
 
 def cmd_set_username(storage:FileStorage) -> None:
@@ -176,6 +200,33 @@ def cmd_update_progress(storage:FileStorage) -> None:
         print("Прогресс обновлен")
 
 
+def _print_topic(topic: Topic) -> None:
+    """Печатает тему с ресурсами, заметками и прогрессом"""
+    print(f"Тема: {topic.title}")
+    print(f"Описание: {topic.description}")
+
+    print("\nРесурсы")
+    if topic.resources:
+        for r in topic.resources:
+            print(f"- {r}")
+    else:
+        print("- (пусто)")
+
+    print("\nЗаметки:")
+    if topic.notes:
+        for n in topic.notes:
+            print(f"- {n}")
+    else:
+        print("- (пусто)")
+
+    print("\nПрогресс:")
+    if topic.progress:
+        for p in topic.progress:
+            print(f"- {p}")
+    else:
+        print("- (пусто)")
+
+
 def cmd_show_topic_details(strorage:FileStorage) -> None:
     """показывает детали выбранной темы"""
     with strorage.session() as user:
@@ -183,46 +234,313 @@ def cmd_show_topic_details(strorage:FileStorage) -> None:
         if topic is None:
             return
         
-        print(f"Тема: {topic.title}")
-        print(f"Описание: {topic.description}")
-
-        print("\nРесурсы")
-        if topic.resources:
-            for r in topic.resources:
-                print(f"- {r}")
-        else:
-            print("- (пусто)")
-
-        print("\nЗаметки:")
-        if topic.notes:
-            for n in topic.notes:
-                print(f"- {n}")
-        else:
-            print("- (пусто)")
-
-        print("\nПрогресс:")
-        if topic.progress:
-            for p in topic.progress:
-                print(f"- {p}")
-        else:
-            print("- (пусто)")   
+        _print_topic(topic)
+
+
+def cmd_search(storage: FileStorage) -> None:
+    """Ищет по темам, заметкам и ресурсам"""
+    query = _input_non_empty("Поисковый запрос:")
+    hits = storage.search(query)
+    if not hits:
+        print("Ничего не найдено")
+        return
+
+    for i , hit in enumerate(hits,start=1):
+        print(f"{i}. {hit}")
+
+
+def cmd_stats(storage: FileStorage) -> None:
+    """Показывает статистику прогресса по всем темам"""
+    user = storage.get_user()
+    if not user.topics:
+        print("Тем пока нет.")
+        return
+
+    for stats in storage.progress_stats():
+        print(f"- {stats}")
+
 
 def ensure_user_exists(storage: FileStorage) -> None:
     """
     Гарантирует наличие пользователя в хранилище.
     Если пользователя нет — создаёт (спросив имя).
     """
-    user = storage.get_user()
-    if user is not None:
+    if storage.has_user():
         return
 
     username = _input_non_empty("Пользователь не найден. Введите имя пользователя: ")
     storage.create_user(username)
 
 
-def main() -> None:
-    """Точка входа CLI."""
-    storage = FileStorage("data/data.json")
+def run_import(storage: FileStorage, path: str, fmt: str | None = None) -> None:
+    """
+    Импортирует файл одной записью в хранилище и печатает отчет.
+
+    Args:
+        storage: Хранилище.
+        path: Путь к файлу.
+        fmt: Формат (по умолчанию — по расширению файла).
+    """
+    from storage.importer import import_file
+
+    try:
+        report = import_file(storage, path, fmt=fmt)
+    except (OSError, ValueError) as exc:
+        print(f"Ошибка импорта: {exc}. Хранилище не изменено.")
+        return
+
+    print(report)
+    for error in report.errors:
+        print(f"- {error}")
+
+
+def run_export(storage: FileStorage, path: str, fmt: str | None = None) -> None:
+    """
+    Экспортирует базу знаний в файл по частям.
+
+    Args:
+        storage: Хранилище.
+        path: Путь к создаваемому файлу.
+        fmt: Формат (по умолчанию — по расширению файла).
+    """
+    from storage.exporter import export_file
+
+    try:
+        written = export_file(storage, path, fmt=fmt)
+    except (OSError, ValueError) as exc:
+        print(f"Ошибка экспорта: {exc}")
+        return
+
+    print(f"Экспортировано в {path} ({written} символов)")
+
+
+def _require_topic(user: User, title: str) -> Topic:
+    """
+    Возвращает тему по названию.
+
+    Raises:
+        ValueError: Если темы нет
+    """
+    topic = find_topic_by_title(user, title)
+    if topic is None:
+        raise ValueError(f"Тема не найдена: {title}")
+    return topic
+
+
+def do_add_topic(user: User, args: argparse.Namespace) -> None:
+    """Команда add-topic: добавляет тему"""
+    user.add_topic(Topic(title=args.title, description=args.description))
+    print(f"Тема добавлена: {args.title}")
+
+
+def do_add_resource(user: User, args: argparse.Namespace) -> None:
+    """Команда add-resource: добавляет ресурс к теме"""
+    topic = _require_topic(user, args.topic)
+    if args.type == "link" and not validate_url(args.content):
+        raise ValueError(f"URL не прошел валидацию: {args.content}")
+    topic.add_resource(Resource(res_type=args.type, content=args.content))
+    print(f"Ресурс добавлен: {topic.title}")
+
+
+def do_add_note(user: User, args: argparse.Namespace) -> None:
+    """Команда add-note: добавляет заметку к теме"""
+    topic = _require_topic(user, args.topic)
+    topic.add_note(Note(text=args.text))
+    print(f"Заметка добавлена: {topic.title}")
+
+
+def do_progress(user: User, args: argparse.Namespace) -> None:
+    """Команда progress: добавляет запись прогресса к теме"""
+    topic = _require_topic(user, args.topic)
+    topic.add_progress(ProgressEntry(percent=args.percent))
+    print(f"Прогресс обновлен: {topic.title} {args.percent}%")
+
+
+def do_list(user: User, args: argparse.Namespace) -> None:
+    """Команда list: показывает все темы"""
+    if not user.topics:
+        print("Тем пока нет")
+        return
+    for i, t in enumerate(user.topics, start=1):
+        print(f"{i}. {t.title} - {t.description}")
+
+
+def do_show(user: User, args: argparse.Namespace) -> None:
+    """Команда show: показывает детали темы"""
+    _print_topic(_require_topic(user, args.topic))
+
+
+def _percent(value: str) -> int:
+    """Тип аргумента argparse: процент 0..100"""
+    try:
+        percent = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"не число: {value}")
+    if not 0 <= percent <= 100:
+        raise argparse.ArgumentTypeError("процент должен быть в диапазоне 0..100")
+    return percent
+
+
+def _run_command(user: User, args: argparse.Namespace, prefix: str = "") -> bool:
+    """
+    Выполняет неинтерактивную команду над пользователем.
+
+    Args:
+        user: Пользователь текущей сессии.
+        args: Разобранные аргументы (с обработчиком в args.handler).
+        prefix: Префикс сообщения об ошибке (например, номер строки).
+
+    Returns:
+        True, если команда выполнена без ошибок.
+    """
+    try:
+        args.handler(user, args)
+    except ValueError as exc:
+        print(f"{prefix}Ошибка: {exc}")
+        return False
+    return True
+
+
+def run_batch(storage: FileStorage, f: TextIO, parser: argparse.ArgumentParser) -> None:
+    """
+    Выполняет команды из файла (по одной на строку) в одной сессии.
+
+    Пустые строки и строки, начинающиеся с '#', пропускаются. Строка с
+    ошибкой не прерывает выполнение остальных; изменения сохраняются
+    одной записью после последней команды.
+
+    Args:
+        storage: Хранилище.
+        f: Открытый файл со строками вида 'add-note "Python" "Текст"'.
+        parser: Разборщик аргументов (build_parser()).
+    """
+    done = failed = 0
+    with storage.session() as user:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            prefix = f"Строка {number}: "
+            try:
+                args = parser.parse_args(shlex.split(line))
+            except (SystemExit, ValueError):
+                print(f"{prefix}Ошибка: не удалось разобрать команду")
+                failed += 1
+                continue
+            if getattr(args, "handler", None) is None:
+                print(f"{prefix}Ошибка: команда недоступна в пакетном режиме")
+                failed += 1
+                continue
+
+            if _run_command(user, args, prefix):
+                done += 1
+            else:
+                failed += 1
+    print(f"Выполнено команд: {done}, с ошибками: {failed}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создает разборщик аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="Персональный трекер прогресса")
+    parser.add_argument(
+        "--user",
+        metavar="NAME",
+        help="работать с разделом пользователя в data/users",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="выполнить команды из файла ('-' — stdin) в одной сессии",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    cmd = commands.add_parser("add-topic", help="добавить тему")
+    cmd.add_argument("title", help="название темы")
+    cmd.add_argument("-d", "--description", default="", help="описание темы")
+    cmd.set_defaults(handler=do_add_topic)
+
+    cmd = commands.add_parser("add-resource", help="добавить ресурс к теме")
+    cmd.add_argument("topic", help="название темы")
+    cmd.add_argument("content", help="URL или текст")
+    cmd.add_argument("-t", "--type", choices=("link", "text"), default="link", help="тип ресурса")
+    cmd.set_defaults(handler=do_add_resource)
+
+    cmd = commands.add_parser("add-note", help="добавить заметку к теме")
+    cmd.add_argument("topic", help="название темы")
+    cmd.add_argument("text", help="текст заметки")
+    cmd.set_defaults(handler=do_add_note)
+
+    cmd = commands.add_parser("progress", help="добавить запись прогресса")
+    cmd.add_argument("topic", help="название темы")
+    cmd.add_argument("percent", type=_percent, help="процент выполнения (0..100)")
+    cmd.set_defaults(handler=do_progress)
+
+    cmd = commands.add_parser("list", help="список тем")
+    cmd.set_defaults(handler=do_list)
+
+    cmd = commands.add_parser("show", help="детали темы")
+    cmd.add_argument("topic", help="название темы")
+    cmd.set_defaults(handler=do_show)
+
+    commands.add_parser("info", help="имя пользователя и количество тем")
+
+    import_parser = commands.add_parser("import", help="пакетный импорт из файла")
+    import_parser.add_argument("file", help="CSV, JSON Lines или HTML-экспорт закладок")
+    import_parser.add_argument("--format", help="csv, jsonl или bookmarks (по умолчанию — по расширению)")
+
+    export_parser = commands.add_parser("export", help="экспорт базы знаний в файл")
+    export_parser.add_argument("file", help="файл .md, .csv или .jsonl")
+    export_parser.add_argument("--format", help="markdown, csv или jsonl (по умолчанию — по расширению)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Точка входа CLI.
+
+    Args:
+        argv: Аргументы командной строки; без команды запускается меню.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv or [])
+    if args.user is not None:
+        from storage.multi_user import MultiUserStorage
+
+        users = MultiUserStorage("data/users")
+        try:
+            storage = users.storage_for(args.user)
+            if not storage.has_user():
+                users.create_user(args.user)
+        except ValueError as exc:
+            print(f"Ошибка: {exc}")
+            return
+    else:
+        storage = FileStorage("data/data.json")
+    if args.batch == "-":
+        run_batch(storage, sys.stdin, parser)
+        return
+    if args.batch:
+        try:
+            with open(args.batch, "r", encoding="utf-8") as f:
+                run_batch(storage, f, parser)
+        except OSError as exc:
+            print(f"Ошибка: {exc}")
+        return
+    if getattr(args, "handler", None) is not None:
+        with storage.session() as user:
+            _run_command(user, args)
+        return
+    if args.command == "info":
+        cmd_show_user(storage)
+        return
+    if args.command == "import":
+        run_import(storage, args.file, args.format)
+        return
+    if args.command == "export":
+        run_export(storage, args.file, args.format)
+        return
+
     ensure_user_exists(storage)
 
     actions: dict[str, tuple[str, Callable[[FileStorage], None]]] = {
@@ -234,6 +552,8 @@ def main() -> None:
         "6": ("Добавить заметку в тему", cmd_add_note),
         "7": ("Обновить прогресс по теме", cmd_update_progress),
         "8": ("Показать детали темы", cmd_show_topic_details),
+        "9": ("Поиск", cmd_search),
+        "10": ("Статистика прогресса", cmd_stats),
         "0": ("Выход", lambda _: None),
     }
 
@@ -257,4 +577,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
\ No newline at end of file
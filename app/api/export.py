@@ -0,0 +1,45 @@
+"""
+API-роуты экспорта базы знаний.
+
+Экспорт базы знаний CLI (data/data.json) отдается потоково: темы читаются
+по одной, а ответ формируется по частям через StreamingResponse.
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.search import KB_PREFIX, KB_TAGS, get_storage
+from storage.exporter import EXTENSIONS, MEDIA_TYPES, iter_export
+from storage.file_storage import FileStorage
+
+router = APIRouter(
+    prefix=f"{KB_PREFIX}/export",
+    tags=KB_TAGS,
+)
+
+
+@router.get("")
+def export(
+    format: Literal["markdown", "csv", "jsonl"] = Query("markdown", description="Формат экспорта"),
+    storage: FileStorage = Depends(get_storage),
+) -> StreamingResponse:
+    """
+    Экспортирует темы с ресурсами, заметками и прогрессом.
+
+    Args:
+        format: Формат экспорта.
+        storage: Хранилище базы знаний.
+
+    Returns:
+        Потоковый ответ с файлом экспорта.
+    """
+    filename = f"knowledge_base{EXTENSIONS[format]}"
+    return StreamingResponse(
+        iter_export(storage, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
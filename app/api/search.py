@@ -0,0 +1,78 @@
+"""
+API-роуты полнотекстового поиска.
+
+Поиск идет по базе знаний CLI (data/data.json): темам, заметкам и ресурсам.
+С параметром ?user=... используется раздел пользователя в data/users
+(см. storage.multi_user).
+
+Темы, заметки и прогресс, созданные через /topics, хранятся в SQLite и
+сюда не попадают, поэтому роуты базы знаний CLI (поиск, статистика,
+экспорт) собраны под префиксом /kb и тегом "cli-knowledge-base".
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.schemas.search import SearchHitRead
+from storage.file_storage import FileStorage
+from storage.multi_user import MultiUserStorage
+
+# Префикс и тег роутов базы знаний CLI (см. stats.py, export.py)
+KB_PREFIX = "/kb"
+KB_TAGS = ["cli-knowledge-base"]
+
+router = APIRouter(
+    prefix=f"{KB_PREFIX}/search",
+    tags=KB_TAGS,
+)
+
+_storage = FileStorage("data/data.json", threadsafe=True)
+_users = MultiUserStorage("data/users", threadsafe=True)
+
+
+def get_storage(
+    user: str | None = Query(None, min_length=1, description="Пользователь (раздел в data/users)"),
+) -> FileStorage:
+    """
+    Зависимость FastAPI для получения хранилища базы знаний.
+
+    Хранилища общие для всех запросов: пользователь и поисковый индекс
+    держатся в памяти и перечитываются только при изменении файла.
+    Запросы разных пользователей работают с разными файлами.
+
+    Args:
+        user: Имя пользователя; без него — общий data/data.json.
+
+    Returns:
+        Экземпляр FileStorage.
+
+    Raises:
+        HTTPException: 404, если пользователя нет.
+    """
+    if user is None:
+        return _storage
+    # Проверяется файл раздела, а не index.json: индекс не читается на каждый запрос
+    if not _users.has_user(user):
+        raise HTTPException(status_code=404, detail="Пользователь не найден")
+    return _users.storage_for(user)
+
+
+@router.get("", response_model=list[SearchHitRead])
+def search(
+    q: str = Query(min_length=1, description="Поисковый запрос"),
+    limit: int = Query(20, ge=1, le=100),
+    storage: FileStorage = Depends(get_storage),
+) -> list[SearchHitRead]:
+    """
+    Ищет по темам, заметкам и ресурсам базы знаний CLI.
+
+    Args:
+        q: Строка запроса.
+        limit: Максимальное количество результатов.
+        storage: Хранилище базы знаний.
+
+    Returns:
+        Результаты по убыванию релевантности.
+    """
+    return [SearchHitRead(**hit.to_dict()) for hit in storage.search(q, limit)]
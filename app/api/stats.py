@@ -0,0 +1,38 @@
+"""
+API-роуты статистики прогресса.
+
+Статистика считается по базе знаний CLI (data/data.json) сразу для всех
+тем через колоночное представление истории прогресса, которое хранилище
+держит в памяти между запросами (FileStorage.progress_stats).
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.search import KB_PREFIX, KB_TAGS, get_storage
+from app.schemas.stats import TopicStatsRead
+from storage.file_storage import FileStorage
+
+router = APIRouter(
+    prefix=f"{KB_PREFIX}/stats",
+    tags=KB_TAGS,
+)
+
+
+@router.get("", response_model=list[TopicStatsRead])
+def progress_stats(
+    window: int = Query(3, ge=1, le=100, description="Окно скользящего среднего"),
+    storage: FileStorage = Depends(get_storage),
+) -> list[TopicStatsRead]:
+    """
+    Возвращает статистику прогресса по всем темам.
+
+    Args:
+        window: Размер окна скользящего среднего (записей).
+        storage: Хранилище базы знаний.
+
+    Returns:
+        Статистика в порядке тем (пустой список, если пользователя нет).
+    """
+    return [TopicStatsRead(**stats.to_dict()) for stats in storage.progress_stats(window)]
@@ -2,16 +2,31 @@
 API-роуты для работы с темами, ресурсами, заметками и прогрессом.
 
 На этом этапе темы хранятся в базе данных SQLite через SQLAlchemy.
+Обработчики асинхронные (AsyncSession, aiosqlite): ожидание БД
+не занимает поток пула FastAPI.
 """
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Literal
 
-from app.db.database import get_db
-from app.schemas.topic import TopicCreate, TopicRead
-from app.services import topic_service
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_async_db
+from app.db.models import TopicModel
+from app.schemas.topic import (
+    NoteCreate,
+    NoteRead,
+    ProgressCreate,
+    ProgressRead,
+    ResourceCreate,
+    ResourceRead,
+    TopicCreate,
+    TopicPage,
+    TopicRead,
+)
+from app.services import item_service, topic_service
 
 router = APIRouter(
     prefix="/topics",
@@ -19,28 +34,68 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=list[TopicRead])
-def list_topics(db: Session = Depends(get_db)) -> list[TopicRead]:
+async def _topic_or_404(db: AsyncSession, title: str) -> TopicModel:
+    """
+    Находит тему по названию.
+
+    Raises:
+        HTTPException: Если тема не найдена (404).
+    """
+    topic = await topic_service.get_topic_by_title(db, title)
+    if topic is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Тема не найдена",
+        )
+    return topic
+
+
+@router.get("", response_model=TopicPage)
+async def list_topics(
+    limit: int = Query(
+        topic_service.DEFAULT_LIMIT, ge=1, le=topic_service.MAX_LIMIT,
+        description="Размер страницы",
+    ),
+    cursor: str | None = Query(None, description="next_cursor из предыдущей страницы"),
+    prefix: str | None = Query(None, min_length=1, max_length=200, description="Начало названия"),
+    sort: Literal["id", "-id", "title", "-title"] = Query("id", description="Сортировка"),
+    db: AsyncSession = Depends(get_async_db),
+) -> TopicPage:
     """
-    Возвращает список всех тем.
+    Возвращает страницу списка тем.
+
+    Следующая страница запрашивается с cursor=next_cursor и теми же
+    prefix и sort; next_cursor равен null на последней странице.
 
     Args:
+        limit: Размер страницы.
+        cursor: Курсор следующей страницы.
+        prefix: Фильтр по началу названия.
+        sort: Сортировка по id или title ("-" — по убыванию).
         db: Сессия базы данных, предоставленная через Depends.
 
     Returns:
-        Список тем в виде схем TopicRead.
+        Страница тем в виде схемы TopicPage.
+
+    Raises:
+        HTTPException: Если курсор некорректен (400).
     """
-    topics = topic_service.get_topics(db)
-    return [
-        TopicRead(title=t.title, description=t.description)
-        for t in topics
-    ]
+    try:
+        topics, next_cursor = await topic_service.get_topics_page(
+            db, limit=limit, cursor=cursor, prefix=prefix, sort=sort
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return TopicPage(
+        items=[TopicRead(title=t.title, description=t.description) for t in topics],
+        next_cursor=next_cursor,
+    )
 
 
 @router.post("", response_model=TopicRead, status_code=201)
-def create_topic(
+async def create_topic(
     payload: TopicCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> TopicRead:
     """
     Создаёт новую тему.
@@ -53,23 +108,21 @@ def create_topic(
         Созданная тема в виде схемы TopicRead.
 
     Raises:
-        HTTPException: Если тема с таким названием уже существует.
+        HTTPException: Если тема с таким названием уже существует (409).
     """
-    existing = topic_service.get_topic_by_title(db, payload.title)
-    if existing is not None:
+    topic = await topic_service.create_topic(db, payload)
+    if topic is None:
         raise HTTPException(
             status_code=409,
             detail="Тема уже существует",
         )
-
-    topic = topic_service.create_topic(db, payload)
     return TopicRead(title=topic.title, description=topic.description)
 
 
 @router.get("/{title}", response_model=TopicRead)
-def get_topic(
+async def get_topic(
     title: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> TopicRead:
     """
     Возвращает тему по названию.
@@ -84,10 +137,197 @@ def get_topic(
     Raises:
         HTTPException: Если тема не найдена (404).
     """
-    topic = topic_service.get_topic_by_title(db, title)
-    if topic is None:
+    topic = await _topic_or_404(db, title)
+    return TopicRead(title=topic.title, description=topic.description)
+
+
+_LIMIT = Query(
+    item_service.DEFAULT_LIMIT, ge=1, le=item_service.MAX_LIMIT,
+    description="Сколько последних записей вернуть",
+)
+_BEFORE = Query(None, ge=1, description="Только записи с id меньше этого (следующая порция)")
+
+
+@router.post("/{title}/resources", response_model=ResourceRead, status_code=201)
+async def add_resource(
+    title: str,
+    payload: ResourceCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> ResourceRead:
+    """
+    Добавляет ресурс к теме.
+
+    Args:
+        title: Название темы.
+        payload: Тип и содержимое ресурса.
+        db: Сессия базы данных.
+
+    Returns:
+        Созданный ресурс.
+
+    Raises:
+        HTTPException: Если тема не найдена (404) или ссылка некорректна (422).
+    """
+    topic = await _topic_or_404(db, title)
+    try:
+        resource = await item_service.add_resource(db, topic.id, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return ResourceRead.model_validate(resource)
+
+
+@router.get("/{title}/resources", response_model=list[ResourceRead])
+async def list_resources(
+    title: str,
+    limit: int = _LIMIT,
+    before: int | None = _BEFORE,
+    db: AsyncSession = Depends(get_async_db),
+) -> list[ResourceRead]:
+    """
+    Возвращает последние ресурсы темы (от новых к старым).
+
+    Args:
+        title: Название темы.
+        limit: Количество ресурсов.
+        before: id, до которого продолжить список.
+        db: Сессия базы данных.
+
+    Returns:
+        Список ресурсов.
+
+    Raises:
+        HTTPException: Если тема не найдена (404).
+    """
+    topic = await _topic_or_404(db, title)
+    resources = await item_service.list_resources(db, topic.id, limit=limit, before=before)
+    return [ResourceRead.model_validate(r) for r in resources]
+
+
+@router.post("/{title}/notes", response_model=NoteRead, status_code=201)
+async def add_note(
+    title: str,
+    payload: NoteCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> NoteRead:
+    """
+    Добавляет заметку к теме.
+
+    Args:
+        title: Название темы.
+        payload: Текст заметки.
+        db: Сессия базы данных.
+
+    Returns:
+        Созданная заметка.
+
+    Raises:
+        HTTPException: Если тема не найдена (404).
+    """
+    topic = await _topic_or_404(db, title)
+    note = await item_service.add_note(db, topic.id, payload)
+    return NoteRead.model_validate(note)
+
+
+@router.get("/{title}/notes", response_model=list[NoteRead])
+async def list_notes(
+    title: str,
+    limit: int = _LIMIT,
+    before: int | None = _BEFORE,
+    db: AsyncSession = Depends(get_async_db),
+) -> list[NoteRead]:
+    """
+    Возвращает последние заметки темы (от новых к старым).
+
+    Args:
+        title: Название темы.
+        limit: Количество заметок.
+        before: id, до которого продолжить список.
+        db: Сессия базы данных.
+
+    Returns:
+        Список заметок.
+
+    Raises:
+        HTTPException: Если тема не найдена (404).
+    """
+    topic = await _topic_or_404(db, title)
+    notes = await item_service.list_notes(db, topic.id, limit=limit, before=before)
+    return [NoteRead.model_validate(n) for n in notes]
+
+
+@router.post("/{title}/progress", response_model=ProgressRead, status_code=201)
+async def add_progress(
+    title: str,
+    payload: ProgressCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> ProgressRead:
+    """
+    Добавляет запись прогресса по теме.
+
+    Args:
+        title: Название темы.
+        payload: Процент выполнения.
+        db: Сессия базы данных.
+
+    Returns:
+        Созданная запись.
+
+    Raises:
+        HTTPException: Если тема не найдена (404).
+    """
+    topic = await _topic_or_404(db, title)
+    entry = await item_service.add_progress(db, topic.id, payload)
+    return ProgressRead.model_validate(entry)
+
+
+@router.get("/{title}/progress", response_model=list[ProgressRead])
+async def list_progress(
+    title: str,
+    limit: int = _LIMIT,
+    db: AsyncSession = Depends(get_async_db),
+) -> list[ProgressRead]:
+    """
+    Возвращает последние записи прогресса темы (от новых к старым).
+
+    Args:
+        title: Название темы.
+        limit: Количество записей.
+        db: Сессия базы данных.
+
+    Returns:
+        Список записей прогресса.
+
+    Raises:
+        HTTPException: Если тема не найдена (404).
+    """
+    topic = await _topic_or_404(db, title)
+    entries = await item_service.list_progress(db, topic.id, limit=limit)
+    return [ProgressRead.model_validate(p) for p in entries]
+
+
+@router.get("/{title}/progress/latest", response_model=ProgressRead)
+async def get_latest_progress(
+    title: str,
+    db: AsyncSession = Depends(get_async_db),
+) -> ProgressRead:
+    """
+    Возвращает последнюю запись прогресса темы.
+
+    Args:
+        title: Название темы.
+        db: Сессия базы данных.
+
+    Returns:
+        Запись с наибольшей датой.
+
+    Raises:
+        HTTPException: Если тема не найдена или прогресса еще нет (404).
+    """
+    topic = await _topic_or_404(db, title)
+    entry = await item_service.get_latest_progress(db, topic.id)
+    if entry is None:
         raise HTTPException(
             status_code=404,
-            detail="Тема не найдена",
+            detail="Прогресса по теме нет",
         )
-    return TopicRead(title=topic.title, description=topic.description)
+    return ProgressRead.model_validate(entry)
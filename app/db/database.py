@@ -6,13 +6,24 @@
 
 from __future__ import annotations
 
-from typing import Generator
+from typing import Any, AsyncGenerator, Generator, Mapping
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker , DeclarativeBase , Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+
+from app.db.sqlite_tuning import SQLITE_PRAGMAS, apply_pragmas
 
 
 DATABASE_URL = "sqlite:///./data/tracker.db"
+# Та же база через асинхронный драйвер aiosqlite
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./data/tracker.db"
+
+# Подключения SQLite дешевые, но PRAGMA выполняются на каждом новом:
+# пул держит их открытыми между запросами
+POOL_SIZE = 10
+MAX_OVERFLOW = 20
 
 class Base(DeclarativeBase):
     """Базовый класс для всех ORM-моделей
@@ -20,10 +31,85 @@ class Base(DeclarativeBase):
     Используется как родитель для декларативных моделей SQLCHEMY
     """
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread":False},
-)
+def create_sqlite_engine(
+    url: str = DATABASE_URL,
+    pragmas: Mapping[str, Any] | None = None,
+    **options: Any,
+) -> Engine:
+    """
+    Создает engine SQLite с профилем PRAGMA на каждом подключении.
+
+    Файловая база использует QueuePool (в режиме WAL подключения
+    читают параллельно), база в памяти — одно общее подключение
+    (StaticPool), иначе у каждого подключения была бы своя база.
+
+    Args:
+        url: URL базы данных.
+        pragmas: Параметры PRAGMA (по умолчанию SQLITE_PRAGMAS,
+            см. app.db.sqlite_tuning.sqlite_pragmas).
+        **options: Дополнительные аргументы create_engine.
+
+    Returns:
+        Настроенный engine.
+    """
+    _pool_options(url, options, QueuePool)
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread":False},
+        **options,
+    )
+    _listen_pragmas(engine, pragmas)
+    return engine
+
+
+def create_async_sqlite_engine(
+    url: str = ASYNC_DATABASE_URL,
+    pragmas: Mapping[str, Any] | None = None,
+    **options: Any,
+) -> AsyncEngine:
+    """
+    Создает асинхронный engine SQLite (aiosqlite) с профилем PRAGMA.
+
+    Запросы выполняются в потоке драйвера и не блокируют цикл событий,
+    поэтому обработчик ждет БД, не занимая поток пула FastAPI.
+
+    Args:
+        url: URL базы данных (sqlite+aiosqlite://...).
+        pragmas: Параметры PRAGMA (по умолчанию SQLITE_PRAGMAS).
+        **options: Дополнительные аргументы create_async_engine.
+
+    Returns:
+        Настроенный асинхронный engine.
+    """
+    _pool_options(url, options, AsyncAdaptedQueuePool)
+    engine = create_async_engine(url, **options)
+    # События подключения регистрируются на синхронном engine-обертке
+    _listen_pragmas(engine.sync_engine, pragmas)
+    return engine
+
+
+def _pool_options(url: str, options: dict, queue_pool: type) -> None:
+    """Выбирает пул: общее подключение для :memory:, иначе очередь подключений."""
+    # "sqlite://" без пути к файлу — тоже база в памяти
+    if ":memory:" in url or url.rstrip("/").endswith(":"):
+        options.setdefault("poolclass", StaticPool)
+    else:
+        options.setdefault("poolclass", queue_pool)
+        options.setdefault("pool_size", POOL_SIZE)
+        options.setdefault("max_overflow", MAX_OVERFLOW)
+
+
+def _listen_pragmas(engine: Engine, pragmas: Mapping[str, Any] | None) -> None:
+    """Выполняет PRAGMA на каждом новом подключении engine."""
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        apply_pragmas(dbapi_connection, pragmas)
+
+
+engine = create_sqlite_engine()
+async_engine = create_async_sqlite_engine()
 
 SessionLocal = sessionmaker(
     autocommit= False,
@@ -45,4 +131,23 @@ def get_db() -> Generator[Session,None,None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    # Объекты остаются доступны после commit без повторного запроса
+    expire_on_commit=False,
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Асинхронная зависимость FastAPI для получения сессии БД на запрос.
+
+    Yields:
+        Экземпляр AsyncSession (закрывается после обработки запроса).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,12 +1,23 @@
 """
 ORM-модели SQLAlchemy для хранения данных трекера в БД.
 
-Пока реализована только модель Topic.
+Темы и их ресурсы, заметки и записи прогресса. Дочерние таблицы
+ссылаются на тему через topic_id (ON DELETE CASCADE) и индексированы
+так, чтобы выборка "последние N записей темы" шла по индексу без
+сканирования таблицы:
+
+- notes, resources: индекс по topic_id; в SQLite индекс хранит и
+  rowid (id), поэтому WHERE topic_id = ? ORDER BY id DESC LIMIT n
+  читает только n записей индекса;
+- progress: составной индекс (topic_id, date) — последняя запись
+  прогресса темы берется с конца диапазона индекса.
 """
 
 from __future__ import annotations
 
-from sqlalchemy import Integer, String
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.database import Base
@@ -48,3 +59,135 @@ class TopicModel(Base):
             Строка с основными полями темы.
         """
         return f"TopicModel(id={self.id!r}, title={self.title!r})"
+
+
+def _utcnow() -> datetime:
+    """Текущее время UTC без часового пояса (SQLite не хранит пояс)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ResourceModel(Base):
+    """
+    ORM-модель ресурса темы (ссылка или текст).
+
+    Хранится в таблице resources.
+    """
+
+    __tablename__ = "resources"
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        doc="Уникальный идентификатор ресурса.",
+    )
+    topic_id: Mapped[int] = mapped_column(
+        ForeignKey("topics.id", ondelete="CASCADE"),
+        index=True,
+        doc="Тема, к которой относится ресурс.",
+    )
+    res_type: Mapped[str] = mapped_column(
+        String(10),
+        doc="Тип ресурса: link или text.",
+    )
+    content: Mapped[str] = mapped_column(
+        Text,
+        doc="Ссылка или текст ресурса.",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=_utcnow,
+        doc="Время добавления (UTC).",
+    )
+
+    def __repr__(self) -> str:
+        """
+        Возвращает строковое представление модели.
+
+        Returns:
+            Строка с основными полями ресурса.
+        """
+        return f"ResourceModel(id={self.id!r}, topic_id={self.topic_id!r}, res_type={self.res_type!r})"
+
+
+class NoteModel(Base):
+    """
+    ORM-модель заметки по теме.
+
+    Хранится в таблице notes.
+    """
+
+    __tablename__ = "notes"
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        doc="Уникальный идентификатор заметки (растет в порядке добавления).",
+    )
+    topic_id: Mapped[int] = mapped_column(
+        ForeignKey("topics.id", ondelete="CASCADE"),
+        index=True,
+        doc="Тема, к которой относится заметка.",
+    )
+    text: Mapped[str] = mapped_column(
+        Text,
+        doc="Текст заметки.",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=_utcnow,
+        doc="Время создания (UTC).",
+    )
+
+    def __repr__(self) -> str:
+        """
+        Возвращает строковое представление модели.
+
+        Returns:
+            Строка с основными полями заметки.
+        """
+        return f"NoteModel(id={self.id!r}, topic_id={self.topic_id!r})"
+
+
+class ProgressModel(Base):
+    """
+    ORM-модель записи прогресса по теме.
+
+    Хранится в таблице progress. Отдельный индекс по topic_id не нужен:
+    его заменяет левая часть составного индекса (topic_id, date).
+    """
+
+    __tablename__ = "progress"
+    __table_args__ = (
+        Index("ix_progress_topic_id_date", "topic_id", "date"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        doc="Уникальный идентификатор записи.",
+    )
+    topic_id: Mapped[int] = mapped_column(
+        ForeignKey("topics.id", ondelete="CASCADE"),
+        doc="Тема, к которой относится запись.",
+    )
+    percent: Mapped[int] = mapped_column(
+        Integer,
+        doc="Процент выполнения (0..100).",
+    )
+    date: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=_utcnow,
+        doc="Дата записи (UTC).",
+    )
+
+    def __repr__(self) -> str:
+        """
+        Возвращает строковое представление модели.
+
+        Returns:
+            Строка с основными полями записи прогресса.
+        """
+        return f"ProgressModel(id={self.id!r}, topic_id={self.topic_id!r}, percent={self.percent!r})"
@@ -0,0 +1,69 @@
+"""
+Параметры производительности SQLite (PRAGMA) для подключений к БД.
+
+Профиль по умолчанию рассчитан на API с параллельными запросами:
+
+- journal_mode=WAL — читатели не блокируют писателя и наоборот;
+- synchronous=NORMAL — в режиме WAL fsync только при checkpoint,
+  а не на каждый commit (при сбое питания теряются последние
+  транзакции, но база не повреждается);
+- cache_size, mmap_size — кэш страниц и отображение файла в память;
+- busy_timeout — ждать освобождения блокировки вместо ошибки
+  "database is locked";
+- temp_store=MEMORY — временные таблицы и индексы в памяти.
+
+Модуль не зависит от SQLAlchemy и работает с любым DB-API
+подключением sqlite3.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+SQLITE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # Отрицательное значение — размер в КиБ (64 МиБ)
+    "cache_size": -64_000,
+    "mmap_size": 256 * 1024 * 1024,
+    "busy_timeout": 5_000,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+
+def sqlite_pragmas(**overrides: Any) -> Dict[str, Any]:
+    """
+    Возвращает профиль PRAGMA с заменой отдельных параметров.
+
+    Args:
+        **overrides: Значения, заменяющие SQLITE_PRAGMAS; None
+            исключает параметр (остается значение SQLite по умолчанию).
+
+    Returns:
+        Новый словарь параметров.
+    """
+    pragmas = {**SQLITE_PRAGMAS, **overrides}
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def apply_pragmas(connection: Any, pragmas: Mapping[str, Any]) -> None:
+    """
+    Выполняет PRAGMA на новом подключении.
+
+    Args:
+        connection: DB-API подключение sqlite3.
+        pragmas: Имена и значения параметров.
+
+    Raises:
+        ValueError: Если имя или значение параметра недопустимо.
+    """
+    cursor = connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            # PRAGMA не поддерживает параметры запроса: проверяем вручную
+            if not name.isidentifier() or not str(value).lstrip("-").isalnum():
+                raise ValueError(f"Недопустимый PRAGMA: {name}={value}")
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
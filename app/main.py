@@ -8,6 +8,9 @@ from __future__ import annotations
 
 from fastapi import FastAPI
 
+from app.api.export import router as export_router
+from app.api.search import router as search_router
+from app.api.stats import router as stats_router
 from app.api.topics import router as topics_router
 from app.db.init_db import init_db
 
@@ -26,11 +29,15 @@ def create_app() -> FastAPI:
         version="0.2.0",
         description=(
             "API для управления темами, ресурсами и прогрессом обучения. "
-            "На этом этапе темы хранятся в SQLite через SQLAlchemy."
+            "Темы, ресурсы, заметки и прогресс хранятся в SQLite через SQLAlchemy; "
+            "роуты /kb/* работают с базой знаний CLI (data/data.json)."
         ),
     )
 
     app.include_router(topics_router)
+    app.include_router(search_router)
+    app.include_router(stats_router)
+    app.include_router(export_router)
 
     @app.get("/health")
     def health() -> dict:
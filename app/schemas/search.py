@@ -0,0 +1,14 @@
+"""Pydantic-схемы для API полнотекстового поиска"""
+
+from __future__ import annotations
+from pydantic import BaseModel
+from typing import Literal
+
+
+class SearchHitRead(BaseModel):
+    """схема результата поиска"""
+    kind: Literal["topic","note","resource"]
+    topic: str
+    position: int
+    score: float
+    text: str
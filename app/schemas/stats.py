@@ -0,0 +1,15 @@
+"""Pydantic-схемы для API статистики прогресса"""
+
+from __future__ import annotations
+from pydantic import BaseModel
+
+
+class TopicStatsRead(BaseModel):
+    """схема статистики прогресса по теме"""
+    title: str
+    entries: int
+    latest: int | None = None
+    rate_per_week: float | None = None
+    moving_average: float | None = None
+    weeks_to_complete: float | None = None
+    eta: str | None = None
@@ -1,7 +1,8 @@
 """Pydantic-схемы для API тем ресурсов заметок и прогресса"""
 
 from __future__ import annotations
-from pydantic import BaseModel,Field,HttpUrl
+from datetime import datetime
+from pydantic import BaseModel,ConfigDict,Field,HttpUrl
 from typing import Literal
 
 
@@ -15,6 +16,11 @@ class TopicRead(BaseModel):
     title:str
     description:str
 
+class TopicPage(BaseModel):
+    """схема страницы списка тем"""
+    items: list[TopicRead]
+    next_cursor: str | None = None
+
 
 class ResourceCreate(BaseModel):
     """схема для добавления ресурса к теме"""
@@ -34,5 +40,28 @@ class ProgressCreate(BaseModel):
     percent: int = Field(ge=0, le=100)
 
 
+class ResourceRead(BaseModel):
+    """схема для чтения ресурса темы"""
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    res_type: Literal["link","text"]
+    content: str
+    created_at: datetime
+
+class NoteRead(BaseModel):
+    """схема для чтения заметки"""
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    text: str
+    created_at: datetime
+
+class ProgressRead(BaseModel):
+    """схема для чтения записи о прогрессе"""
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    percent: int
+    date: datetime
+
+
 # Здесь gt (greater than), ge (greater than or equal), lt (less than),
 # le (less than or equal) используются для числовых ограничений.
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Сервис для ресурсов, заметок и прогресса тем в базе данных.
+
+Списки отдаются от новых к старым и ограничены limit: последние N
+заметок или ресурсов темы — один запрос по индексу topic_id
+(WHERE topic_id = ? ORDER BY id DESC LIMIT n), последняя запись
+прогресса — один запрос по индексу (topic_id, date). Более старые
+записи запрашиваются с before=<id последней полученной записи>.
+
+Функции асинхронные (AsyncSession), как и эндпоинты тем.
+"""
+
+from __future__ import annotations
+
+from typing import TypeVar
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import NoteModel, ProgressModel, ResourceModel
+from app.schemas.topic import NoteCreate, ProgressCreate, ResourceCreate
+from core.utils import validate_url
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+
+_Item = TypeVar("_Item", ResourceModel, NoteModel, ProgressModel)
+
+
+def _check_limit(limit: int) -> None:
+    """
+    Проверяет размер выборки.
+
+    Raises:
+        ValueError: Если limit вне 1..MAX_LIMIT.
+    """
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"Размер выборки должен быть от 1 до {MAX_LIMIT}")
+
+
+def _latest_stmt(model: type, topic_id: int, limit: int, before: int | None) -> Select:
+    """Запрос последних записей темы по id (индекс topic_id)."""
+    _check_limit(limit)
+    stmt = select(model).where(model.topic_id == topic_id)
+    if before is not None:
+        stmt = stmt.where(model.id < before)
+    return stmt.order_by(model.id.desc()).limit(limit)
+
+
+async def _add(db: AsyncSession, item: _Item) -> _Item:
+    """Сохраняет новую запись и возвращает ее с присвоенным id."""
+    db.add(item)
+    await db.commit()
+    await db.refresh(item)
+    return item
+
+
+async def add_resource(db: AsyncSession, topic_id: int, payload: ResourceCreate) -> ResourceModel:
+    """
+    Добавляет ресурс к теме.
+
+    Args:
+        db: Сессия базы данных.
+        topic_id: Идентификатор темы.
+        payload: Тип и содержимое ресурса.
+
+    Returns:
+        Созданный ресурс.
+
+    Raises:
+        ValueError: Если ссылка не прошла проверку URL.
+    """
+    if payload.res_type == "link" and not validate_url(payload.content):
+        raise ValueError(f"Некорректный URL: {payload.content}")
+    return await _add(
+        db, ResourceModel(topic_id=topic_id, res_type=payload.res_type, content=payload.content)
+    )
+
+
+async def list_resources(
+    db: AsyncSession,
+    topic_id: int,
+    *,
+    limit: int = DEFAULT_LIMIT,
+    before: int | None = None,
+) -> list[ResourceModel]:
+    """
+    Возвращает последние ресурсы темы (от новых к старым).
+
+    Args:
+        db: Сессия базы данных.
+        topic_id: Идентификатор темы.
+        limit: Сколько ресурсов вернуть (не больше MAX_LIMIT).
+        before: Только ресурсы с id меньше этого (следующая порция).
+
+    Returns:
+        Список ресурсов.
+
+    Raises:
+        ValueError: Если limit некорректен.
+    """
+    return list(await db.scalars(_latest_stmt(ResourceModel, topic_id, limit, before)))
+
+
+async def add_note(db: AsyncSession, topic_id: int, payload: NoteCreate) -> NoteModel:
+    """
+    Добавляет заметку к теме.
+
+    Args:
+        db: Сессия базы данных.
+        topic_id: Идентификатор темы.
+        payload: Текст заметки.
+
+    Returns:
+        Созданная заметка.
+    """
+    return await _add(db, NoteModel(topic_id=topic_id, text=payload.text))
+
+
+async def list_notes(
+    db: AsyncSession,
+    topic_id: int,
+    *,
+    limit: int = DEFAULT_LIMIT,
+    before: int | None = None,
+) -> list[NoteModel]:
+    """
+    Возвращает последние заметки темы (от новых к старым).
+
+    Args:
+        db: Сессия базы данных.
+        topic_id: Идентификатор темы.
+        limit: Сколько заметок вернуть (не больше MAX_LIMIT).
+        before: Только заметки с id меньше этого (следующая порция).
+
+    Returns:
+        Список заметок.
+
+    Raises:
+        ValueError: Если limit некорректен.
+    """
+    return list(await db.scalars(_latest_stmt(NoteModel, topic_id, limit, before)))
+
+
+async def add_progress(db: AsyncSession, topic_id: int, payload: ProgressCreate) -> ProgressModel:
+    """
+    Добавляет запись прогресса по теме.
+
+    Args:
+        db: Сессия базы данных.
+        topic_id: Идентификатор темы.
+        payload: Процент выполнения.
+
+    Returns:
+        Созданная запись.
+    """
+    return await _add(db, ProgressModel(topic_id=topic_id, percent=payload.percent))
+
+
+async def list_progress(
+    db: AsyncSession,
+    topic_id: int,
+    *,
+    limit: int = DEFAULT_LIMIT,
+) -> list[ProgressModel]:
+    """
+    Возвращает последние записи прогресса темы (от новых к старым по дате).
+
+    Args:
+        db: Сессия базы данных.
+        topic_id: Идентификатор темы.
+        limit: Сколько записей вернуть (не больше MAX_LIMIT).
+
+    Returns:
+        Список записей прогресса.
+
+    Raises:
+        ValueError: Если limit некорректен.
+    """
+    _check_limit(limit)
+    stmt = (
+        select(ProgressModel)
+        .where(ProgressModel.topic_id == topic_id)
+        # Индекс (topic_id, date) хранит и rowid, поэтому id не требует сортировки
+        .order_by(ProgressModel.date.desc(), ProgressModel.id.desc())
+        .limit(limit)
+    )
+    return list(await db.scalars(stmt))
+
+
+async def get_latest_progress(db: AsyncSession, topic_id: int) -> ProgressModel | None:
+    """
+    Возвращает последнюю запись прогресса темы.
+
+    Args:
+        db: Сессия базы данных.
+        topic_id: Идентификатор темы.
+
+    Returns:
+        Запись с наибольшей датой или None, если записей нет.
+    """
+    entries = await list_progress(db, topic_id, limit=1)
+    return entries[0] if entries else None
@@ -0,0 +1,176 @@
+"""
+Сервис для работы с темами в базе данных (CRUD-логика).
+
+Список тем отдается страницами с курсором (keyset-пагинация): следующая
+страница выбирается условием по ключу сортировки после последней
+строки предыдущей (id > ...), а не через OFFSET, поэтому время запроса
+не зависит от номера страницы и размера таблицы — используется индекс
+по id или title.
+
+Запросы выполняются через AsyncSession асинхронных эндпоинтов (app.api.topics).
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import TopicModel
+from app.schemas.topic import TopicCreate
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# Допустимые сортировки: поле, "-" — по убыванию. Оба поля уникальны,
+# поэтому порядок стабилен и однозначно продолжается курсором
+SORTS = ("id", "-id", "title", "-title")
+
+# Верхняя граница для фильтра по префиксу: больше любого продолжения
+_MAX_CHAR = "\U0010ffff"
+
+
+async def get_topic_by_title(db: AsyncSession, title: str) -> TopicModel | None:
+    """
+    Находит тему по названию.
+
+    Args:
+        db: Сессия базы данных.
+        title: Название темы.
+
+    Returns:
+        Тема или None, если ее нет.
+    """
+    return await db.scalar(select(TopicModel).where(TopicModel.title == title))
+
+
+async def create_topic(db: AsyncSession, payload: TopicCreate) -> TopicModel | None:
+    """
+    Создает тему и сохраняет ее в базе за одно обращение к БД.
+
+    Дубликат определяет уникальный индекс по title (ON CONFLICT DO
+    NOTHING), а не предварительный SELECT: проверка атомарна и при
+    параллельных запросах. RETURNING отдает созданную строку без
+    отдельного чтения; при конфликте строк нет.
+
+    Args:
+        db: Сессия базы данных.
+        payload: Данные новой темы.
+
+    Returns:
+        Созданная тема (с присвоенным id) или None, если тема с таким
+        названием уже есть.
+    """
+    stmt = (
+        insert(TopicModel)
+        .values(title=payload.title, description=payload.description)
+        .on_conflict_do_nothing(index_elements=[TopicModel.title])
+        .returning(TopicModel)
+    )
+    topic = await db.scalar(stmt)
+    await db.commit()
+    return topic
+
+
+def encode_cursor(sort: str, value: Any) -> str:
+    """
+    Кодирует позицию в списке в непрозрачный курсор.
+
+    Args:
+        sort: Сортировка из SORTS.
+        value: Значение ключа сортировки у последней строки страницы.
+
+    Returns:
+        Строка base64url без выравнивания.
+    """
+    raw = json.dumps([sort, value], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str) -> Any:
+    """
+    Разбирает курсор, выданный encode_cursor.
+
+    Args:
+        cursor: Курсор из предыдущего ответа.
+        sort: Сортировка текущего запроса.
+
+    Returns:
+        Значение ключа сортировки, после которого начинается страница.
+
+    Raises:
+        ValueError: Если курсор поврежден или выдан для другой сортировки.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Некорректный курсор") from exc
+
+    expected = str if sort.lstrip("-") == "title" else int
+    if cursor_sort != sort or type(value) is not expected:
+        raise ValueError("Курсор выдан для другой сортировки")
+    return value
+
+
+def _page_stmt(limit: int, cursor: str | None, prefix: str | None, sort: str) -> Select:
+    """
+    Строит запрос страницы тем (на одну строку больше limit).
+
+    Raises:
+        ValueError: Если сортировка, размер страницы или курсор некорректны.
+    """
+    if sort not in SORTS:
+        raise ValueError(f"Неизвестная сортировка: {sort}")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"Размер страницы должен быть от 1 до {MAX_LIMIT}")
+
+    descending = sort.startswith("-")
+    key = getattr(TopicModel, sort.lstrip("-"))
+
+    stmt = select(TopicModel)
+    if prefix:
+        # Диапазон вместо LIKE: использует индекс по title
+        stmt = stmt.where(TopicModel.title >= prefix, TopicModel.title < prefix + _MAX_CHAR)
+    if cursor is not None:
+        after = decode_cursor(cursor, sort)
+        stmt = stmt.where(key < after if descending else key > after)
+    # Лишняя строка показывает, есть ли следующая страница
+    return stmt.order_by(key.desc() if descending else key.asc()).limit(limit + 1)
+
+
+async def get_topics_page(
+    db: AsyncSession,
+    *,
+    limit: int = DEFAULT_LIMIT,
+    cursor: str | None = None,
+    prefix: str | None = None,
+    sort: str = "id",
+) -> tuple[list[TopicModel], str | None]:
+    """
+    Возвращает страницу тем (keyset-пагинация).
+
+    Args:
+        db: Сессия базы данных.
+        limit: Размер страницы (не больше MAX_LIMIT).
+        cursor: Курсор из предыдущей страницы; None — первая страница.
+        prefix: Только темы, название которых начинается с этой строки
+            (с учетом регистра).
+        sort: Сортировка из SORTS.
+
+    Returns:
+        Пара (темы страницы, курсор следующей страницы или None).
+
+    Raises:
+        ValueError: Если сортировка, размер страницы или курсор некорректны.
+    """
+    topics = list(await db.scalars(_page_stmt(limit, cursor, prefix, sort)))
+    if len(topics) <= limit:
+        return topics, None
+    # Лишняя строка отброшена: курсор указывает на последнюю строку страницы
+    topics = topics[:limit]
+    return topics, encode_cursor(sort, getattr(topics[-1], sort.lstrip("-")))
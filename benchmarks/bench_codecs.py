@@ -0,0 +1,90 @@
+"""
+Бенчмарк кодеков FileStorage: время загрузки и сохранения снимка.
+
+Кроме JSON-кодеков измеряется бинарный формат (format="binary").
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_codecs
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from storage.file_storage import CODECS, FileStorage
+
+SIZES = (1_000, 10_000, 100_000)
+NOTES_PER_TOPIC = 100
+
+
+def make_data(notes: int) -> Dict:
+    """
+    Строит данные пользователя с заданным количеством заметок.
+
+    Args:
+        notes: Общее количество заметок.
+
+    Returns:
+        Словарь в формате User.to_dict.
+    """
+    topics = []
+    for t in range(max(1, notes // NOTES_PER_TOPIC)):
+        topics.append({
+            "title": f"Тема {t}",
+            "description": "Описание темы для бенчмарка",
+            "resources": [{"type": "link", "content": f"https://example.com/{t}"}],
+            "notes": [
+                {"text": f"Заметка {t}-{n}: немного текста", "created_at": "2024-01-01T12:00:00"}
+                for n in range(NOTES_PER_TOPIC)
+            ],
+            "progress": [{"percent": 50, "date": "2024-01-01T12:00:00"}],
+        })
+    return {"user": {"username": "bench", "topics": topics}}
+
+
+def bench(codec: str, pretty: bool, data: Dict, workdir: Path) -> tuple[float, float, int]:
+    """
+    Измеряет сохранение и загрузку снимка одним кодеком.
+
+    Returns:
+        (время сохранения, время загрузки, размер файла в байтах)
+    """
+    path = workdir / f"{codec}-{pretty}.json"
+    if codec == "binary":
+        storage = FileStorage(str(path), format="binary", fsync="never")
+    else:
+        storage = FileStorage(str(path), codec=codec, pretty=pretty, fsync="never")
+    storage._data = data
+
+    start = time.perf_counter()
+    storage._save_data()
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    storage._load_data()
+    load_time = time.perf_counter() - start
+    return save_time, load_time, path.stat().st_size
+
+
+def main() -> None:
+    """Печатает таблицу результатов для всех доступных кодеков."""
+    codecs = [name for name, (_, module) in CODECS.items() if module is not None]
+    print(f"{'notes':>8} {'codec':>8} {'mode':>7} {'save ms':>9} {'load ms':>9} {'size KB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            data = make_data(size)
+            for codec in [*codecs, "binary"]:
+                for pretty in (True, False) if codec != "binary" else (False,):
+                    save, load, nbytes = bench(codec, pretty, data, Path(tmp))
+                    mode = "pretty" if pretty else "compact"
+                    print(
+                        f"{size:>8} {codec:>8} {mode:>7} "
+                        f"{save * 1000:>9.1f} {load * 1000:>9.1f} {nbytes / 1024:>9.0f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Бенчмарк пакетного импорта: одна транзакция против сессии на каждый элемент.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_import
+"""
+
+from __future__ import annotations
+
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+from models.resource import Resource
+from models.topic import Topic
+from storage.file_storage import FileStorage
+from storage.importer import import_file
+
+ITEMS = 50_000
+TOPICS = 500
+# Сессий на элемент в сравнении (время экстраполируется на ITEMS)
+PER_ITEM_SAMPLE = 500
+
+
+def write_csv(path: Path, items: int) -> None:
+    """
+    Пишет CSV с ресурсами и заметками.
+
+    Args:
+        path: Путь к файлу.
+        items: Количество строк.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["topic", "kind", "type", "content"])
+        for i in range(items):
+            topic = f"Тема {i % TOPICS}"
+            if i % 3:
+                writer.writerow([topic, "resource", "link", f"https://example.com/{i}"])
+            else:
+                writer.writerow([topic, "note", "", f"Заметка {i}"])
+
+
+def main() -> None:
+    """Печатает время импорта и оценку для поэлементного добавления."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = tmp / "items.csv"
+        write_csv(source, ITEMS)
+
+        storage = FileStorage(tmp / "bulk.json")
+        start = time.perf_counter()
+        report = import_file(storage, source)
+        elapsed = time.perf_counter() - start
+        print(f"import_file: {elapsed:.2f} s ({report})")
+
+        # Как cmd_add_resource: session() и перезапись файла на каждый элемент
+        storage = FileStorage(tmp / "per_item.json")
+        start = time.perf_counter()
+        for i in range(PER_ITEM_SAMPLE):
+            with storage.session() as user:
+                topic = user.get_topic("bench")
+                if topic is None:
+                    topic = Topic("bench")
+                    user.add_topic(topic)
+                topic.add_resource(Resource("link", f"https://example.com/{i}"))
+        per_item = (time.perf_counter() - start) / PER_ITEM_SAMPLE
+        print(
+            f"session на элемент: {per_item * 1000:.2f} ms/элемент на {PER_ITEM_SAMPLE} "
+            f"элементах (растет с размером файла), >= {per_item * ITEMS:.0f} s на {ITEMS}"
+        )
+
+
+if __name__ == "__main__":
+    main()
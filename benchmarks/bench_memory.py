@@ -0,0 +1,62 @@
+"""
+Бенчмарк памяти доменных моделей: байт на одну запись.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_memory
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from typing import Callable
+
+from models.note import Note
+from models.progress import ProgressEntry
+from models.resource import Resource
+from models.topic import Topic
+
+COUNT = 100_000
+
+
+def measure(factory: Callable[[int], object], count: int = COUNT) -> float:
+    """
+    Измеряет средний объем памяти на один объект.
+
+    Тексты создаются заранее, а строки дат — внутри factory, как при
+    загрузке из JSON, чтобы учитывалось хранение времени в объекте.
+
+    Args:
+        factory: Функция, создающая объект по номеру.
+        count: Количество объектов.
+
+    Returns:
+        Байт на объект.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def main() -> None:
+    """Печатает байты на запись для каждой модели."""
+    texts = [f"Заметка {i}" for i in range(COUNT)]
+
+    def date(i: int) -> str:
+        return f"2024-01-{i % 28 + 1:02d}T12:{i % 60:02d}:00"
+
+    cases = {
+        "Note": lambda i: Note(texts[i], date(i)),
+        "ProgressEntry": lambda i: ProgressEntry(i % 101, date(i)),
+        "Resource": lambda i: Resource("text", texts[i]),
+        "Topic (пустая)": lambda i: Topic(texts[i]),
+    }
+    for name, factory in cases.items():
+        print(f"{name:>16}: {measure(factory):7.1f} B/entry")
+
+
+if __name__ == "__main__":
+    main()
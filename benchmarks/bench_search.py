@@ -0,0 +1,65 @@
+"""
+Бенчмарк полнотекстового поиска: построение индекса и время запросов.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_search
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from core.search import SearchIndex
+
+NOTES = 100_000
+NOTES_PER_TOPIC = 100
+QUERIES = ("декораторы", "python генераторы", "база данных индекс", "редкоеслово")
+
+WORDS = (
+    "python декораторы генераторы замыкания база данных индекс запрос "
+    "sql транзакция api fastapi тест pytest класс объект наследование "
+    "итератор контекст менеджер файл json сериализация кэш"
+).split()
+
+
+def make_index(notes: int) -> SearchIndex:
+    """
+    Строит индекс по синтетическим заметкам.
+
+    Args:
+        notes: Количество заметок.
+
+    Returns:
+        Заполненный индекс.
+    """
+    rnd = random.Random(42)
+    index = SearchIndex()
+    for t in range(notes // NOTES_PER_TOPIC):
+        index.add_topic({
+            "title": f"Тема {t}",
+            "description": "Описание темы",
+            "notes": [
+                {"text": " ".join(rnd.choices(WORDS, k=12))}
+                for _ in range(NOTES_PER_TOPIC)
+            ],
+        })
+    index.add_document("note", "Тема 0", "редкоеслово")
+    return index
+
+
+def main() -> None:
+    """Печатает время построения индекса и запросов."""
+    start = time.perf_counter()
+    index = make_index(NOTES)
+    print(f"build {len(index)} docs: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        hits = index.search(query, limit=20)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{query!r:>24}: {elapsed:7.1f} ms, {len(hits)} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Бенчмарк SQLite под смешанной нагрузкой: настройки по умолчанию против
+профиля app/db/sqlite_tuning.py (WAL, synchronous=NORMAL, кэш, mmap).
+
+Потоки имитируют запросы API к таблице topics: 80% чтений (страница
+списка по курсору, тема по названию) и 20% записей (новая тема,
+отдельный commit). У каждого потока свое подключение, как у сессий
+из пула.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_sqlite
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from core.app_import import import_app
+
+sqlite_tuning = import_app("app.db.sqlite_tuning")
+SQLITE_PRAGMAS, apply_pragmas = sqlite_tuning.SQLITE_PRAGMAS, sqlite_tuning.apply_pragmas
+
+THREADS = 8
+REQUESTS = 500
+WRITE_SHARE = 0.2
+TOPICS = 20_000
+PAGE = 50
+
+SCHEMA = """
+CREATE TABLE topics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(200) NOT NULL UNIQUE,
+    description VARCHAR(500) NOT NULL DEFAULT ''
+)
+"""
+
+
+def connect(path: Path, pragmas: dict) -> sqlite3.Connection:
+    """Открывает подключение и применяет PRAGMA."""
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    apply_pragmas(connection, pragmas)
+    return connection
+
+
+def worker(path: Path, pragmas: dict, number: int, errors: list) -> None:
+    """Выполняет REQUESTS запросов одного потока."""
+    rng = random.Random(number)
+    connection = connect(path, pragmas)
+    try:
+        for i in range(REQUESTS):
+            if rng.random() < WRITE_SHARE:
+                connection.execute(
+                    "INSERT INTO topics (title, description) VALUES (?, ?)",
+                    (f"Поток {number} тема {i}", "Описание"),
+                )
+                connection.commit()
+            elif i % 2:
+                after = rng.randrange(TOPICS)
+                connection.execute(
+                    "SELECT id, title, description FROM topics WHERE id > ? ORDER BY id LIMIT ?",
+                    (after, PAGE),
+                ).fetchall()
+            else:
+                connection.execute(
+                    "SELECT id, title, description FROM topics WHERE title = ?",
+                    (f"Тема {rng.randrange(TOPICS)}",),
+                ).fetchone()
+    except sqlite3.Error as exc:
+        errors.append(exc)
+    finally:
+        connection.close()
+
+
+def run(path: Path, pragmas: dict) -> tuple[float, int]:
+    """
+    Заполняет базу и прогоняет нагрузку.
+
+    Returns:
+        Пара (запросов в секунду, количество ошибок).
+    """
+    connection = connect(path, pragmas)
+    connection.execute(SCHEMA)
+    connection.executemany(
+        "INSERT INTO topics (title) VALUES (?)", ((f"Тема {i}",) for i in range(TOPICS))
+    )
+    connection.commit()
+    connection.close()
+
+    errors: list = []
+    threads = [
+        threading.Thread(target=worker, args=(path, pragmas, n, errors)) for n in range(THREADS)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return THREADS * REQUESTS / elapsed, len(errors)
+
+
+def main() -> None:
+    """Печатает пропускную способность для каждого профиля."""
+    cases = {
+        "по умолчанию": {},
+        "профиль API": SQLITE_PRAGMAS,
+    }
+    print(f"{THREADS} потоков x {REQUESTS} запросов, записей {WRITE_SHARE:.0%}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for number, (label, pragmas) in enumerate(cases.items()):
+            rps, errors = run(Path(tmp) / f"tracker{number}.db", pragmas)
+            print(f"{label:>14}: {rps:8.0f} запросов/с, ошибок {errors}")
+
+
+if __name__ == "__main__":
+    main()
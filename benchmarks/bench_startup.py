@@ -0,0 +1,96 @@
+"""
+Бенчмарк запуска CLI: время импорта app и выполнения простых команд.
+
+Каждая команда запускается отдельным процессом во временном каталоге
+с синтетическим data/data.json (данные проекта не затрагиваются).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_startup
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = str(ROOT / "app.py")
+
+TOPICS = 2_000
+NOTES_PER_TOPIC = 50
+RUNS = 5
+
+CASES = {
+    "import app": ([sys.executable, "-c", "import app"], ""),
+    "меню и выход": ([sys.executable, APP], "0\n"),
+    "меню: показать пользователя": ([sys.executable, APP], "1\n0\n"),
+    "app.py info": ([sys.executable, APP, "info"], ""),
+    "app.py list": ([sys.executable, APP, "list"], ""),
+}
+
+
+def write_data(path: Path) -> None:
+    """
+    Пишет синтетический снимок data.json (с заголовком "meta", как FileStorage).
+
+    Args:
+        path: Путь к файлу.
+    """
+    topics = [
+        {
+            "title": f"Тема {t}",
+            "description": "Описание",
+            "resources": [],
+            "notes": [
+                {"text": f"Заметка {i}", "created_at": "2024-01-01T12:00:00"}
+                for i in range(NOTES_PER_TOPIC)
+            ],
+            "progress": [],
+        }
+        for t in range(TOPICS)
+    ]
+    path.parent.mkdir(parents=True)
+    path.write_text(
+        json.dumps(
+            {
+                "meta": {"username": "bench", "topics": len(topics)},
+                "user": {"username": "bench", "topics": topics},
+            },
+            ensure_ascii=False,
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+
+
+def run(cmd: list[str], stdin: str, cwd: Path) -> float:
+    """Запускает процесс и возвращает время до его завершения (секунды)."""
+    start = time.perf_counter()
+    subprocess.run(
+        cmd, input=stdin, cwd=cwd, env={"PYTHONPATH": str(ROOT)},
+        stdout=subprocess.DEVNULL, check=True, text=True,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Печатает медианное время запуска для каждого сценария."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = Path(tmp)
+        data = cwd / "data" / "data.json"
+        write_data(data)
+        size = data.stat().st_size / 1e6
+        print(f"data.json: {TOPICS} тем x {NOTES_PER_TOPIC} заметок, {size:.1f} МБ")
+
+        for label, (cmd, stdin) in CASES.items():
+            times = [run(cmd, stdin, cwd) for _ in range(RUNS)]
+            print(f"{label:>28}: {statistics.median(times) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
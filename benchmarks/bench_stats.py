@@ -0,0 +1,107 @@
+"""
+Бенчмарк аналитики прогресса: обход объектов ProgressEntry против колонок.
+
+Колонки собираются один раз и затем дополняются изменениями (как в
+FileStorage.progress_stats), поэтому отдельно измеряются сборка,
+дополнение одной сессией и расчет.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_stats
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from core.progress_stats import WEEK, ProgressColumns, np
+from models import timestamps
+from models.progress import ProgressEntry
+from models.topic import Topic
+from models.user import User
+
+TOPICS = 1_000
+ENTRIES_PER_TOPIC = 100
+
+
+def make_topics(topics: int, entries: int) -> list[Topic]:
+    """
+    Создает темы с растущим прогрессом.
+
+    Args:
+        topics: Количество тем.
+        entries: Записей прогресса в теме.
+
+    Returns:
+        Список тем.
+    """
+    rnd = random.Random(42)
+    start = timestamps.from_iso("2024-01-01T00:00:00")
+    result = []
+    for t in range(topics):
+        topic = Topic(f"Тема {t}")
+        percent = 0
+        for i in range(entries):
+            percent = min(100, percent + rnd.randint(0, 2))
+            topic.progress.append(
+                ProgressEntry(percent, timestamps.to_iso(start + i * 86_400))
+            )
+        result.append(topic)
+    return result
+
+
+def naive_rates(topics: list[Topic]) -> list[float | None]:
+    """Скорость по МНК обходом объектов (для сравнения)."""
+    rates = []
+    for topic in topics:
+        entries = sorted(topic.progress, key=lambda e: e.timestamp)
+        if len(entries) < 2:
+            rates.append(None)
+            continue
+        t0 = entries[0].timestamp
+        t = [(e.timestamp - t0) / WEEK for e in entries]
+        x = [e.percent for e in entries]
+        n = len(t)
+        mt, mx = sum(t) / n, sum(x) / n
+        cov = sum((a - mt) * (b - mx) for a, b in zip(t, x))
+        var = sum((a - mt) ** 2 for a in t)
+        rates.append(cov / var if var else None)
+    return rates
+
+
+def timed(label: str, fn) -> None:
+    """Печатает время выполнения fn."""
+    start = time.perf_counter()
+    fn()
+    print(f"{label:>28}: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+def main() -> None:
+    """Печатает время расчета статистики разными способами."""
+    topics = make_topics(TOPICS, ENTRIES_PER_TOPIC)
+    print(f"{TOPICS} тем x {ENTRIES_PER_TOPIC} записей, NumPy: {np is not None}")
+
+    timed("объекты: скорость", lambda: naive_rates(topics))
+    timed("колонки: сборка", lambda: ProgressColumns.build(topics))
+
+    columns = ProgressColumns.build(topics)
+    user = User("bench")
+    for topic in topics:
+        user.add_topic(topic)
+    user.pop_changes()
+    date = timestamps.to_iso(timestamps.from_iso("2024-06-01T00:00:00"))
+    for topic in user.topics[::100]:
+        topic.add_progress(ProgressEntry(100, date))
+    changes = user.pop_changes()
+    timed(f"колонки: +{len(changes)} записей", lambda: columns.apply_changes(changes))
+    for use_numpy in (False, True):
+        if use_numpy and np is None:
+            continue
+        columns = ProgressColumns.build(topics, use_numpy=use_numpy)
+        name = "numpy" if use_numpy else "python"
+        timed(f"колонки ({name}): скорость", columns.rate_per_week)
+        timed(f"колонки ({name}): summary", columns.summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Бенчмарк потокобезопасного FileStorage: запись при каждой сессии
+против фонового сохранения (flush_interval).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_threads
+"""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from models.note import Note
+from models.topic import Topic
+from storage.file_storage import FileStorage
+
+THREADS = 8
+SESSIONS = 200
+TOPICS = 500
+
+
+def run(storage: FileStorage) -> float:
+    """
+    Выполняет сессии из нескольких потоков.
+
+    Args:
+        storage: Хранилище (потокобезопасное).
+
+    Returns:
+        Время до сохранения всех изменений (секунды).
+    """
+    def writer(worker: int) -> None:
+        for i in range(SESSIONS):
+            with storage.session() as user:
+                user.topics[(worker * SESSIONS + i) % TOPICS].add_note(Note(f"{worker}-{i}"))
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    storage.close()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Печатает время для каждого режима сохранения."""
+    cases = {
+        "запись на сессию": {"threadsafe": True},
+        "фоновая запись, 50 ms": {"flush_interval": 0.05},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for number, (label, options) in enumerate(cases.items()):
+            path = Path(tmp) / f"data{number}.json"
+            seed = FileStorage(path)
+            with seed.session() as user:
+                for t in range(TOPICS):
+                    user.add_topic(Topic(f"Тема {t}"))
+
+            elapsed = run(FileStorage(path, **options))
+            notes = sum(t.note_count for t in FileStorage(path).get_user().topics)
+            print(f"{label:>22}: {elapsed:.2f} s, {THREADS * SESSIONS} сессий, заметок {notes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Бенчмарк проверки URL при импорте закладок.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_urls
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+
+from core import utils
+
+BOOKMARKS = 50_000
+UNIQUE = 20_000
+
+
+def make_urls(count: int, unique: int) -> list[str]:
+    """
+    Создает список закладок с повторами (как в реальных экспортах).
+
+    Args:
+        count: Количество закладок.
+        unique: Количество различных URL.
+
+    Returns:
+        Список URL.
+    """
+    rnd = random.Random(42)
+    pool = [
+        f"https://site{i % 500}.example.com/articles/{i}?ref=bookmark"
+        if i % 50 else f"not a url {i}"
+        for i in range(unique)
+    ]
+    return [rnd.choice(pool) for _ in range(count)]
+
+
+def compile_per_call(url: str) -> bool:
+    """Прежняя реализация: re.compile при каждом вызове."""
+    pattern = re.compile(utils._URL_RE.pattern, re.IGNORECASE)
+    return bool(pattern.match(url))
+
+
+def timed(label: str, fn, urls: list[str]) -> None:
+    """Печатает время и пропускную способность fn на списке URL."""
+    start = time.perf_counter()
+    fn(urls)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>28}: {elapsed * 1000:7.1f} ms, {len(urls) / elapsed:>10,.0f} URL/s")
+
+
+def main() -> None:
+    """Печатает время проверки закладок разными способами."""
+    urls = make_urls(BOOKMARKS, UNIQUE)
+    print(f"{BOOKMARKS} закладок, {UNIQUE} различных URL")
+
+    timed("re.compile в каждом вызове", lambda u: [compile_per_call(x) for x in u], urls)
+    timed("предкомпиляция без кэша", lambda u: [utils._URL_RE.match(x) is not None for x in u], urls)
+    utils.validate_url.cache_clear()
+    timed("validate_urls (холодный кэш)", utils.validate_urls, urls)
+    timed("validate_urls (теплый кэш)", utils.validate_urls, urls)
+    print(utils.validate_url.cache_info())
+
+
+if __name__ == "__main__":
+    main()
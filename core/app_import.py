@@ -0,0 +1,37 @@
+"""
+Импорт модулей пакета app/ (API) из тестов и бенчмарков.
+
+Корневой app.py (CLI) перекрывает одноименный пакет app/, поэтому
+обычный import app.db... находит модуль CLI.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+from types import ModuleType
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+
+def import_app(name: str) -> ModuleType:
+    """
+    Импортирует модуль пакета app/, временно подменяя модуль CLI app.py.
+
+    Args:
+        name: Полное имя модуля, например "app.db.sqlite_tuning".
+
+    Returns:
+        Импортированный модуль.
+    """
+    cli = sys.modules.pop("app", None)
+    package = types.ModuleType("app")
+    package.__path__ = [str(APP_DIR)]
+    sys.modules["app"] = package
+    try:
+        return importlib.import_module(name)
+    finally:
+        if cli is not None:
+            sys.modules["app"] = cli
+        else:
+            del sys.modules["app"]
@@ -0,0 +1,496 @@
+"""
+Колоночное хранение истории прогресса и аналитика по ней.
+
+История прогресса всех тем укладывается в два плоских массива (время
+в секундах и процент) с границами тем в offsets, как в CSR-матрице:
+записи темы i занимают позиции offsets[i]..offsets[i + 1]. Поверх
+массивов считаются последний процент, скорость (процентов в неделю),
+скользящее среднее и прогноз достижения 100% — сразу для всех тем.
+
+Колонки хранятся в array.array и дополняются на месте записями журнала
+изменений User (apply_changes), поэтому их можно держать рядом с
+кэшированным пользователем и не собирать заново при каждом запросе
+(см. FileStorage.progress_stats). Если установлен NumPy, вычисления
+векторизованы (массивы NumPy строятся из колонок при первом расчете
+после изменения); иначе используются эквивалентные циклы на Python.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from operator import gt, itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from models import timestamps
+from models.progress import ProgressEntry
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+if TYPE_CHECKING:
+    from models.topic import Topic
+
+WEEK = 7 * 24 * 3600
+
+# Скорость ниже этой (процентов в неделю) считается отсутствием прогресса:
+# у ровной истории МНК дает наклон порядка 1e-15 вместо нуля
+MIN_RATE = 1e-3
+
+# Прогноз дальше этого срока (недель, ~100 лет) не строится
+MAX_WEEKS = 100 * 52
+
+
+class TopicStats:
+    """
+    Сводная статистика прогресса по теме.
+
+    Содержит название темы, число записей, последний процент, скорость
+    (процентов в неделю), последнее значение скользящего среднего,
+    прогноз числа недель до 100% и прогнозируемую дату.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        entries: int,
+        latest: Optional[int] = None,
+        rate_per_week: Optional[float] = None,
+        moving_average: Optional[float] = None,
+        weeks_to_complete: Optional[float] = None,
+        eta: Optional[str] = None,
+    ):
+        """
+        Инициализация статистики.
+
+        Args:
+            title: Название темы
+            entries: Количество записей прогресса
+            latest: Последний процент (None, если записей нет)
+            rate_per_week: Скорость по МНК (None, если записей меньше двух)
+            moving_average: Последнее значение скользящего среднего
+            weeks_to_complete: Недель до 100% (0, если уже достигнуто;
+                None, если прогресса нет или он не растет)
+            eta: Прогнозируемая дата достижения 100% (ISO)
+        """
+        self.title = title
+        self.entries = entries
+        self.latest = latest
+        self.rate_per_week = rate_per_week
+        self.moving_average = moving_average
+        self.weeks_to_complete = weeks_to_complete
+        self.eta = eta
+
+    def to_dict(self) -> Dict:
+        """Возвращает словарь для сериализации в JSON."""
+        return {
+            "title": self.title,
+            "entries": self.entries,
+            "latest": self.latest,
+            "rate_per_week": self.rate_per_week,
+            "moving_average": self.moving_average,
+            "weeks_to_complete": self.weeks_to_complete,
+            "eta": self.eta,
+        }
+
+    def __str__(self) -> str:
+        """Строковое представление статистики."""
+        if self.latest is None:
+            return f"{self.title}: нет записей"
+        parts = [f"{self.title}: {self.latest}%"]
+        if self.rate_per_week is not None:
+            parts.append(f"{self.rate_per_week:+.1f}%/нед")
+        if self.moving_average is not None:
+            parts.append(f"среднее {self.moving_average:.1f}%")
+        if self.weeks_to_complete == 0:
+            parts.append("завершено")
+        elif self.weeks_to_complete is not None:
+            parts.append(f"до 100%: ~{self.weeks_to_complete:.1f} нед ({self.eta})")
+        return " | ".join(parts)
+
+
+def _cumsum(values: Iterable[float]) -> List[float]:
+    """Префиксные суммы с ведущим нулем (len(values) + 1 элементов)."""
+    out = [0.0]
+    total = 0.0
+    for v in values:
+        total += v
+        out.append(total)
+    return out
+
+
+def _columns(entries: List[ProgressEntry]) -> Tuple[List[int], List[int]]:
+    """
+    Время (секунды) и проценты записей темы, упорядоченные по времени.
+
+    Записи с датой в неизвестном формате пропускаются.
+    """
+    # Обычно дата уже хранится числом секунд (см. models.timestamps):
+    # тогда колонки собираются без вызова свойств для каждой записи
+    times = [e._date for e in entries]
+    percents = [e.percent for e in entries]
+    if not all(type(t) is int for t in times):
+        times, percents = [], []
+        for entry in entries:
+            try:
+                times.append(timestamps.to_seconds(entry._date))
+            except ValueError:
+                continue
+            percents.append(entry.percent)
+    # Записи обычно уже идут по времени: проверка дешевле сортировки
+    if any(map(gt, times, times[1:])):
+        rows = sorted(zip(times, percents), key=itemgetter(0))
+        times, percents = [t for t, _ in rows], [p for _, p in rows]
+    return times, percents
+
+
+def _masked(values, mask) -> list:
+    """Переводит массив NumPy в список, подставляя None там, где mask ложна."""
+    return [v if ok else None for v, ok in zip(values.tolist(), mask.tolist())]
+
+
+class ProgressColumns:
+    """
+    История прогресса всех тем в колоночном виде.
+
+    Записи каждой темы упорядочены по времени. Методы возвращают списки
+    Python (по элементу на тему, None — значение не определено)
+    независимо от того, используется ли NumPy.
+
+    Экземпляр не потокобезопасен: apply_changes нельзя вызывать
+    одновременно с расчетами.
+    """
+
+    def __init__(
+        self,
+        titles: List[str],
+        offsets: List[int],
+        times: array,
+        percents: array,
+        *,
+        use_numpy: Optional[bool] = None,
+    ):
+        """
+        Инициализация колонок.
+
+        Args:
+            titles: Названия тем
+            offsets: Границы тем в массивах (len(titles) + 1 элементов)
+            times: Время записей в секундах от эпохи (array('q'))
+            percents: Проценты записей (array('i'))
+            use_numpy: Считать через NumPy (по умолчанию — если установлен)
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ValueError("NumPy не установлен")
+        self.titles = titles
+        self.use_numpy = use_numpy
+        self._offsets = offsets
+        self._times = times
+        self._percents = percents
+        self._index = {title.casefold(): i for i, title in enumerate(titles)}
+        # Массивы NumPy (offsets, times, percents); None — не построены
+        # или устарели после apply_changes
+        self._arrays: Optional[Tuple] = None
+
+    def __len__(self) -> int:
+        """Количество тем."""
+        return len(self.titles)
+
+    def _columns(self) -> Tuple:
+        """Колонки для расчета: массивы NumPy или исходные списки."""
+        if not self.use_numpy:
+            return self._offsets, self._times, self._percents
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self._offsets, dtype=np.int64),
+                np.array(self._times, dtype=np.int64),
+                np.array(self._percents, dtype=np.int64),
+            )
+        return self._arrays
+
+    @property
+    def offsets(self):
+        """Границы тем в массивах (len(self) + 1 элементов)."""
+        return self._columns()[0]
+
+    @property
+    def times(self):
+        """Время записей в секундах от эпохи."""
+        return self._columns()[1]
+
+    @property
+    def percents(self):
+        """Проценты записей."""
+        return self._columns()[2]
+
+    @classmethod
+    def build(cls, topics: Iterable[Topic], *, use_numpy: Optional[bool] = None) -> ProgressColumns:
+        """
+        Собирает колонки из записей прогресса тем.
+
+        Записи с датой в неизвестном формате пропускаются.
+
+        Args:
+            topics: Темы (например, user.topics)
+            use_numpy: Считать через NumPy (по умолчанию — если установлен)
+
+        Returns:
+            Экземпляр ProgressColumns
+        """
+        titles: List[str] = []
+        offsets = [0]
+        times = array("q")
+        percents = array("i")
+        for topic in topics:
+            topic_times, topic_percents = _columns(topic.progress)
+            titles.append(topic.title)
+            times.extend(topic_times)
+            percents.extend(topic_percents)
+            offsets.append(len(times))
+        return cls(titles, offsets, times, percents, use_numpy=use_numpy)
+
+    def add_topic(self, data: Dict) -> None:
+        """
+        Добавляет тему в конец колонок.
+
+        Args:
+            data: Словарь темы (Topic.to_dict())
+        """
+        entries = [ProgressEntry.from_dict(p) for p in data.get("progress", [])]
+        topic_times, topic_percents = _columns(entries)
+        self._index[data["title"].casefold()] = len(self.titles)
+        self.titles.append(data["title"])
+        self._times.extend(topic_times)
+        self._percents.extend(topic_percents)
+        self._offsets.append(len(self._times))
+        self._arrays = None
+
+    def add_entry(self, title: str, data: Dict) -> None:
+        """
+        Добавляет запись прогресса в тему, сохраняя порядок по времени.
+
+        Записи неизвестных тем и записи с датой в неизвестном формате
+        пропускаются.
+
+        Args:
+            title: Название темы
+            data: Словарь записи (ProgressEntry.to_dict())
+        """
+        i = self._index.get(title.casefold())
+        if i is None:
+            return
+        try:
+            seconds = timestamps.to_seconds(ProgressEntry.from_dict(data)._date)
+        except ValueError:
+            return
+        start, end = self._offsets[i], self._offsets[i + 1]
+        # Обычно запись новее остальных и встает в конец темы
+        position = bisect_right(self._times, seconds, start, end)
+        self._times.insert(position, seconds)
+        self._percents.insert(position, data["percent"])
+        for k in range(i + 1, len(self._offsets)):
+            self._offsets[k] += 1
+        self._arrays = None
+
+    def apply_changes(self, changes: Iterable[Dict]) -> None:
+        """
+        Применяет записи журнала изменений User к колонкам.
+
+        Args:
+            changes: Записи из User.pop_changes() или журнала хранилища
+        """
+        for change in changes:
+            op = change["op"]
+            if op == "add_topic":
+                self.add_topic(change["data"])
+            elif op == "add_progress":
+                self.add_entry(change["title"], change["data"])
+
+    def _bounds(self):
+        """Начала, концы и размеры отрезков тем."""
+        offsets = self.offsets
+        starts, ends = offsets[:-1], offsets[1:]
+        if self.use_numpy:
+            return starts, ends, ends - starts
+        return starts, ends, [e - s for s, e in zip(starts, ends)]
+
+    def latest(self) -> List[Optional[int]]:
+        """
+        Последний процент по каждой теме.
+
+        Returns:
+            Список процентов (None для тем без записей)
+        """
+        percents = self.percents
+        if not self.use_numpy:
+            return [percents[e - 1] if e > s else None for s, e in zip(*self._bounds()[:2])]
+
+        starts, ends, counts = self._bounds()
+        if not len(percents):
+            return [None] * len(self)
+        values = percents[np.where(counts > 0, ends - 1, 0)]
+        return _masked(values, counts > 0)
+
+    def rate_per_week(self) -> List[Optional[float]]:
+        """
+        Скорость прогресса по каждой теме (процентов в неделю).
+
+        Наклон прямой, подобранной методом наименьших квадратов по всем
+        записям темы. Время отсчитывается от первой записи темы, чтобы
+        суммы квадратов не теряли точность.
+
+        Returns:
+            Список скоростей (None, если записей меньше двух
+            или все они сделаны в один момент)
+        """
+        starts, ends, counts = self._bounds()
+        times, percents = self.times, self.percents
+        if not self.use_numpy:
+            result: List[Optional[float]] = []
+            for s, e, n in zip(starts, ends, counts):
+                t0 = times[s] if n else 0
+                t = [(times[i] - t0) / WEEK for i in range(s, e)]
+                x = percents[s:e]
+                st, sx = sum(t), sum(x)
+                denom = n * sum(v * v for v in t) - st * st
+                if n < 2 or denom <= 0:
+                    result.append(None)
+                else:
+                    result.append((n * sum(a * b for a, b in zip(t, x)) - st * sx) / denom)
+            return result
+
+        n = len(self)
+        if not len(times):
+            return [None] * n
+        segment = np.repeat(np.arange(n), counts)
+        t = (times - times[starts[segment]]) / WEEK
+        x = percents.astype(np.float64)
+
+        def sums(values):
+            cs = np.concatenate(([0.0], np.cumsum(values)))
+            return cs[ends] - cs[starts]
+
+        st, sx = sums(t), sums(x)
+        denom = counts * sums(t * t) - st * st
+        ok = (counts >= 2) & (denom > 0)
+        slope = np.divide(counts * sums(t * x) - st * sx, denom, out=np.zeros(n), where=ok)
+        return _masked(slope, ok)
+
+    def moving_average(self, window: int = 3) -> List[List[float]]:
+        """
+        Скользящее среднее процентов по каждой теме.
+
+        Среднее по последним window записям; в начале истории темы окно
+        короче (среднее по всем записям до текущей).
+
+        Args:
+            window: Размер окна (записей)
+
+        Returns:
+            Списки средних, по одному на каждую запись темы
+
+        Raises:
+            ValueError: Если окно меньше 1
+        """
+        if window < 1:
+            raise ValueError("Размер окна должен быть не меньше 1")
+        starts, ends, counts = self._bounds()
+        percents = self.percents
+
+        if not self.use_numpy:
+            cs = _cumsum(percents)
+            result = []
+            for s, e in zip(starts, ends):
+                averages = []
+                for i in range(s, e):
+                    lo = max(s, i - window + 1)
+                    averages.append((cs[i + 1] - cs[lo]) / (i + 1 - lo))
+                result.append(averages)
+            return result
+
+        idx = np.arange(len(percents))
+        lo = np.maximum(np.repeat(starts, counts), idx - window + 1)
+        cs = np.concatenate(([0.0], np.cumsum(percents, dtype=np.float64)))
+        averages = (cs[idx + 1] - cs[lo]) / (idx + 1 - lo)
+        return [averages[s:e].tolist() for s, e in zip(starts.tolist(), ends.tolist())]
+
+    def weeks_to_complete(
+        self,
+        latest: Optional[List[Optional[int]]] = None,
+        rates: Optional[List[Optional[float]]] = None,
+    ) -> List[Optional[float]]:
+        """
+        Прогноз числа недель до 100% при текущей скорости.
+
+        Args:
+            latest: Результат latest() (вычисляется, если не передан)
+            rates: Результат rate_per_week() (вычисляется, если не передан)
+
+        Returns:
+            Список прогнозов: 0 — уже 100%, None — прогресса нет,
+            скорость меньше MIN_RATE или прогноз дальше MAX_WEEKS
+        """
+        latest = self.latest() if latest is None else latest
+        rates = self.rate_per_week() if rates is None else rates
+
+        if not self.use_numpy:
+            result: List[Optional[float]] = []
+            for value, rate in zip(latest, rates):
+                if value is not None and value >= 100:
+                    result.append(0.0)
+                elif value is not None and rate is not None and rate >= MIN_RATE:
+                    weeks = (100 - value) / rate
+                    result.append(weeks if weeks <= MAX_WEEKS else None)
+                else:
+                    result.append(None)
+            return result
+
+        value = np.array([np.nan if v is None else v for v in latest], dtype=np.float64)
+        rate = np.array([np.nan if r is None else r for r in rates], dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weeks = np.where(value >= 100, 0.0, (100 - value) / rate)
+            ok = (value >= 100) | ((rate >= MIN_RATE) & (weeks <= MAX_WEEKS))
+        return _masked(weeks, ok & ~np.isnan(weeks))
+
+    def summary(self, window: int = 3) -> List[TopicStats]:
+        """
+        Сводная статистика по всем темам.
+
+        Args:
+            window: Размер окна скользящего среднего
+
+        Returns:
+            Список TopicStats в порядке тем
+        """
+        _, ends, counts = self._bounds()
+        times = self.times
+        latest = self.latest()
+        rates = self.rate_per_week()
+        averages = self.moving_average(window)
+        weeks = self.weeks_to_complete(latest, rates)
+        if self.use_numpy:
+            ends, counts = ends.tolist(), counts.tolist()
+
+        result = []
+        for i, title in enumerate(self.titles):
+            eta = None
+            if weeks[i] is not None:
+                try:
+                    eta = timestamps.to_iso(int(times[ends[i] - 1]) + round(weeks[i] * WEEK))
+                except (OverflowError, ValueError, OSError):
+                    # Дата вне диапазона time.gmtime на этой платформе
+                    eta = None
+            result.append(TopicStats(
+                title,
+                counts[i],
+                latest=latest[i],
+                rate_per_week=rates[i],
+                moving_average=averages[i][-1] if averages[i] else None,
+                weeks_to_complete=weeks[i],
+                eta=eta,
+            ))
+        return result
@@ -0,0 +1,241 @@
+"""
+Полнотекстовый поиск по темам, заметкам и ресурсам.
+
+Инвертированный индекс: токен -> {документ: частота}. Документом считается
+тема (название + описание), заметка или ресурс. Результаты ранжируются
+по BM25. Индекс обновляется инкрементально записями журнала изменений
+User (add_topic, add_note, add_resource).
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.user import User
+
+# Буквы и цифры любого алфавита (латиница, кириллица и т.д.), без "_"
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Параметры BM25
+_K1 = 1.2
+_B = 0.75
+
+# Вид документа для операции журнала
+_CHANGE_KINDS = {"add_note": "note", "add_resource": "resource"}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Разбивает текст на токены без учета регистра.
+
+    Буква "ё" приравнивается к "е".
+
+    Args:
+        text: Исходный текст
+
+    Returns:
+        Список токенов
+    """
+    return _TOKEN_RE.findall(text.casefold().replace("ё", "е"))
+
+
+class SearchHit:
+    """
+    Результат поиска.
+
+    Содержит вид документа ('topic','note','resource'), название темы,
+    позицию в списке темы, релевантность и текст документа.
+    """
+
+    def __init__(self, kind: str, topic: str, position: int, score: float, text: str = ""):
+        """
+        Инициализация результата.
+
+        Args:
+            kind: Вид документа
+            topic: Название темы
+            position: Индекс заметки/ресурса в теме (0 для самой темы)
+            score: Релевантность (BM25)
+            text: Текст найденного документа
+        """
+        self.kind = kind
+        self.topic = topic
+        self.position = position
+        self.score = score
+        self.text = text
+
+    def to_dict(self) -> Dict:
+        """Возвращает словарь для сериализации в JSON."""
+        return {
+            "kind": self.kind,
+            "topic": self.topic,
+            "position": self.position,
+            "score": self.score,
+            "text": self.text,
+        }
+
+    def __str__(self) -> str:
+        """Строковое представление результата."""
+        return f"[{self.kind}] {self.topic}: {self.text}"
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс с ранжированием BM25.
+    """
+
+    def __init__(self):
+        """Инициализация пустого индекса."""
+        self._docs: List[Tuple[str, str, int]] = []
+        self._lengths: List[int] = []
+        self._total_length = 0
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._next_position: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        """Количество проиндексированных документов."""
+        return len(self._docs)
+
+    def add_document(self, kind: str, topic: str, text: str) -> None:
+        """
+        Добавляет документ в индекс.
+
+        Позиция заметки/ресурса в теме назначается по порядку добавления.
+
+        Args:
+            kind: Вид документа ('topic','note','resource')
+            topic: Название темы
+            text: Индексируемый текст
+        """
+        key = (kind, topic)
+        position = self._next_position.get(key, 0)
+        self._next_position[key] = position + 1
+
+        doc_id = len(self._docs)
+        tokens = tokenize(text)
+        self._docs.append((kind, topic, position))
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        for token, tf in Counter(tokens).items():
+            self._postings[token][doc_id] = tf
+
+    def add_topic(self, data: Dict) -> None:
+        """
+        Индексирует тему вместе с ее ресурсами и заметками.
+
+        Args:
+            data: Словарь темы в формате Topic.to_dict
+        """
+        title = data["title"]
+        self.add_document("topic", title, f"{title} {data.get('description', '')}")
+        for r in data.get("resources", []):
+            self.add_document("resource", title, r["content"])
+        for n in data.get("notes", []):
+            self.add_document("note", title, n["text"])
+
+    def apply_changes(self, changes: Iterable[Dict]) -> None:
+        """
+        Применяет записи журнала изменений User к индексу.
+
+        Args:
+            changes: Записи из User.pop_changes() или журнала хранилища
+        """
+        for change in changes:
+            op = change["op"]
+            if op == "add_topic":
+                self.add_topic(change["data"])
+            elif op in _CHANGE_KINDS:
+                data = change["data"]
+                text = data["text"] if op == "add_note" else data["content"]
+                self.add_document(_CHANGE_KINDS[op], change["title"], text)
+
+    @classmethod
+    def build(cls, user: User) -> SearchIndex:
+        """
+        Строит индекс по всем темам пользователя.
+
+        Args:
+            user: Пользователь
+
+        Returns:
+            Заполненный индекс
+        """
+        index = cls()
+        for topic in user.topics:
+            index.add_topic(topic.to_dict())
+        return index
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """
+        Ищет документы по запросу.
+
+        Args:
+            query: Строка запроса (слова объединяются по ИЛИ)
+            limit: Максимальное количество результатов
+
+        Returns:
+            Результаты по убыванию релевантности (без текста документа)
+        """
+        if not self._docs:
+            return []
+
+        total = len(self._docs)
+        avg_length = self._total_length / total or 1.0
+        lengths = self._lengths
+        # Нормировка BM25 по длине документа: c1 + c2 * длина
+        c1 = _K1 * (1 - _B)
+        c2 = _K1 * _B / avg_length
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            df = len(postings)
+            weight = math.log(1 + (total - df + 0.5) / (df + 0.5)) * (_K1 + 1)
+            for doc_id, tf in postings.items():
+                scores[doc_id] += weight * tf / (tf + c1 + c2 * lengths[doc_id])
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [SearchHit(*self._docs[doc_id], score) for doc_id, score in best]
+
+    def to_dict(self) -> Dict:
+        """
+        Возвращает словарь для сохранения индекса.
+
+        Returns:
+            Документы, длины и списки вхождений (doc, tf, doc, tf, ...)
+        """
+        return {
+            "docs": self._docs,
+            "lengths": self._lengths,
+            "postings": {
+                token: [x for pair in postings.items() for x in pair]
+                for token, postings in self._postings.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> SearchIndex:
+        """
+        Восстанавливает индекс из словаря.
+
+        Args:
+            data: Словарь, полученный из to_dict
+
+        Returns:
+            Экземпляр SearchIndex
+        """
+        index = cls()
+        index._docs = [tuple(d) for d in data["docs"]]
+        index._lengths = data["lengths"]
+        index._total_length = sum(index._lengths)
+        for token, flat in data["postings"].items():
+            index._postings[token] = dict(zip(flat[::2], flat[1::2]))
+        for kind, topic, position in index._docs:
+            index._next_position[(kind, topic)] = position + 1
+        return index
@@ -3,32 +3,56 @@
 """
 
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional
 
+# Размер кэша результатов validate_url (последние проверенные URL)
+URL_CACHE_SIZE = 4096
 
+_URL_RE = re.compile(
+    r'^https?://'  # http:// или https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # домен
+    r'localhost|'  # localhost
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # IPv4
+    r'(?::\d+)?'  # порт
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def validate_url(url: str) -> bool:
     """
     Проверяет URL с помощью регулярного выражения.
 
+    Регулярное выражение компилируется один раз при импорте, а результаты
+    последних URL_CACHE_SIZE проверок кэшируются (LRU).
+
     Args:
         url: Строка URL для проверки
 
     Returns:
         True, если URL валидный
     """
-    pattern = re.compile(
-        r'^https?://'  # http:// или https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # домен
-        r'localhost|'  # localhost
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # IPv4
-        r'(?::\d+)?'  # порт
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return bool(pattern.match(url))
+    return _URL_RE.match(url) is not None
+
+
+def validate_urls(urls: Iterable[str]) -> List[bool]:
+    """
+    Проверяет набор URL за один проход (например, при импорте закладок).
+
+    Повторяющиеся URL берутся из кэша validate_url.
+
+    Args:
+        urls: URL для проверки
+
+    Returns:
+        Результаты проверки в том же порядке
+    """
+    return list(map(validate_url, urls))
 
 
 def find_topic_by_title(user: 'User', title: str) -> Optional['Topic']:
     """
-    Ищет тему по названию (использует list comprehension).
+    Ищет тему по названию без учета регистра (через индекс User.get_topic).
 
     Args:
         user: Пользователь
@@ -37,4 +61,4 @@ def find_topic_by_title(user: 'User', title: str) -> Optional['Topic']:
     Returns:
         Найденная тема или None
     """
-    return next((t for t in user.topics if t.title.lower() == title.lower()), None)
+    return user.get_topic(title)
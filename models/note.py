@@ -4,15 +4,20 @@
 
 from __future__ import annotations
 from typing import Dict
-from datetime import datetime
+from models import timestamps
+from models.tracking import Trackable
 
-class Note:
+class Note(Trackable):
     """
     Класс заметки для темы
 
-    Содержит текст заметки и время создания
+    Содержит текст заметки и время создания (хранится числом секунд)
     """
 
+    __slots__ = ("text", "_created")
+
+    _tracked_fields = frozenset({"text", "created_at"})
+
     def __init__(self,text:str,created_at:str | None = None):
         """
         Инициализация заметки
@@ -21,10 +26,18 @@ class Note:
             text: Текст заметки
             created_at : Время создания (ISO опционально)
         """
-
+        super().__init__()
         self.text = text
-        self.created_at = created_at or datetime.now().isoformat(timespec="seconds")
+        self._created = timestamps.from_iso(created_at) if created_at else timestamps.now()
 
+    @property
+    def created_at(self) -> str:
+        """Время создания в ISO формате"""
+        return timestamps.to_iso(self._created)
+
+    @created_at.setter
+    def created_at(self, value: str) -> None:
+        self._created = timestamps.from_iso(value)
 
     def to_dict(self) -> Dict:
         """
@@ -33,20 +46,21 @@ class Note:
         Returns:
             Словарь с данными заметки
         """
+        return {"text": self.text, "created_at": self.created_at}
 
-        @classmethod
-        def from_dict(cls,data:Dict) -> None:
-            """
-            Создает заметку из словаря JSON
-            
-            Args:
-                data: словарь с данными заметки
-
-            Returns:
-                Экземпляр класса Note    
-            """
-            return cls(data["text"] , data["created_at"])
+    @classmethod
+    def from_dict(cls,data:Dict) -> Note:
+        """
+        Создает заметку из словаря JSON
         
-        def __str__(self) -> str:
-            """строковое представление заметки"""
-            return f"{self.created_at}: {self.text}"
\ No newline at end of file
+        Args:
+            data: словарь с данными заметки
+
+        Returns:
+            Экземпляр класса Note    
+        """
+        return cls(data["text"] , data["created_at"])
+    
+    def __str__(self) -> str:
+        """строковое представление заметки"""
+        return f"{self.created_at}: {self.text}"
@@ -4,16 +4,21 @@
 
 from __future__ import annotations
 from typing import Dict
-from datetime import datetime
+from models import timestamps
+from models.tracking import Trackable
 
 
-class ProgressEntry:
+class ProgressEntry(Trackable):
     """
     Класс записи о прогрессе по теме.
 
-    Содержит процент выполнения и дату записи.
+    Содержит процент выполнения и дату записи (хранится числом секунд).
     """
 
+    __slots__ = ("percent", "_date")
+
+    _tracked_fields = frozenset({"percent", "date"})
+
     def __init__(self, percent: int, date: str | None = None):
         """
         Инициализация записи прогресса.
@@ -22,8 +27,28 @@ class ProgressEntry:
             percent: Процент выполнения (0-100)
             date: Дата записи (ISO формат, опционально)
         """
+        super().__init__()
         self.percent = percent
-        self.date = date or datetime.now().isoformat(timespec="seconds")
+        self._date = timestamps.from_iso(date) if date else timestamps.now()
+
+    @property
+    def date(self) -> str:
+        """Дата записи в ISO формате."""
+        return timestamps.to_iso(self._date)
+
+    @date.setter
+    def date(self, value: str) -> None:
+        self._date = timestamps.from_iso(value)
+
+    @property
+    def timestamp(self) -> int:
+        """
+        Дата записи в секундах от эпохи (для вычислений).
+
+        Raises:
+            ValueError: Если дата сохранена в неизвестном формате
+        """
+        return timestamps.to_seconds(self._date)
 
     def to_dict(self) -> Dict:
         """
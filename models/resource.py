@@ -4,14 +4,19 @@
 
 from __future__ import annotations
 from typing import Dict
+from models.tracking import Trackable
 
-class Resource:
+class Resource(Trackable):
     """
     Базовый класс для ресурсов темы
 
     Поддерживает ссылки тексты и другие типы ресурсов
     """
 
+    __slots__ = ("res_type", "content")
+
+    _tracked_fields = frozenset({"res_type", "content"})
+
     def __init__(self,res_type:str , content:str):
         """
         Инициализация ресурса
@@ -20,6 +25,7 @@ class Resource:
             res_type: Тип ресурса ('link','text',etc)
             content содержимое ресурса
         """
+        super().__init__()
         self.res_type = res_type
         self.content = content
 
@@ -0,0 +1,83 @@
+"""
+Модуль для компактного хранения времени в моделях.
+
+Время хранится как целое число секунд от 1970-01-01 (без часового пояса,
+как и прежние ISO-строки datetime.now()) и форматируется в ISO только
+при выводе и сериализации.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from datetime import datetime, timedelta
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+# Формат, который точно восстанавливается из числа секунд
+_ISO_SECONDS = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+
+
+def now() -> int:
+    """Текущее локальное время в секундах от эпохи."""
+    return (datetime.now() - _EPOCH) // _SECOND
+
+
+def from_iso(value: str | int) -> int | str:
+    """
+    Переводит ISO-строку во внутреннее представление.
+
+    Строки другого вида (только дата, с долями секунды или часовым поясом)
+    хранятся как есть, чтобы сериализация вернула их без изменений.
+
+    Args:
+        value: ISO-строка вида YYYY-MM-DDTHH:MM:SS или число секунд
+
+    Returns:
+        Число секунд от эпохи или исходная строка
+    """
+    if isinstance(value, int) or not _ISO_SECONDS.fullmatch(value):
+        return value
+    try:
+        return (datetime.fromisoformat(value) - _EPOCH) // _SECOND
+    except ValueError:
+        return value
+
+
+def to_iso(value: int | str) -> str:
+    """
+    Форматирует внутреннее представление в ISO-строку.
+
+    Args:
+        value: Число секунд от эпохи или исходная строка
+
+    Returns:
+        ISO-строка с точностью до секунд
+    """
+    if isinstance(value, str):
+        return value
+    # gmtime не применяет часовой пояс: секунды уже в локальном времени
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(value))
+
+
+def to_seconds(value: int | str) -> int:
+    """
+    Переводит внутреннее представление в число секунд от эпохи.
+
+    В отличие от from_iso, разбирает и строки другого вида (только дата,
+    доли секунды); часовой пояс отбрасывается.
+
+    Args:
+        value: Число секунд от эпохи или ISO-строка
+
+    Returns:
+        Число секунд от эпохи
+
+    Raises:
+        ValueError: Если строка не является датой в ISO формате
+    """
+    if isinstance(value, int):
+        return value
+    parsed = datetime.fromisoformat(value).replace(tzinfo=None)
+    return (parsed - _EPOCH) // _SECOND
@@ -3,19 +3,40 @@
 """
 
 from __future__ import annotations
+import threading
 from typing import List, Dict
 from models.resource import Resource
 from models.note import Note
 from models.progress import ProgressEntry
+from models.tracking import Trackable
 
+# Общая для всех тем блокировка ленивой загрузки: темы читаются
+# параллельно из потоков FileStorage(threadsafe=True), а отдельная
+# блокировка на тему увеличила бы ее размер
+_LOAD_LOCK = threading.Lock()
 
-class Topic:
+
+class Topic(Trackable):
     """
     класс темы для изучения
 
-    содержит ресурсы , заметки и записи о прогрессе
+    содержит ресурсы , заметки и записи о прогрессе.
+    Результат to_dict кэшируется, пока тема не изменилась.
+
+    Тема, созданная через from_dict, загружается лениво: заголовок
+    (название, описание, количества) доступен сразу, а ресурсы, заметки
+    и прогресс создаются при первом обращении к ним
     """
 
+    __slots__ = (
+        "_raw", "title", "description", "_resources", "_notes", "_progress",
+        "_cache", "_cache_version",
+    )
+
+    _tracked_fields = frozenset(
+        {"title", "description", "resources", "notes", "progress"}
+    )
+
     def __init__(self,title:str,description:str =""):
         """
         Инициализация темы
@@ -24,11 +45,138 @@ class Topic:
             title: Название темы
             description: Описание темы (опционально)
         """
+        super().__init__()
+        self._raw: Dict | None = None
         self.title = title
         self.description = description
-        self.resources: List[Resource] = []
-        self.notes: List[Note] =[]
-        self.progress: List[ProgressEntry] = []
+        self.resources = []
+        self.notes = []
+        self.progress = []
+        self._cache: Dict | None = None
+        self._cache_version = -1
+
+    def __setattr__(self, name: str, value) -> None:
+        """При переименовании темы обновляет индекс названий у владельца"""
+        super().__setattr__(name, value)
+        if name == "title" and self._owner is not None:
+            self._owner._rebuild_index()
+
+    def _load(self) -> None:
+        """
+        Создает ресурсы, заметки и прогресс из отложенных данных темы.
+
+        Списки сначала заполняются полностью и только потом публикуются,
+        а _raw сбрасывается последним: поток, увидевший _raw is None,
+        получает уже загруженное содержимое.
+        """
+        with _LOAD_LOCK:
+            raw = self._raw
+            if raw is None:
+                # Тему уже загрузил другой поток
+                return
+            body = raw["body"]() if "body" in raw else raw
+            resources = [Resource.from_dict(r) for r in body.get("resources",[])]
+            notes = [Note.from_dict(n) for n in body.get("notes",[])]
+            progress = [ProgressEntry.from_dict(p) for p in body.get("progress",[])]
+            for item in (*resources, *notes, *progress):
+                item._owner = self
+            self._resources = resources
+            self._notes = notes
+            self._progress = progress
+            self._raw = None
+
+    def _raw_count(self, key: str, index: int) -> int | None:
+        """
+        Количество элементов в еще не загруженной теме
+
+        Args:
+            key: Ключ списка в словаре темы
+            index: Позиция в заголовке "counts" (бинарный формат)
+
+        Returns:
+            Количество или None, если тема уже загружена (тогда списки
+            опубликованы и их длину можно брать напрямую)
+        """
+        raw = self._raw
+        if raw is None:
+            return None
+        if "counts" in raw:
+            return raw["counts"][index]
+        return len(raw.get(key, []))
+
+    @property
+    def is_loaded(self) -> bool:
+        """Загружено ли содержимое темы"""
+        return self._raw is None
+
+    @property
+    def resources(self) -> List[Resource]:
+        """Ресурсы темы (загружаются при первом обращении)"""
+        if self._raw is not None:
+            self._load()
+        return self._resources
+
+    @resources.setter
+    def resources(self, value: List[Resource]) -> None:
+        if self._raw is not None:
+            self._load()
+        self._resources = value
+
+    @property
+    def notes(self) -> List[Note]:
+        """Заметки темы (загружаются при первом обращении)"""
+        if self._raw is not None:
+            self._load()
+        return self._notes
+
+    @notes.setter
+    def notes(self, value: List[Note]) -> None:
+        if self._raw is not None:
+            self._load()
+        self._notes = value
+
+    @property
+    def progress(self) -> List[ProgressEntry]:
+        """Записи прогресса (загружаются при первом обращении)"""
+        if self._raw is not None:
+            self._load()
+        return self._progress
+
+    @progress.setter
+    def progress(self, value: List[ProgressEntry]) -> None:
+        if self._raw is not None:
+            self._load()
+        self._progress = value
+
+    @property
+    def resource_count(self) -> int:
+        """Количество ресурсов без загрузки содержимого темы"""
+        count = self._raw_count("resources", 0)
+        return len(self._resources) if count is None else count
+
+    @property
+    def note_count(self) -> int:
+        """Количество заметок без загрузки содержимого темы"""
+        count = self._raw_count("notes", 1)
+        return len(self._notes) if count is None else count
+
+    @property
+    def progress_count(self) -> int:
+        """Количество записей прогресса без загрузки содержимого темы"""
+        count = self._raw_count("progress", 2)
+        return len(self._progress) if count is None else count
+
+    def _record(self, op: str, data: Dict) -> None:
+        """
+        Передает запись об изменении владельцу темы (если он есть)
+
+        Args:
+            op: Тип операции ('add_resource','add_note','add_progress')
+            data: Сериализованный добавленный объект
+        """
+        self._touch(journaled=True)
+        if self._owner is not None:
+            self._owner.record_change({"op": op, "title": self.title, "data": data})
 
     def add_resource(self,res: Resource) -> None:
         """
@@ -37,7 +185,9 @@ class Topic:
         Args:
             res: Ресурс для добавления
         """
+        res._owner = self
         self.resources.append(res)
+        self._record("add_resource", res.to_dict())
 
     def add_note(self,note:Note) -> None:
         """
@@ -46,7 +196,9 @@ class Topic:
         Args:
             note: Заметка для добавления
         """
+        note._owner = self
         self.notes.append(note)
+        self._record("add_note", note.to_dict())
 
 
     def add_progress(self,entry:ProgressEntry) -> None:
@@ -56,7 +208,9 @@ class Topic:
         Args:
             entry: запись прогресса
         """
+        entry._owner = self
         self.progress.append(entry)
+        self._record("add_progress", entry.to_dict())
 
 
     def to_dict(self) -> Dict:
@@ -66,34 +220,39 @@ class Topic:
         Returns:
             Словарь с данными темы
         """
+        if self._cache is not None and self._cache_version == self._version:
+            return self._cache
 
-        return {
+        self._cache = {
             "title":self.title,
             "description":self.description,
             "resources":[r.to_dict() for r in self.resources],
             "notes": [n.to_dict() for n in self.notes],
             "progress": [p.to_dict() for p in self.progress],
         }
+        self._cache_version = self._version
+        return self._cache
     
     @classmethod
     def from_dict(cls, data: Dict) -> Topic:
         """
         Создает тему из словаря JSON.
 
+        Содержимое темы не разбирается сразу (см. _load). Вместо списков
+        словарь может содержать заголовок "counts" ([ресурсы, заметки,
+        прогресс]) и функцию "body", возвращающую их при первом обращении.
+
         Args:
             data: Словарь с данными темы
 
         Returns:
             Экземпляр класс Topic
         """
-        from models.resource import Resource
-        from models.note import Note
-        from models.progress import ProgressEntry
-
         topic = cls(data["title"], data.get("description",""))
-        topic.resources = [Resource.from_dict(r) for r in data.get("resources",[])]
-        topic.notes = [Note.from_dict(n) for n in data.get("notes",[])]
-        topic.progress = [ProgressEntry.from_dict(p) for p in data.get("progress",[])]
+        topic._raw = data
+        if "body" not in data:
+            topic._cache = data
+            topic._cache_version = topic._version
         return topic
     
     def __str__(self) -> str:
@@ -0,0 +1,52 @@
+"""
+Модуль для отслеживания изменений доменных моделей.
+
+Каждая модель хранит счетчик версий; изменение отслеживаемого поля
+увеличивает его и поднимается вверх по дереву (запись -> тема -> пользователь),
+поэтому хранилище может пропускать сохранение, если ничего не изменилось.
+"""
+
+from __future__ import annotations
+
+from typing import Any, FrozenSet
+
+
+class Trackable:
+    """
+    Примесь для моделей с отслеживанием изменений.
+
+    Наследники перечисляют отслеживаемые атрибуты в _tracked_fields
+    и вызывают super().__init__() до присваивания полей.
+    """
+
+    __slots__ = ("_owner", "_version")
+
+    _tracked_fields: FrozenSet[str] = frozenset()
+
+    def __init__(self):
+        """Инициализация: модель без владельца с нулевой версией."""
+        object.__setattr__(self, "_owner", None)
+        object.__setattr__(self, "_version", 0)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Присваивает атрибут и отмечает модель измененной, если поле отслеживается."""
+        object.__setattr__(self, name, value)
+        if name in self._tracked_fields:
+            self._touch()
+
+    def _touch(self, journaled: bool = False) -> None:
+        """
+        Увеличивает версию модели и передает изменение владельцу.
+
+        Args:
+            journaled: Изменение уже записано в журнал пользователя
+                (add_* или смена имени), а не сделано прямым присваиванием.
+        """
+        object.__setattr__(self, "_version", self._version + 1)
+        if self._owner is not None:
+            self._owner._touch(journaled)
+
+    @property
+    def version(self) -> int:
+        """Текущая версия модели (растет при каждом изменении)."""
+        return self._version
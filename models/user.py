@@ -5,14 +5,32 @@
 
 from __future__ import annotations
 from typing import List,Dict
+from models.note import Note
+from models.progress import ProgressEntry
+from models.resource import Resource
 from models.topic import Topic
+from models.tracking import Trackable
 
-class User:
+# Операции журнала, добавляющие запись в тему: op -> (атрибут темы, класс)
+_ITEM_OPS = {
+    "add_resource": ("resources", Resource),
+    "add_note": ("notes", Note),
+    "add_progress": ("progress", ProgressEntry),
+}
+
+class User(Trackable):
     """
     Класс пользователя трекера прогресса.
 
     Содержит имя пользователя и список тем для изучения.
+    Ведет журнал изменений (add_topic, add_resource, add_note, add_progress,
+    смена имени), который хранилище может дописывать в лог вместо
+    перезаписи всего файла, и версию для пропуска сохранения без изменений.
+    Поддерживает индекс тем по названию (без учета регистра).
     """
+
+    _tracked_fields = frozenset({"topics"})
+
     def __init__(self,username:str):
         """
         Инициализация пользователя.
@@ -20,8 +38,55 @@ class User:
         Args:
             username: Имя пользователя
             """
-        self.username = username
-        self.topics: List[Topic] = []
+        super().__init__()
+        self._username = username
+        self._index: Dict[str, Topic] = {}
+        self.topics = []
+        self._changes: List[Dict] = []
+        self._saved_version = -1
+        self._untracked = False
+
+    @property
+    def username(self) -> str:
+        """Имя пользователя."""
+        return self._username
+
+    @username.setter
+    def username(self, value: str) -> None:
+        """Меняет имя пользователя и фиксирует изменение в журнале."""
+        self._username = value
+        self.record_change({"op": "set_username", "data": value})
+
+    @property
+    def topics(self) -> List[Topic]:
+        """Темы пользователя в порядке добавления."""
+        return self._topics
+
+    @topics.setter
+    def topics(self, value: List[Topic]) -> None:
+        """Заменяет список тем и перестраивает индекс по названию."""
+        self._topics = value
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        """Перестраивает индекс название (casefold) -> тема."""
+        self._index = {t.title.casefold(): t for t in self._topics}
+
+    def get_topic(self, title: str) -> Topic | None:
+        """
+        Ищет тему по названию без учета регистра за O(1).
+
+        Индекс перестраивается, если список тем изменили в обход add_topic.
+
+        Args:
+            title: Название темы
+
+        Returns:
+            Найденная тема или None
+        """
+        if len(self._index) != len(self._topics):
+            self._rebuild_index()
+        return self._index.get(title.casefold())
 
     def add_topic(self,topic:Topic) -> None:
         """
@@ -29,8 +94,94 @@ class User:
 
         Args:
             topic: Тема для добавления
+
+        Raises:
+            ValueError: Если тема с таким названием (без учета регистра) уже есть
+        """
+        if self.get_topic(topic.title) is not None:
+            raise ValueError(f"Тема уже существует: {topic.title}")
+
+        topic._owner = self
+        self._topics.append(topic)
+        self._index[topic.title.casefold()] = topic
+        self.record_change({"op": "add_topic", "data": topic.to_dict()})
+
+    def record_change(self, change: Dict) -> None:
+        """
+        Добавляет запись в журнал изменений пользователя.
+
+        Args:
+            change: Запись вида {"op": ..., "data": ..., ["title": ...]}
+        """
+        self._changes.append(change)
+        self._touch(journaled=True)
+
+    def _touch(self, journaled: bool = False) -> None:
+        """
+        Увеличивает версию пользователя.
+
+        Args:
+            journaled: Изменение отражено в журнале; иначе при следующем
+                сохранении потребуется полный снимок.
+        """
+        super()._touch(journaled)
+        if not journaled:
+            self._untracked = True
+
+    @property
+    def is_dirty(self) -> bool:
+        """Есть ли несохраненные изменения."""
+        return self._version != self._saved_version
+
+    @property
+    def has_untracked_changes(self) -> bool:
+        """Есть ли изменения, не попавшие в журнал (прямые присваивания)."""
+        return self._untracked
+
+    def mark_clean(self) -> None:
+        """Отмечает текущее состояние как сохраненное."""
+        self._saved_version = self._version
+        self._untracked = False
+
+    def pop_changes(self) -> List[Dict]:
+        """
+        Возвращает накопленные изменения и очищает журнал.
+
+        Returns:
+            Список записей об изменениях в порядке их совершения
+        """
+        changes, self._changes = self._changes, []
+        return changes
+
+    def apply_change(self, change: Dict) -> None:
+        """
+        Применяет запись журнала к пользователю (без повторной записи).
+
+        Args:
+            change: Запись, ранее полученная из pop_changes()
+
+        Raises:
+            ValueError: Если операция неизвестна
         """
-        self.topics.append(topic)
+        op = change["op"]
+        data = change["data"]
+        if op == "set_username":
+            self._username = data
+        elif op == "add_topic":
+            topic = Topic.from_dict(data)
+            topic._owner = self
+            self._topics.append(topic)
+            self._index[topic.title.casefold()] = topic
+        elif op in _ITEM_OPS:
+            attr, item_cls = _ITEM_OPS[op]
+            topic = self.get_topic(change["title"])
+            item = item_cls.from_dict(data)
+            item._owner = topic
+            getattr(topic, attr).append(item)
+            topic._touch(journaled=True)
+        else:
+            raise ValueError(f"Неизвестная операция журнала: {op}")
+        self._touch(journaled=True)
 
     def to_dict(self) -> Dict:
         """
@@ -57,6 +208,9 @@ class User:
         """
         user = cls(data["username"])
         user.topics = [Topic.from_dict(t) for t in data.get("topics",[])]
+        for topic in user.topics:
+            topic._owner = user
+        user.mark_clean()
         return user
     
     def __str__(self) -> str:
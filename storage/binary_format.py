@@ -0,0 +1,265 @@
+"""
+Модуль компактного бинарного формата хранения данных трекера.
+
+Формат — последовательность записей с префиксом длины (little-endian):
+
+    b"PTRK" | версия (u8) | есть пользователь (u8)
+    username (str) | количество тем (u32)
+    для каждой темы:
+        title (str) | description (str)
+        число ресурсов, заметок, записей прогресса (3 x u32)
+        длина тела темы (u32) | тело темы
+
+Тело темы: ресурсы (type, content), заметки (text, created_at),
+прогресс (percent: i32, date). Строка (str) — длина u32 + UTF-8.
+
+Благодаря длине тела тему можно пропустить, не разбирая ее содержимое:
+при ленивом чтении (lazy=True) разбираются только заголовки тем,
+а тело декодируется при первом обращении к ресурсам/заметкам/прогрессу.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List
+
+import struct
+
+MAGIC = b"PTRK"
+VERSION = 1
+
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_COUNTS = struct.Struct("<IIII")
+
+
+def _pack_str(out: List[bytes], value: str) -> None:
+    """Дописывает строку с префиксом длины."""
+    raw = value.encode("utf-8")
+    out.append(_U32.pack(len(raw)))
+    out.append(raw)
+
+
+class _Reader:
+    """Последовательное чтение записей из буфера."""
+
+    def __init__(self, raw: bytes):
+        """
+        Инициализация читателя.
+
+        Args:
+            raw: Содержимое файла.
+        """
+        self.buf = memoryview(raw)
+        self.pos = 0
+
+    def u8(self) -> int:
+        """Читает беззнаковый байт."""
+        value = self.buf[self.pos]
+        self.pos += 1
+        return value
+
+    def u32(self) -> int:
+        """Читает беззнаковое 32-битное число."""
+        (value,) = _U32.unpack_from(self.buf, self.pos)
+        self.pos += 4
+        return value
+
+    def i32(self) -> int:
+        """Читает знаковое 32-битное число."""
+        (value,) = _I32.unpack_from(self.buf, self.pos)
+        self.pos += 4
+        return value
+
+    def text(self) -> str:
+        """Читает строку с префиксом длины."""
+        size = self.u32()
+        end = self.pos + size
+        if end > len(self.buf):
+            raise ValueError("Строка выходит за границы файла")
+        value = str(self.buf[self.pos:end], "utf-8")
+        self.pos = end
+        return value
+
+
+def _encode_topic_body(topic: Dict) -> bytes:
+    """Кодирует ресурсы, заметки и прогресс темы."""
+    out: List[bytes] = []
+    for r in topic.get("resources", []):
+        _pack_str(out, r["type"])
+        _pack_str(out, r["content"])
+    for n in topic.get("notes", []):
+        _pack_str(out, n["text"])
+        _pack_str(out, n["created_at"])
+    for p in topic.get("progress", []):
+        out.append(_I32.pack(p["percent"]))
+        _pack_str(out, p["date"])
+    return b"".join(out)
+
+
+def _decode_topic_body(reader: _Reader, resources: int, notes: int, progress: int) -> Dict:
+    """Разбирает тело темы в словари формата Topic.to_dict."""
+    return {
+        "resources": [
+            {"type": reader.text(), "content": reader.text()} for _ in range(resources)
+        ],
+        "notes": [
+            {"text": reader.text(), "created_at": reader.text()} for _ in range(notes)
+        ],
+        "progress": [
+            {"percent": reader.i32(), "date": reader.text()} for _ in range(progress)
+        ],
+    }
+
+
+def _decode_topic_body_at(
+    buf: memoryview, pos: int, resources: int, notes: int, progress: int
+) -> Dict:
+    """Разбирает тело темы, начинающееся с позиции pos (для ленивой загрузки)."""
+    reader = _Reader(buf)
+    reader.pos = pos
+    return _decode_topic_body(reader, resources, notes, progress)
+
+
+def encode(data: Dict[str, Any]) -> bytes:
+    """
+    Кодирует данные хранилища ({"user": User.to_dict()}) в бинарный формат.
+
+    Args:
+        data: Данные в формате data.json.
+
+    Returns:
+        Содержимое бинарного файла.
+    """
+    user = data.get("user")
+    out: List[bytes] = [MAGIC, bytes([VERSION, 1 if user else 0])]
+    if not user:
+        return b"".join(out)
+
+    _pack_str(out, user["username"])
+    topics = user.get("topics", [])
+    out.append(_U32.pack(len(topics)))
+    for topic in topics:
+        body = _encode_topic_body(topic)
+        _pack_str(out, topic["title"])
+        _pack_str(out, topic.get("description", ""))
+        out.append(_COUNTS.pack(
+            len(topic.get("resources", [])),
+            len(topic.get("notes", [])),
+            len(topic.get("progress", [])),
+            len(body),
+        ))
+        out.append(body)
+    return b"".join(out)
+
+
+def decode(raw: bytes, *, lazy: bool = False) -> Dict[str, Any]:
+    """
+    Разбирает бинарный файл в данные формата data.json.
+
+    Args:
+        raw: Содержимое бинарного файла.
+        lazy: Разбирать только заголовки тем; вместо списков тема получает
+            "counts" и функцию "body" (понимает Topic.from_dict).
+
+    Returns:
+        Словарь {"user": {...}} или пустой словарь, если пользователя нет.
+
+    Raises:
+        ValueError: Если файл поврежден или имеет другой формат.
+    """
+    if raw[:4] != MAGIC:
+        raise ValueError("Файл не является бинарным хранилищем трекера")
+
+    reader = _Reader(raw)
+    reader.pos = len(MAGIC)
+    try:
+        version = reader.u8()
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия формата: {version}")
+        if not reader.u8():
+            return {}
+
+        username = reader.text()
+        topics = []
+        for _ in range(reader.u32()):
+            title = reader.text()
+            description = reader.text()
+            resources, notes, progress, body_len = _COUNTS.unpack_from(reader.buf, reader.pos)
+            reader.pos += _COUNTS.size
+            topic = {"title": title, "description": description}
+            if lazy:
+                if reader.pos + body_len > len(reader.buf):
+                    raise ValueError("Тело темы выходит за границы файла")
+                topic["counts"] = [resources, notes, progress]
+                topic["body"] = partial(
+                    _decode_topic_body_at, reader.buf, reader.pos, resources, notes, progress
+                )
+                reader.pos += body_len
+            else:
+                topic.update(_decode_topic_body(reader, resources, notes, progress))
+            topics.append(topic)
+    except (struct.error, IndexError) as exc:
+        raise ValueError("Бинарный файл поврежден") from exc
+    return {"user": {"username": username, "topics": topics}}
+
+
+class BinaryCodec:
+    """
+    Кодек бинарного формата с интерфейсом кодеков FileStorage.
+
+    Работает с bytes и при ошибке разбора выбрасывает ValueError.
+    """
+
+    name = "binary"
+
+    def __init__(self, lazy: bool = False):
+        """
+        Инициализация кодека.
+
+        Args:
+            lazy: Откладывать разбор содержимого тем (см. decode).
+        """
+        self.lazy = lazy
+
+    def dumps(self, data: Any) -> bytes:
+        """Кодирует данные хранилища в бинарный формат."""
+        return encode(data)
+
+    def loads(self, raw: bytes) -> Any:
+        """Разбирает бинарный формат (пустой файл — пустые данные)."""
+        return decode(raw, lazy=self.lazy) if raw else {}
+
+    def __str__(self) -> str:
+        """Строковое представление кодека."""
+        return f"BinaryCodec(lazy={self.lazy})"
+
+
+def json_to_binary(src: str | Path, dst: str | Path) -> None:
+    """
+    Конвертирует data.json в бинарный формат.
+
+    Args:
+        src: Путь к JSON-файлу.
+        dst: Путь к создаваемому бинарному файлу.
+    """
+    from storage.file_storage import get_codec
+
+    data = get_codec().loads(Path(src).read_bytes())
+    Path(dst).write_bytes(encode(data))
+
+
+def binary_to_json(src: str | Path, dst: str | Path, *, pretty: bool = True) -> None:
+    """
+    Конвертирует бинарный файл обратно в формат data.json.
+
+    Args:
+        src: Путь к бинарному файлу.
+        dst: Путь к создаваемому JSON-файлу.
+        pretty: Писать JSON с отступами.
+    """
+    from storage.file_storage import get_codec
+
+    data = decode(Path(src).read_bytes())
+    Path(dst).write_bytes(get_codec(pretty=pretty).dumps(data))
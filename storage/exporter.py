@@ -0,0 +1,208 @@
+"""
+Модуль потокового экспорта базы знаний.
+
+Поддерживаемые форматы:
+
+- markdown: тема — раздел с описанием, ресурсами, заметками и прогрессом;
+- csv: по строке на тему/ресурс/заметку/запись прогресса
+  (topic,kind,type,content,created_at);
+- jsonl: те же записи, по JSON-объекту на строку.
+
+CSV и JSON Lines используют формат записей storage.importer, поэтому
+экспорт можно импортировать обратно.
+
+Экспорт — генератор строк: темы читаются по одной через
+FileStorage.iter_topics (потоково с диска, если возможно), а текст
+отдается по частям, поэтому весь результат в памяти не строится.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterator
+
+import csv
+import io
+import json
+
+from models.topic import Topic
+from storage.file_storage import FileStorage
+
+FORMATS = ("markdown", "csv", "jsonl")
+
+CSV_FIELDS = ("topic", "kind", "type", "content", "created_at")
+
+# MIME-типы для HTTP-ответа
+MEDIA_TYPES = {
+    "markdown": "text/markdown; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+EXTENSIONS = {"markdown": ".md", "csv": ".csv", "jsonl": ".jsonl"}
+
+_SUFFIXES = {".md": "markdown", ".markdown": "markdown", ".csv": "csv", ".jsonl": "jsonl"}
+
+
+def detect_format(path: str | Path) -> str:
+    """
+    Определяет формат экспорта по расширению файла.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Название формата из FORMATS
+
+    Raises:
+        ValueError: Если расширение не поддерживается
+    """
+    fmt = _SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Не удалось определить формат файла: {path}")
+    return fmt
+
+
+def topic_records(topic: Topic) -> Iterator[Dict]:
+    """
+    Перебирает записи темы в формате импорта.
+
+    Args:
+        topic: Тема
+
+    Yields:
+        Запись темы, затем ресурсов, заметок и прогресса
+    """
+    title = topic.title
+    yield {"topic": title, "kind": "topic", "content": topic.description}
+    for r in topic.resources:
+        yield {"topic": title, "kind": "resource", "type": r.res_type, "content": r.content}
+    for n in topic.notes:
+        yield {"topic": title, "kind": "note", "content": n.text, "created_at": n.created_at}
+    for p in topic.progress:
+        yield {"topic": title, "kind": "progress", "content": p.percent, "created_at": p.date}
+
+
+def _markdown(topic: Topic) -> str:
+    """Раздел Markdown для темы."""
+    lines = [f"## {topic.title}", ""]
+    if topic.description:
+        lines += [topic.description, ""]
+    if topic.resources:
+        lines.append("### Ресурсы")
+        for r in topic.resources:
+            item = f"<{r.content}>" if r.res_type == "link" else r.content
+            lines.append(f"- [{r.res_type}] {item}")
+        lines.append("")
+    if topic.notes:
+        lines.append("### Заметки")
+        lines += [f"- {n.created_at}: {n.text}" for n in topic.notes]
+        lines.append("")
+    if topic.progress:
+        lines.append("### Прогресс")
+        lines += [f"- {p.date}: {p.percent}%" for p in topic.progress]
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def iter_markdown(topics: Iterator[Topic]) -> Iterator[str]:
+    """
+    Перебирает части Markdown-документа.
+
+    Args:
+        topics: Темы
+
+    Yields:
+        Заголовок документа, затем раздел каждой темы
+    """
+    yield "# База знаний\n\n"
+    for topic in topics:
+        yield _markdown(topic)
+
+
+def iter_csv(topics: Iterator[Topic]) -> Iterator[str]:
+    """
+    Перебирает части CSV (заголовок, затем строки по темам).
+
+    Args:
+        topics: Темы
+
+    Yields:
+        Строки CSV одной темы
+    """
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for topic in topics:
+        writer.writerows(topic_records(topic))
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def iter_jsonl(topics: Iterator[Topic]) -> Iterator[str]:
+    """
+    Перебирает части JSON Lines (по теме за раз).
+
+    Args:
+        topics: Темы
+
+    Yields:
+        Строки JSON одной темы
+    """
+    for topic in topics:
+        yield "".join(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in topic_records(topic)
+        )
+
+
+def iter_export(storage: FileStorage, fmt: str) -> Iterator[str]:
+    """
+    Создает генератор частей экспорта базы знаний.
+
+    Формат проверяется сразу, до начала чтения хранилища.
+
+    Args:
+        storage: Хранилище
+        fmt: Формат из FORMATS
+
+    Returns:
+        Генератор частей текста в порядке вывода
+
+    Raises:
+        ValueError: Если формат неизвестен
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+    topics = storage.iter_topics()
+    if fmt == "markdown":
+        return iter_markdown(topics)
+    if fmt == "csv":
+        return iter_csv(topics)
+    return iter_jsonl(topics)
+
+
+def export_file(storage: FileStorage, path: str | Path, *, fmt: str | None = None) -> int:
+    """
+    Экспортирует базу знаний в файл, записывая его по частям.
+
+    Args:
+        storage: Хранилище
+        path: Путь к создаваемому файлу
+        fmt: Формат из FORMATS (по умолчанию — по расширению)
+
+    Returns:
+        Количество записанных символов
+
+    Raises:
+        ValueError: Если формат неизвестен
+    """
+    fmt = fmt or detect_format(path)
+    chunks = iter_export(storage, fmt)
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for chunk in chunks:
+            written += f.write(chunk)
+    return written
@@ -1,17 +1,283 @@
 """
 Модуль для работы с JSON-файлом хранения данных.
 Реализует автосохранение через менеджер контекста.
+
+В режиме журнала (journal=True) изменения дописываются в лог рядом
+со снимком data.json, а снимок периодически перезаписывается целиком
+(компактизация).
+
+Запись снимка атомарна (временный файл + os.replace), а политика fsync
+("always" / "batched" / "never") задает компромисс между задержкой
+и надежностью: при "batched" отложенный fsync выполняется по истечении
+интервала, при flush() или close().
+
+Сериализация выполняется через кодек: orjson или msgspec, если они
+установлены, иначе стандартный json. Кодек умеет компактный режим
+и режим с отступами для чтения человеком. Вместо JSON снимок можно
+хранить в компактном бинарном формате (format="binary").
 """
 
 from __future__ import annotations
 
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Any, Dict, Iterator
+from typing import Any, Dict, Iterator, List, Tuple, TYPE_CHECKING
 
+import atexit
 import json
+import os
+import threading
+import time
 
+from models.note import Note
+from models.progress import ProgressEntry
+from models.topic import Topic
 from models.user import User
+from storage import streaming
+from storage.journal import Journal
+from storage.rwlock import RWLock
+
+if TYPE_CHECKING:
+    from core.progress_stats import ProgressColumns, TopicStats
+    from core.search import SearchHit, SearchIndex
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - зависит от окружения
+    msgspec = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - зависит от окружения
+    fcntl = None
+
+
+FSYNC_POLICIES = ("always", "batched", "never")
+FORMATS = ("json", "binary")
+
+
+class JsonCodec:
+    """
+    Кодек JSON на стандартной библиотеке.
+
+    Базовый класс для кодеков: все они работают с bytes в UTF-8
+    и при ошибке разбора выбрасывают ValueError.
+    """
+
+    name = "json"
+
+    def __init__(self, pretty: bool = False):
+        """
+        Инициализация кодека.
+
+        Args:
+            pretty: Писать JSON с отступами (для чтения человеком).
+        """
+        self.pretty = pretty
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Сериализует данные в JSON.
+
+        Args:
+            data: Данные (словари, списки, строки, числа).
+
+        Returns:
+            JSON в кодировке UTF-8.
+        """
+        if self.pretty:
+            text = json.dumps(data, ensure_ascii=False, indent=2)
+        else:
+            text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return text.encode("utf-8")
+
+    def loads(self, raw: bytes) -> Any:
+        """
+        Разбирает JSON.
+
+        Args:
+            raw: JSON в кодировке UTF-8.
+
+        Returns:
+            Разобранные данные.
+        """
+        return json.loads(raw)
+
+    def __str__(self) -> str:
+        """Строковое представление кодека."""
+        return f"{type(self).__name__}(pretty={self.pretty})"
+
+
+class OrjsonCodec(JsonCodec):
+    """Кодек на orjson."""
+
+    name = "orjson"
+
+    def dumps(self, data: Any) -> bytes:
+        """Сериализует данные в JSON через orjson."""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if self.pretty else 0)
+
+    def loads(self, raw: bytes) -> Any:
+        """Разбирает JSON через orjson."""
+        return orjson.loads(raw)
+
+
+class MsgspecCodec(JsonCodec):
+    """Кодек на msgspec."""
+
+    name = "msgspec"
+
+    def dumps(self, data: Any) -> bytes:
+        """Сериализует данные в JSON через msgspec."""
+        raw = msgspec.json.encode(data)
+        return msgspec.json.format(raw, indent=2) if self.pretty else raw
+
+    def loads(self, raw: bytes) -> Any:
+        """Разбирает JSON через msgspec (ошибки приводятся к ValueError)."""
+        try:
+            return msgspec.json.decode(raw)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+
+CODECS = {
+    "orjson": (OrjsonCodec, orjson),
+    "msgspec": (MsgspecCodec, msgspec),
+    "json": (JsonCodec, json),
+}
+
+
+def get_codec(name: str = "auto", *, pretty: bool = False) -> JsonCodec:
+    """
+    Возвращает кодек по имени.
+
+    Args:
+        name: "auto" (самый быстрый из доступных), "orjson", "msgspec" или "json".
+        pretty: Писать JSON с отступами.
+
+    Returns:
+        Экземпляр кодека.
+
+    Raises:
+        ValueError: Если кодек неизвестен или его библиотека не установлена.
+    """
+    if name == "auto":
+        name = next(n for n, (_, module) in CODECS.items() if module is not None)
+
+    if name not in CODECS:
+        raise ValueError(f"Неизвестный кодек: {name}")
+    codec_cls, module = CODECS[name]
+    if module is None:
+        raise ValueError(f"Кодек {name} недоступен: библиотека не установлена")
+    return codec_cls(pretty=pretty)
+
+
+def _atomic_write(
+    path: Path, raw: bytes, *, fsync: bool, sync_data: bool | None = None
+) -> None:
+    """
+    Атомарно заменяет содержимое файла.
+
+    Данные пишутся во временный файл рядом с целевым и переименовываются
+    поверх него, поэтому при сбое на диске остается либо старая, либо
+    новая версия, но не обрезанный файл. Имя временного файла уникально
+    для процесса и потока: параллельные записи одного файла не пишут
+    в общий временный файл.
+
+    Args:
+        path: Целевой файл.
+        raw: Новое содержимое.
+        fsync: Сбросить файл и каталог на диск перед возвратом.
+        sync_data: Сбросить данные временного файла на диск перед
+            переименованием (по умолчанию — как fsync). Без этого после
+            сбоя питания на месте файла может оказаться пустой файл,
+            даже если сброс каталога отложен.
+    """
+    if sync_data is None:
+        sync_data = fsync
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+            if sync_data:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if fsync:
+        _fsync_path(path.parent)
+
+
+def _fsync_path(path: Path) -> None:
+    """Сбрасывает на диск файл или каталог по пути (ошибки игнорируются)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ConcurrentModificationError(RuntimeError):
+    """
+    Файл хранилища изменен другим процессом, и изменения нельзя объединить.
+
+    Локальные изменения отброшены, а пользователь перечитан с диска:
+    сессию нужно повторить.
+    """
+
+
+def _rebase(user: User, change: Dict) -> List[Dict]:
+    """
+    Приводит запись журнала к состоянию, перечитанному с диска.
+
+    Объединение идет на уровне тем: тема, которую параллельно создал
+    другой процесс, не дублируется — в нее добавляются ресурсы, заметки
+    и прогресс из записи; для добавления в отсутствующую тему она
+    создается заново. Имя пользователя — по последней записи.
+
+    Args:
+        user: Пользователь с изменениями других процессов.
+        change: Локальная запись журнала.
+
+    Returns:
+        Записи, которые нужно применить вместо исходной.
+    """
+    op = change["op"]
+    if op == "add_topic":
+        existing = user.get_topic(change["data"]["title"])
+        if existing is None:
+            return [change]
+        data = change["data"]
+        return [
+            {"op": item_op, "title": existing.title, "data": item}
+            for item_op, key in (
+                ("add_resource", "resources"),
+                ("add_note", "notes"),
+                ("add_progress", "progress"),
+            )
+            for item in data.get(key, [])
+        ]
+    if op != "set_username" and user.get_topic(change["title"]) is None:
+        return [{"op": "add_topic", "data": Topic(change["title"]).to_dict()}, change]
+    return [change]
+
+
+def _in_range(date: str, start: str | None, end: str | None) -> bool:
+    """Проверяет, что ISO-дата попадает в диапазон [start, end)."""
+    return (start is None or date >= start) and (end is None or date < end)
 
 
 class FileStorage:
@@ -19,22 +285,299 @@ class FileStorage:
     Класс для работы с JSON-файлом данных трекера.
 
     Хранит данные в памяти (self._data) и умеет сохранять/загружать JSON.
+    Файл читается при первом обращении к пользователю, а не в __init__.
+    Загруженный пользователь кэшируется между сессиями и перечитывается,
+    только если файлы изменились на диске (mtime/размер).
+
+    Несколько процессов могут работать с одним файлом: чтение идет под
+    разделяемой, а запись — под исключительной блокировкой (fcntl.flock
+    файла <имя>.lock). Если с момента чтения файлы изменились, перед
+    записью свои изменения накладываются на перечитанные данные
+    (см. _merge); объединить нельзя только изменения вне журнала —
+    тогда выбрасывается ConcurrentModificationError.
+
+    С threadsafe=True экземпляр можно разделять между потоками:
+    get_user(), search() и reading() выполняются параллельно,
+    а session(), batch() и запись — по одной (см. storage.rwlock).
+    С flush_interval сессии не пишут на диск сами: фоновый поток
+    собирает их изменения и сохраняет не позже чем через flush_interval
+    секунд после первого из них (close() дописывает остаток).
+
+    Методы iter_* позволяют обходить большие JSON-снимки потоково,
+    не загружая их в память целиком.
+
+    search() использует полнотекстовый индекс: он строится при первом
+    поиске, обновляется записями журнала изменений и сохраняется рядом
+    со снимком (<имя>.search) при каждой его перезаписи.
     """
 
-    def __init__(self, filepath: str = "data/data.json"):
+    def __init__(
+        self,
+        filepath: str = "data/data.json",
+        *,
+        journal: bool = False,
+        compact_every: int = 1000,
+        fsync: str = "always",
+        fsync_interval: float = 1.0,
+        codec: str = "auto",
+        pretty: bool = True,
+        format: str = "json",
+        threadsafe: bool = False,
+        flush_interval: float | None = None,
+    ):
         """
         Инициализация хранилища.
 
         Args:
             filepath: Путь к JSON-файлу (по умолчанию data/data.json).
+            journal: Дописывать изменения в журнал вместо перезаписи файла.
+            compact_every: Через сколько записей журнала переносить его
+                в снимок.
+            fsync: Политика сброса на диск: "always" — после каждой записи,
+                "batched" — не чаще раза в fsync_interval секунд (отложенный
+                сброс выполняется по таймеру, в flush() и close(); данные
+                снимка сбрасываются перед переименованием всегда),
+                "never" — полагаться на ОС.
+            fsync_interval: Интервал для политики "batched" (секунды).
+            codec: Кодек JSON ("auto", "orjson", "msgspec", "json").
+            pretty: Писать снимок с отступами; False — компактный режим.
+            format: Формат снимка: "json" или "binary"
+                (см. storage.binary_format; темы читаются лениво).
+            threadsafe: Разрешить параллельную работу из нескольких потоков.
+            flush_interval: Сохранять изменения в фоновом потоке не позже
+                чем через столько секунд (включает threadsafe); None —
+                сохранять сразу при выходе из сессии.
+
+        Raises:
+            ValueError: Если политика fsync, кодек, формат или интервал
+                сохранения некорректны.
         """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Неизвестная политика fsync: {fsync}")
+        if format not in FORMATS:
+            raise ValueError(f"Неизвестный формат хранения: {format}")
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError(f"Интервал сохранения должен быть положительным: {flush_interval}")
+
         self.filepath: Path = Path(filepath)
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
-        self._data: Dict[str, Any] = self._load_data()
+        self.journal = journal
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._last_fsync = 0.0
+        # Отложенный сброс для политики "batched" и его таймер
+        self._sync_lock = threading.Lock()
+        self._sync_pending = False
+        self._sync_timer: threading.Timer | None = None
+        self._batch_depth = 0
+        self._unsaved = False
+        self._needs_snapshot = False
+        self._buffer: List[Dict] = []
+        self.format = format
+        if format == "binary":
+            from storage.binary_format import BinaryCodec
+
+            self.codec = BinaryCodec(lazy=True)
+        else:
+            self.codec = get_codec(codec, pretty=pretty)
+        self._journal = Journal(
+            self.filepath.with_name(self.filepath.name + ".journal"),
+            codec=get_codec(codec),
+        )
+        self._data: Dict[str, Any] = {}
+        self._pending: List[Dict] = []
+        self._user: User | None = None
+        self._stamp: Tuple | None = None
+        self._search: SearchIndex | None = None
+        self._search_path = self.filepath.with_name(self.filepath.name + ".search")
+        self._progress: ProgressColumns | None = None
+        self._lock_path = self.filepath.with_name(self.filepath.name + ".lock")
+        self._lock_fd: int | None = None
+        self._lock_depth = 0
+
+        self.flush_interval = flush_interval
+        self.threadsafe = threadsafe or flush_interval is not None
+        self._rwlock = RWLock() if self.threadsafe else None
+        # Защищает кэш пользователя и индекса от параллельных читателей
+        self._state_lock = threading.RLock()
+        self._flusher: threading.Thread | None = None
+        self._flush_error: Exception | None = None
+        if flush_interval is not None:
+            self._wake = threading.Event()
+            self._stop = threading.Event()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name=f"flush-{self.filepath.name}", daemon=True
+            )
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _reading(self):
+        """Контекст блокировки потоков на чтение (без threadsafe — пустой)."""
+        return self._rwlock.read() if self._rwlock is not None else nullcontext()
+
+    def _writing(self):
+        """Контекст блокировки потоков на запись (без threadsafe — пустой)."""
+        return self._rwlock.write() if self._rwlock is not None else nullcontext()
+
+    def _flush_loop(self) -> None:
+        """Фоновый поток: сохраняет накопленные изменения раз в flush_interval."""
+        while True:
+            self._wake.wait()
+            # Даем другим сессиям добавить изменения в ту же запись,
+            # но не дольше flush_interval (close() прерывает ожидание)
+            self._stop.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._save()
+            except Exception as exc:
+                self._flush_error = exc
+            if self._stop.is_set():
+                return
+
+    def _autosave(self) -> None:
+        """Сохраняет изменения сразу или поручает это фоновому потоку."""
+        if self._batch_depth:
+            return
+        if self._flusher is not None:
+            self._wake.set()
+        else:
+            self._save()
+
+    def close(self) -> None:
+        """
+        Останавливает фоновое сохранение, записывает оставшиеся изменения
+        и выполняет отложенный fsync.
+
+        После close() хранилищем можно пользоваться дальше: сессии
+        сохраняются сразу, как без flush_interval.
+
+        Raises:
+            Exception: Ошибка последнего фонового сохранения, если она была
+                (например, ConcurrentModificationError).
+        """
+        # Снимаем хук до остановки потока: после close() atexit не должен
+        # держать ссылку на хранилище
+        atexit.unregister(self.close)
+        if self._flusher is not None:
+            self._stop.set()
+            self._wake.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        error, self._flush_error = self._flush_error, None
+        if error is not None:
+            raise error
+
+    @contextmanager
+    def _locked(self, exclusive: bool = True) -> Iterator[None]:
+        """
+        Блокирует файлы хранилища от других процессов (fcntl.flock).
+
+        Вложенные вызовы переиспользуют уже взятую блокировку (flock
+        привязан к дескриптору, повторная блокировка из того же объекта
+        привела бы к взаимоблокировке). Без fcntl (Windows) ничего не делает.
+
+        Args:
+            exclusive: Исключительная блокировка (запись) или разделяемая (чтение).
+        """
+        if fcntl is None or self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._lock_fd = fd
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+                self._lock_fd = None
+        finally:
+            # Закрытие дескриптора снимает блокировку
+            os.close(fd)
+
+    def _file_stamp(self) -> Tuple:
+        """
+        Возвращает отпечаток файлов хранилища для проверки актуальности кэша.
+
+        Returns:
+            Кортеж (mtime_ns, размер, inode) для снимка и журнала
+            (None, если файла нет).
+        """
+        stamps = []
+        for path in (self.filepath, self._journal.filepath):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        return tuple(stamps)
+
+    def _reload(self) -> None:
+        """Перечитывает снимок и журнал с диска и сбрасывает кэш пользователя."""
+        # Под блокировкой: иначе можно прочитать новый снимок вместе
+        # со старым, еще не очищенным журналом
+        with self._locked(exclusive=False):
+            self._stamp = self._file_stamp()
+            self._data = self._load_data()
+            self._pending = self._journal.read()
+        self._user = None
+        self._search = None
+        self._progress = None
+
+    def _is_stale(self) -> bool:
+        """Изменились ли файлы на диске с момента последнего чтения или записи."""
+        return self._stamp is not None and self._file_stamp() != self._stamp
+
+    def _merge(self) -> None:
+        """
+        Накладывает несохраненные изменения на перечитанные с диска данные.
+
+        Вызывается под исключительной блокировкой, если файлы изменил
+        другой процесс. Записи буфера применяются к свежему пользователю
+        с объединением на уровне тем (см. _rebase) и затем сохраняются
+        обычным путем.
+
+        Raises:
+            ConcurrentModificationError: Если есть изменения вне журнала
+                (их нельзя объединить) — они отбрасываются.
+        """
+        changes = self._buffer
+        untracked = self._needs_snapshot
+        self._reload()
+        user = self._hydrate()
+        if untracked or (user is None and changes):
+            self._buffer = []
+            self._unsaved = False
+            self._needs_snapshot = False
+            raise ConcurrentModificationError(
+                f"Файл {self.filepath} изменен другим процессом, повторите сессию"
+            )
+        if user is None:
+            return
+
+        merged = []
+        for change in changes:
+            for record in _rebase(user, change):
+                user.apply_change(record)
+                merged.append(record)
+        user.mark_clean()
+        self._buffer = merged
 
     def _load_data(self) -> Dict[str, Any]:
         """
-        Загружает данные из JSON-файла.
+        Загружает данные из файла снимка.
+
+        Поврежденный файл не затирается при следующем сохранении:
+        он переименовывается в <имя>.corrupt для ручного восстановления.
 
         Returns:
             Словарь с данными или пустой словарь, если файла нет/он поврежден.
@@ -43,25 +586,179 @@ class FileStorage:
             return {}
 
         try:
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
+            return self.codec.loads(self.filepath.read_bytes())
+        except ValueError:
+            corrupt_path = self.filepath.with_name(self.filepath.name + ".corrupt")
+            os.replace(self.filepath, corrupt_path)
+            return {}
+        except OSError:
             return {}
 
     def _save_data(self) -> None:
-        """Сохраняет текущие данные self._data в JSON-файл."""
-        with open(self.filepath, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        """Атомарно сохраняет текущие данные self._data в файл снимка."""
+        raw = self.codec.dumps(self._data)
+        _atomic_write(
+            self.filepath, raw, fsync=self._should_fsync(), sync_data=self.fsync != "never"
+        )
+
+    def _should_fsync(self) -> bool:
+        """
+        Решает, нужен ли fsync для текущей записи согласно политике.
+
+        Returns:
+            True, если данные нужно сбросить на диск.
+        """
+        if self.fsync == "always":
+            return True
+        if self.fsync == "never":
+            return False
+
+        with self._sync_lock:
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                self._last_fsync = now
+                self._sync_pending = False
+                return True
+            # Сброс откладывается до конца интервала, а не до следующей записи
+            self._sync_pending = True
+            if self._sync_timer is None:
+                self._sync_timer = threading.Timer(
+                    self._last_fsync + self.fsync_interval - now, self._sync
+                )
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+            return False
+
+    def _sync(self) -> None:
+        """Выполняет отложенный fsync: журнал и каталог хранилища."""
+        with self._sync_lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if not self._sync_pending:
+                return
+            self._sync_pending = False
+            self._last_fsync = time.monotonic()
+            # Данные снимка уже сброшены перед переименованием (см. _save_data)
+            _fsync_path(self._journal.filepath)
+            _fsync_path(self.filepath.parent)
+
+    def _hydrate(self) -> User | None:
+        """
+        Создает объект User из снимка и применяет к нему записи журнала.
+
+        Журнал читается всегда, даже без journal=True, чтобы изменения,
+        записанные в режиме журнала, не потерялись.
+
+        Returns:
+            Пользователь или None, если он ещё не создан.
+        """
+        user_data = self._data.get("user")
+        if not user_data:
+            return None
+
+        user = User.from_dict(user_data)
+        for change in self._pending:
+            user.apply_change(change)
+        user.mark_clean()
+        self._pending = []
+        self._user = user
+        return user
+
+    def compact(self) -> None:
+        """Переносит журнал в снимок: перезаписывает файл и очищает журнал."""
+        with self._writing(), self._locked():
+            if self._is_stale():
+                self._merge()
+            user = self._user or self.get_user()
+            if user is not None:
+                # Заголовок "meta" пишется перед "user": summary() читает его,
+                # не пропуская темы
+                self._data = {
+                    "meta": {"username": user.username, "topics": len(user.topics)},
+                    "user": user.to_dict(),
+                }
+            self._save_data()
+            self._journal.clear()
+            self._needs_snapshot = False
+            self._stamp = self._file_stamp()
+            if self._search is not None:
+                self._save_search(self._search, self._stamp[0])
+
+    def has_user(self) -> bool:
+        """
+        Проверяет, создан ли пользователь, не загружая темы.
+
+        JSON-снимок читается только до имени пользователя (см. _can_stream).
+        Поврежденный снимок читается обычным путем: get_user() переименует
+        его в .corrupt.
+
+        Returns:
+            True, если пользователь есть.
+        """
+        if self._can_stream():
+            try:
+                with open(self.filepath, "r", encoding="utf-8") as f:
+                    return streaming.has_user(f)
+            except ValueError:
+                pass
+        return self.get_user() is not None
+
+    def summary(self) -> Dict[str, Any] | None:
+        """
+        Возвращает имя пользователя и количество тем.
+
+        Для JSON-снимка читается только заголовок "meta" в начале файла
+        (в старых снимках без него темы пропускаются потоково, без создания
+        объектов; см. _can_stream). Иначе, а также если снимок поврежден,
+        данные берутся из get_user().
+
+        Returns:
+            Словарь {"username": ..., "topics": ...} или None, если
+            пользователя нет.
+        """
+        if self._can_stream():
+            try:
+                with open(self.filepath, "r", encoding="utf-8") as f:
+                    return streaming.read_summary(f)
+            except ValueError:
+                pass
+        user = self.get_user()
+        if user is None:
+            return None
+        return {"username": user.username, "topics": len(user.topics)}
 
     def get_user(self) -> User | None:
         """
         Возвращает текущего пользователя.
 
+        Пользователь создается из файла один раз и переиспользуется,
+        пока файлы хранилища не изменятся на диске (несохраненные
+        изменения внутри batch() при этом не отбрасываются).
+
         Returns:
             Экземпляр User или None, если пользователь ещё не создан.
         """
-        user_data = self._data.get("user")
-        return User.from_dict(user_data) if user_data else None
+        with self._reading(), self._state_lock:
+            if not self._unsaved and self._file_stamp() != self._stamp:
+                self._reload()
+            return self._user or self._hydrate()
+
+    @contextmanager
+    def reading(self) -> Iterator[User | None]:
+        """
+        Контекст чтения пользователя без изменений.
+
+        С threadsafe=True сессии других потоков не меняют пользователя,
+        пока блок не завершится; читателей может быть несколько
+        (ленивая загрузка тем защищена блокировкой, см. Topic._load).
+        Изменять пользователя внутри блока нельзя (используйте session()).
+
+        Yields:
+            User или None, если пользователь ещё не создан.
+        """
+        with self._reading():
+            yield self.get_user()
 
     def create_user(self, username: str) -> User:
         """
@@ -74,19 +771,308 @@ class FileStorage:
             Созданный пользователь.
         """
         user = User(username)
-        self._data["user"] = user.to_dict()
-        self._save_data()
+        self._needs_snapshot = True
+        self.update_user(user)
         return user
 
     def update_user(self, user: User) -> None:
         """
-        Записывает текущее состояние пользователя в self._data и сохраняет.
+        Делает пользователя текущим (кэшированным) и сохраняет его.
+
+        В режиме журнала на диск дописываются только накопленные изменения;
+        снимок перезаписывается раз в compact_every записей, а также
+        после прямых изменений полей, которых нет в журнале, и при замене
+        пользователя другим объектом (его данные не описаны журналом).
 
         Args:
             user: Пользователь с обновлёнными данными.
         """
-        self._data["user"] = user.to_dict()
-        self._save_data()
+        with self._writing():
+            replaced = user is not self._user
+            self._user = user
+            changes = user.pop_changes()
+            self._buffer.extend(changes)
+            self._needs_snapshot = (
+                self._needs_snapshot or replaced or user.has_untracked_changes
+            )
+            if replaced or user.has_untracked_changes:
+                self._search = None
+                self._progress = None
+            else:
+                if self._search is not None:
+                    self._search.apply_changes(changes)
+                if self._progress is not None:
+                    self._progress.apply_changes(changes)
+            self._unsaved = True
+            user.mark_clean()
+            self._autosave()
+
+    def flush(self) -> None:
+        """
+        Записывает на диск изменения, отложенные в batch().
+
+        Если файлы с момента чтения изменил другой процесс, изменения
+        сначала объединяются с его данными (см. _merge). При политике
+        fsync "batched" также выполняется отложенный сброс на диск.
+
+        Raises:
+            ConcurrentModificationError: Если объединить изменения нельзя.
+        """
+        self._save()
+        self._sync()
+
+    def _save(self) -> None:
+        """
+        Записывает несохраненные изменения (fsync — согласно политике).
+
+        Raises:
+            ConcurrentModificationError: Если объединить изменения нельзя.
+        """
+        with self._writing(), self._locked():
+            if not self._unsaved:
+                return
+            if self._is_stale():
+                self._merge()
+
+            self._unsaved = False
+            changes, self._buffer = self._buffer, []
+            if not self.journal or self._needs_snapshot:
+                self.compact()
+                return
+
+            self._journal.append(changes, fsync=self._should_fsync())
+            if len(self._journal) >= self.compact_every:
+                self.compact()
+            self._stamp = self._file_stamp()
+
+    def _can_stream(self) -> bool:
+        """
+        Можно ли читать снимок с диска потоково.
+
+        Потоковое чтение возможно только для JSON-снимка без непримененного
+        журнала и без пользователя в памяти (тогда быстрее обойти его).
+        """
+        return (
+            self.format == "json"
+            and self._user is None
+            and not self._journal.filepath.exists()
+            and self.filepath.exists()
+        )
+
+    def iter_topics(self) -> Iterator[Topic]:
+        """
+        Перебирает темы пользователя.
+
+        Yields:
+            Темы (содержимое загружается лениво, при обращении).
+        """
+        if not self._can_stream():
+            user = self.get_user()
+            yield from user.topics if user else ()
+            return
+
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            for data in streaming.iter_topics(f):
+                yield Topic.from_dict(data)
+
+    def iter_notes(self, title: str) -> Iterator[Note]:
+        """
+        Перебирает заметки темы по одной.
+
+        Args:
+            title: Название темы (без учета регистра, как в User.get_topic).
+
+        Yields:
+            Заметки темы в порядке добавления.
+        """
+        key = title.casefold()
+
+        def accept_title(topic_title: str) -> bool:
+            return topic_title.casefold() == key
+
+        if not self._can_stream():
+            for topic in self.iter_topics():
+                if accept_title(topic.title):
+                    yield from topic.notes
+            return
+
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            for _, data in streaming.iter_topic_items(f, "notes", accept_title):
+                yield Note.from_dict(data)
+
+    def iter_progress(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+        *,
+        title: str | None = None,
+    ) -> Iterator[Tuple[str, ProgressEntry]]:
+        """
+        Перебирает записи прогресса в диапазоне дат.
+
+        Args:
+            start: Начало диапазона (ISO-дата, включительно).
+            end: Конец диапазона (ISO-дата, не включительно).
+            title: Только для темы с этим названием (без учета регистра).
+
+        Yields:
+            Пары (название темы, запись прогресса).
+        """
+        key = title.casefold() if title is not None else None
+
+        def accept_title(topic_title: str) -> bool:
+            return key is None or topic_title.casefold() == key
+
+        if self._can_stream():
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                for topic_title, data in streaming.iter_topic_items(
+                    f, "progress", accept_title
+                ):
+                    entry = ProgressEntry.from_dict(data)
+                    if _in_range(entry.date, start, end):
+                        yield topic_title, entry
+            return
+
+        for topic in self.iter_topics():
+            if accept_title(topic.title):
+                for entry in topic.progress:
+                    if _in_range(entry.date, start, end):
+                        yield topic.title, entry
+
+    def _save_search(self, index: SearchIndex, snapshot: Tuple) -> None:
+        """
+        Сохраняет поисковый индекс вместе с отпечатком снимка.
+
+        Запись идет под исключительной блокировкой файла: индекс не
+        перезаписывается, пока другой процесс меняет снимок, и не
+        сохраняется для снимка, который уже заменен.
+
+        Args:
+            index: Индекс, соответствующий снимку без журнала.
+            snapshot: (mtime_ns, размер, inode) файла снимка.
+        """
+        data = index.to_dict()
+        data["snapshot"] = snapshot
+        raw = self._journal.codec.dumps(data)
+        with self._locked():
+            if self._file_stamp()[0] != snapshot:
+                return
+            _atomic_write(self._search_path, raw, fsync=False)
+
+    def _load_search(self, user: User) -> SearchIndex:
+        """
+        Загружает сохраненный индекс или строит его заново.
+
+        Сохраненный индекс используется, только если он записан для
+        текущего снимка; к нему применяются записи журнала и изменения,
+        отложенные в batch().
+
+        Args:
+            user: Текущий пользователь (для построения индекса с нуля).
+
+        Returns:
+            Актуальный поисковый индекс.
+        """
+        from core.search import SearchIndex
+
+        try:
+            data = self._journal.codec.loads(self._search_path.read_bytes())
+        except (OSError, ValueError):
+            data = None
+
+        snapshot = self._file_stamp()[0]
+        if data and snapshot is not None and data.get("snapshot") == list(snapshot):
+            index = SearchIndex.from_dict(data)
+            index.apply_changes(self._journal.read())
+            index.apply_changes(self._buffer)
+            return index
+
+        index = SearchIndex.build(user)
+        if snapshot is not None and not self._unsaved and not self._journal.filepath.exists():
+            self._save_search(index, snapshot)
+        return index
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """
+        Ищет по названиям и описаниям тем, заметкам и ресурсам.
+
+        Args:
+            query: Строка запроса.
+            limit: Максимальное количество результатов.
+
+        Returns:
+            Результаты по убыванию релевантности, с текстом документа.
+        """
+        with self._reading(), self._state_lock:
+            user = self.get_user()
+            if user is None:
+                return []
+            if self._search is None:
+                self._search = self._load_search(user)
+
+            hits = []
+            for hit in self._search.search(query, limit):
+                topic = user.get_topic(hit.topic)
+                if topic is None:
+                    continue
+                if hit.kind == "topic":
+                    hit.text = topic.description
+                elif hit.kind == "note" and hit.position < topic.note_count:
+                    hit.text = topic.notes[hit.position].text
+                elif hit.kind == "resource" and hit.position < topic.resource_count:
+                    hit.text = topic.resources[hit.position].content
+                else:
+                    continue
+                hits.append(hit)
+            return hits
+
+    def progress_stats(self, window: int = 3) -> List[TopicStats]:
+        """
+        Статистика прогресса по всем темам (см. core.progress_stats).
+
+        Колонки истории прогресса строятся при первом вызове и затем
+        дополняются изменениями сессий, как поисковый индекс; заново
+        они собираются только после изменений вне журнала или данных
+        другого процесса.
+
+        Args:
+            window: Размер окна скользящего среднего.
+
+        Returns:
+            Статистика в порядке тем (пустой список, если пользователя нет).
+        """
+        from core.progress_stats import ProgressColumns
+
+        with self._reading():
+            with self._state_lock:
+                user = self.get_user()
+                if user is None:
+                    return []
+                if self._progress is None:
+                    self._progress = ProgressColumns.build(user.topics)
+                columns = self._progress
+            # Сессии меняют колонки только под блокировкой записи
+            return columns.summary(window)
+
+    @contextmanager
+    def batch(self) -> Iterator[FileStorage]:
+        """
+        Группирует несколько сессий в одну запись на диск.
+
+        Сохранения внутри блока откладываются и выполняются одним flush()
+        при выходе (вложенные batch() объединяются с внешним). С threadsafe=True
+        блок целиком выполняется под блокировкой записи.
+
+        Yields:
+            FileStorage: это же хранилище.
+        """
+        with self._writing():
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                self._autosave()
 
     @contextmanager
     def session(self) -> Iterator[User]:
@@ -94,19 +1080,23 @@ class FileStorage:
         Контекст “сессии” для изменения пользователя с автосохранением.
 
         На входе возвращает объект User (создаст, если его ещё нет).
-        На выходе автоматически сохраняет изменения.
+        На выходе автоматически сохраняет изменения, если они были
+        (сессии только для чтения ничего не пишут на диск).
+        С threadsafe=True сессии разных потоков выполняются по одной.
 
         Yields:
             User: объект пользователя для изменения.
         """
-        user = self.get_user()
-        if user is None:
-            user = self.create_user("default")
+        with self._writing():
+            user = self.get_user()
+            if user is None:
+                user = self.create_user("default")
 
-        try:
-            yield user
-        finally:
-            self.update_user(user)
+            try:
+                yield user
+            finally:
+                if user.is_dirty:
+                    self.update_user(user)
 
     def __str__(self) -> str:
         """Строковое представление хранилища."""
@@ -0,0 +1,447 @@
+"""
+Модуль пакетного импорта тем, ресурсов и заметок.
+
+Поддерживаемые форматы:
+
+- csv: таблица с заголовком topic,kind,type,content[,created_at];
+- jsonl: по объекту {"topic": ..., "kind": ..., "type": ..., "content": ...}
+  на строку;
+- bookmarks: HTML-экспорт закладок браузера (Netscape Bookmark File):
+  папки становятся темами, ссылки — ресурсами типа link.
+
+kind — "topic" (content — описание темы), "resource" (type — link/text),
+"note" (content — текст заметки, created_at — время, опционально) или
+"progress" (content — процент 0..100, created_at — дата, опционально).
+
+Файлы читаются потоково и обрабатываются пачками: ссылки пачки
+проверяются одним вызовом validate_urls, дубликаты (тема с тем же
+названием без учета регистра, ресурс, заметка или запись прогресса
+с тем же содержимым в теме) пропускаются, а все изменения сохраняются одной записью
+хранилища (одна session()). Файл сначала читается и проверяется целиком,
+и только затем записи применяются к пользователю: ошибка чтения в
+середине файла не оставляет в хранилище частичный импорт.
+"""
+
+from __future__ import annotations
+
+from html.parser import HTMLParser
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Set, TextIO, Tuple
+
+import csv
+import json
+
+from core.utils import validate_urls
+from models.note import Note
+from models.progress import ProgressEntry
+from models.resource import Resource
+from models.topic import Topic
+from models.user import User
+from storage.file_storage import FileStorage
+
+FORMATS = ("csv", "jsonl", "bookmarks")
+
+# Тема для закладок вне папок
+DEFAULT_TOPIC = "Закладки"
+
+RESOURCE_TYPES = ("link", "text")
+
+CHUNK_SIZE = 1000
+
+# Сколько сообщений об ошибках хранить в отчете
+MAX_ERRORS = 20
+
+_SUFFIXES = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".html": "bookmarks",
+    ".htm": "bookmarks",
+}
+
+
+class ImportReport:
+    """
+    Итог импорта.
+
+    Содержит количество добавленных тем, ресурсов, заметок и записей
+    прогресса, пропущенных
+    дубликатов и некорректных записей, а также первые сообщения об ошибках.
+    """
+
+    def __init__(self):
+        """Инициализация пустого отчета."""
+        self.topics = 0
+        self.resources = 0
+        self.notes = 0
+        self.progress = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors: List[str] = []
+
+    def add_error(self, message: str) -> None:
+        """
+        Учитывает некорректную запись.
+
+        Args:
+            message: Описание ошибки
+        """
+        self.invalid += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(message)
+
+    def to_dict(self) -> Dict:
+        """Возвращает словарь для сериализации в JSON."""
+        return {
+            "topics": self.topics,
+            "resources": self.resources,
+            "notes": self.notes,
+            "progress": self.progress,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "errors": self.errors,
+        }
+
+    def __str__(self) -> str:
+        """Строковое представление отчета."""
+        return (
+            f"Добавлено: тем {self.topics}, ресурсов {self.resources}, "
+            f"заметок {self.notes}, прогресса {self.progress}; дубликатов {self.duplicates}, "
+            f"ошибок {self.invalid}"
+        )
+
+
+def detect_format(path: str | Path) -> str:
+    """
+    Определяет формат файла по расширению.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Название формата из FORMATS
+
+    Raises:
+        ValueError: Если расширение не поддерживается
+    """
+    fmt = _SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Не удалось определить формат файла: {path}")
+    return fmt
+
+
+def iter_csv(f: TextIO) -> Iterator[Tuple[int, Dict]]:
+    """
+    Перебирает записи CSV-файла.
+
+    Args:
+        f: Открытый файл (newline="")
+
+    Yields:
+        Пары (номер строки, запись)
+    """
+    reader = csv.DictReader(f)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_jsonl(f: TextIO) -> Iterator[Tuple[int, Dict | None]]:
+    """
+    Перебирает записи JSON Lines.
+
+    Args:
+        f: Открытый файл
+
+    Yields:
+        Пары (номер строки, запись); None — строка не разобрана
+    """
+    for number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield number, record if isinstance(record, dict) else None
+
+
+class _BookmarkParser(HTMLParser):
+    """Разбор HTML-экспорта закладок в записи ресурсов."""
+
+    def __init__(self):
+        """Инициализация разборщика."""
+        super().__init__()
+        self.records: List[Dict] = []
+        self._folders: List[str | None] = []
+        self._pending_folder: str | None = None
+        self._text: List[str] | None = None
+        self._href: str | None = None
+
+    def _topic(self) -> str:
+        """Название текущей (самой вложенной) папки."""
+        for folder in reversed(self._folders):
+            if folder:
+                return folder
+        return DEFAULT_TOPIC
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        """Открывает папку, список или ссылку."""
+        if tag == "h3":
+            self._text = []
+        elif tag == "dl":
+            self._folders.append(self._pending_folder)
+            self._pending_folder = None
+        elif tag == "a":
+            self._href = dict(attrs).get("href")
+
+    def handle_endtag(self, tag: str) -> None:
+        """Закрывает папку, список или ссылку."""
+        if tag == "h3" and self._text is not None:
+            self._pending_folder = "".join(self._text).strip() or None
+            self._text = None
+        elif tag == "dl" and self._folders:
+            self._folders.pop()
+        elif tag == "a" and self._href is not None:
+            self.records.append({
+                "topic": self._topic(),
+                "kind": "resource",
+                "type": "link",
+                "content": self._href,
+            })
+            self._href = None
+
+    def handle_data(self, data: str) -> None:
+        """Накапливает название папки."""
+        if self._text is not None:
+            self._text.append(data)
+
+
+def iter_bookmarks(f: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Tuple[int, Dict]]:
+    """
+    Перебирает ссылки из HTML-экспорта закладок.
+
+    Args:
+        f: Открытый файл
+        chunk_size: Размер читаемого куска (символы)
+
+    Yields:
+        Пары (порядковый номер ссылки, запись ресурса)
+    """
+    parser = _BookmarkParser()
+    number = 0
+    while True:
+        chunk = f.read(chunk_size)
+        if chunk:
+            parser.feed(chunk)
+        else:
+            parser.close()
+        for record in parser.records:
+            number += 1
+            yield number, record
+        parser.records.clear()
+        if not chunk:
+            return
+
+
+_READERS = {"csv": iter_csv, "jsonl": iter_jsonl, "bookmarks": iter_bookmarks}
+
+
+def _normalize(record: Dict | None) -> Tuple[Dict | None, str]:
+    """
+    Проверяет запись и приводит ее к виду {topic, kind, type, content}.
+
+    Returns:
+        Пара (запись, ""), либо (None, описание ошибки)
+    """
+    if record is None:
+        return None, "некорректный JSON"
+    topic = str(record.get("topic") or "").strip()
+    kind = str(record.get("kind") or "resource").strip().lower()
+    content = str(record.get("content") or "").strip()
+    if not topic:
+        return None, "не указана тема"
+    if kind == "topic":
+        return {"topic": topic, "kind": kind, "content": content}, ""
+    if not content:
+        return None, "пустое содержимое"
+    if kind in ("note", "progress"):
+        created_at = record.get("created_at") or None
+        if kind == "progress":
+            try:
+                content = int(content)
+            except ValueError:
+                return None, f"процент не является числом: {content}"
+            if not 0 <= content <= 100:
+                return None, f"процент вне диапазона 0..100: {content}"
+        return {"topic": topic, "kind": kind, "content": content, "created_at": created_at}, ""
+    if kind != "resource":
+        return None, f"неизвестный вид записи: {kind}"
+    res_type = str(record.get("type") or "link").strip().lower()
+    if res_type not in RESOURCE_TYPES:
+        return None, f"неподдерживаемый тип ресурса: {res_type}"
+    return {"topic": topic, "kind": kind, "type": res_type, "content": content}, ""
+
+
+class _Importer:
+    """Применение записей к пользователю с учетом дубликатов."""
+
+    def __init__(self, user: User, report: ImportReport):
+        """
+        Инициализация.
+
+        Args:
+            user: Пользователь, в которого идет импорт
+            report: Отчет для подсчета результатов
+        """
+        self.user = user
+        self.report = report
+        # Содержимое ресурсов, заметок и прогресса тем, затронутых импортом
+        self._seen: Dict[int, Dict[str, Set]] = {}
+
+    def _topic(self, title: str, description: str = "") -> Tuple[Topic, bool]:
+        """Находит тему по названию или создает новую."""
+        topic = self.user.get_topic(title)
+        if topic is not None:
+            return topic, False
+        topic = Topic(title, description)
+        self.user.add_topic(topic)
+        self.report.topics += 1
+        return topic, True
+
+    def _seen_for(self, topic: Topic) -> Dict[str, Set]:
+        """Ключи уже имеющихся ресурсов, заметок и прогресса темы по виду записи."""
+        seen = self._seen.get(id(topic))
+        if seen is None:
+            seen = {
+                "resource": {(r.res_type, r.content) for r in topic.resources},
+                "note": {n.text for n in topic.notes},
+                "progress": {(p.percent, p.date) for p in topic.progress},
+            }
+            self._seen[id(topic)] = seen
+        return seen
+
+    def apply(self, record: Dict) -> None:
+        """
+        Применяет проверенную запись.
+
+        Args:
+            record: Запись после _normalize
+        """
+        kind = record["kind"]
+        if kind == "topic":
+            _, created = self._topic(record["topic"], record["content"])
+            if not created:
+                self.report.duplicates += 1
+            return
+
+        topic, _ = self._topic(record["topic"])
+        content = record["content"]
+        if kind == "resource":
+            key = (record["type"], content)
+        elif kind == "note":
+            key = content
+        else:
+            entry = ProgressEntry(content, record["created_at"])
+            key = (content, entry.date)
+
+        seen = self._seen_for(topic)[kind]
+        if key in seen:
+            self.report.duplicates += 1
+            return
+        seen.add(key)
+
+        if kind == "resource":
+            topic.add_resource(Resource(record["type"], content))
+            self.report.resources += 1
+        elif kind == "note":
+            topic.add_note(Note(content, record["created_at"]))
+            self.report.notes += 1
+        else:
+            topic.add_progress(entry)
+            self.report.progress += 1
+
+
+def import_records(
+    storage: FileStorage,
+    records: Iterable[Tuple[int, Dict | None]],
+    *,
+    chunk_size: int = CHUNK_SIZE,
+) -> ImportReport:
+    """
+    Импортирует записи в хранилище одной транзакцией.
+
+    Некорректные записи (пустая тема, неизвестный тип, невалидный URL)
+    пропускаются и учитываются в отчете. Если чтение записей прерывается
+    исключением, хранилище не изменяется.
+
+    Args:
+        storage: Хранилище
+        records: Пары (номер строки, запись), как у iter_csv/iter_jsonl
+        chunk_size: Размер пачки для проверки ссылок
+
+    Returns:
+        Отчет об импорте
+    """
+    report = ImportReport()
+    records = iter(records)
+    # Пользователь не меняется, пока не прочитан весь ввод: session()
+    # сохраняет измененного пользователя и при исключении
+    accepted: List[Dict] = []
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+
+        valid = []
+        for number, raw in chunk:
+            record, error = _normalize(raw)
+            if record is None:
+                report.add_error(f"Запись {number}: {error}")
+            else:
+                valid.append((number, record))
+
+        links = [r["content"] for _, r in valid if r.get("type") == "link"]
+        link_ok = iter(validate_urls(links))
+        for number, record in valid:
+            if record.get("type") == "link" and not next(link_ok):
+                report.add_error(f"Запись {number}: URL не прошел валидацию")
+                continue
+            accepted.append(record)
+
+    with storage.session() as user:
+        importer = _Importer(user, report)
+        for record in accepted:
+            importer.apply(record)
+    return report
+
+
+def import_file(
+    storage: FileStorage,
+    path: str | Path,
+    *,
+    fmt: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> ImportReport:
+    """
+    Импортирует файл в хранилище одной транзакцией.
+
+    Args:
+        storage: Хранилище
+        path: Путь к файлу
+        fmt: Формат из FORMATS (по умолчанию — по расширению)
+        chunk_size: Размер пачки для проверки ссылок
+
+    Returns:
+        Отчет об импорте
+
+    Raises:
+        ValueError: Если формат неизвестен
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in _READERS:
+        raise ValueError(f"Неизвестный формат импорта: {fmt}")
+
+    # utf-8-sig: CSV из Excel начинается с BOM
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return import_records(storage, _READERS[fmt](f), chunk_size=chunk_size)
@@ -0,0 +1,118 @@
+"""
+Модуль append-only журнала изменений для FileStorage.
+
+Каждое изменение пользователя записывается одной компактной JSON-строкой,
+поэтому стоимость записи пропорциональна изменению, а не размеру базы.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, TYPE_CHECKING
+
+import os
+
+if TYPE_CHECKING:
+    from storage.file_storage import JsonCodec
+
+
+class Journal:
+    """
+    Журнал изменений в формате JSON Lines.
+
+    Записи только дописываются в конец файла; очистка происходит
+    при компактизации хранилища в снимок.
+    """
+
+    def __init__(self, filepath: Path, codec: JsonCodec):
+        """
+        Инициализация журнала.
+
+        Args:
+            filepath: Путь к файлу журнала.
+            codec: Компактный кодек JSON для записей.
+        """
+        self.filepath: Path = filepath
+        self.codec = codec
+        self._count: int | None = None
+        # Конец последней целой записи, если за ней недописанный хвост
+        self._valid_size: int | None = None
+
+    def append(self, records: Iterable[Dict], *, fsync: bool = False) -> int:
+        """
+        Дописывает записи в конец журнала.
+
+        Недописанный хвост, найденный read(), сначала отрезается: иначе
+        первая новая запись склеилась бы с ним, и все последующие записи
+        терялись бы при следующем чтении.
+
+        Args:
+            records: Записи об изменениях.
+            fsync: Сбросить данные на диск (os.fsync) после записи.
+
+        Returns:
+            Количество записанных записей.
+        """
+        lines = [self.codec.dumps(r) + b"\n" for r in records]
+        if not lines:
+            return 0
+
+        count = len(self)
+        with open(self.filepath, "ab") as f:
+            if self._valid_size is not None:
+                f.truncate(self._valid_size)
+                self._valid_size = None
+            f.writelines(lines)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self._count = count + len(lines)
+        return len(lines)
+
+    def read(self) -> List[Dict]:
+        """
+        Читает все записи журнала.
+
+        Недописанная (поврежденная или без перевода строки) последняя
+        строка, например после сбоя во время записи, пропускается,
+        а ее позиция запоминается для append().
+
+        Returns:
+            Список записей в порядке их добавления.
+        """
+        self._valid_size = None
+        if not self.filepath.exists():
+            self._count = 0
+            return []
+
+        records: List[Dict] = []
+        offset = 0
+        with open(self.filepath, "rb") as f:
+            for line in f:
+                try:
+                    # Запись считается сохраненной только вместе с "\n"
+                    if not line.endswith(b"\n"):
+                        raise ValueError("недописанная строка")
+                    records.append(self.codec.loads(line))
+                except ValueError:
+                    self._valid_size = offset
+                    break
+                offset += len(line)
+        self._count = len(records)
+        return records
+
+    def clear(self) -> None:
+        """Удаляет журнал (после переноса изменений в снимок)."""
+        self.filepath.unlink(missing_ok=True)
+        self._count = 0
+        self._valid_size = None
+
+    def __len__(self) -> int:
+        """Количество записей в журнале."""
+        if self._count is None:
+            self.read()
+        return self._count or 0
+
+    def __str__(self) -> str:
+        """Строковое представление журнала."""
+        return f"Journal({self.filepath})"
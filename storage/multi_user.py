@@ -0,0 +1,256 @@
+"""
+Модуль хранилища с разделами по пользователям.
+
+Каждый пользователь хранится в собственном каталоге со своим
+FileStorage (снимок data.json, журнал, поисковый индекс):
+
+    <root>/index.json                 — имена пользователей -> каталоги
+    <root>/<имя>-<хэш>/data.json      — данные одного пользователя
+
+Загрузка и сохранение одного пользователя не читают и не переписывают
+файлы других, а изменения разных пользователей не конкурируют за один
+общий файл. Индекс перезаписывается только при создании пользователя,
+под блокировкой файла index.json.lock (fcntl.flock, как у FileStorage),
+поэтому параллельные процессы не теряют записи друг друга.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import hashlib
+import os
+import re
+import threading
+
+from models.user import User
+from storage.file_storage import FileStorage, _atomic_write, fcntl, get_codec
+
+# Символы, допустимые в имени каталога пользователя
+_UNSAFE_CHARS = re.compile(r"[^\w-]+")
+
+
+def partition_name(username: str) -> str:
+    """
+    Возвращает имя каталога раздела пользователя.
+
+    Имя читаемо (очищенное имя пользователя) и уникально (короткий хэш
+    полного имени), поэтому разные имена не попадают в один каталог.
+
+    Args:
+        username: Имя пользователя
+
+    Returns:
+        Имя каталога вида "<имя>-<хэш>"
+    """
+    slug = _UNSAFE_CHARS.sub("_", username).strip("_")[:32] or "user"
+    digest = hashlib.sha1(username.encode("utf-8")).hexdigest()[:10]
+    return f"{slug}-{digest}"
+
+
+class MultiUserStorage:
+    """
+    Хранилище нескольких пользователей с отдельным FileStorage на каждого.
+
+    Экземпляры FileStorage создаются при первом обращении к пользователю
+    и кэшируются, поэтому кэш пользователя, журнал и поисковый индекс
+    работают для каждого раздела как в обычном FileStorage.
+
+    Раздел определяется именем, под которым пользователь создан;
+    последующая смена User.username его не меняет.
+    """
+
+    def __init__(self, root: str | Path = "data/users", **options: Any):
+        """
+        Инициализация хранилища.
+
+        Args:
+            root: Каталог с разделами пользователей.
+            **options: Параметры FileStorage для разделов (journal, codec,
+                format, fsync и т.д.).
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.options = options
+        self._index_path = self.root / "index.json"
+        self._index_lock_path = self.root / "index.json.lock"
+        self._storages: Dict[str, FileStorage] = {}
+        # Защищает кэш разделов и запись индекса от параллельных потоков
+        self._lock = threading.Lock()
+
+    def _read_index(self) -> Dict[str, str]:
+        """Читает индекс пользователей (пустой, если файла нет)."""
+        try:
+            data = get_codec().loads(self._index_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        return data.get("users", {})
+
+    def _write_index(self, index: Dict[str, str]) -> None:
+        """Атомарно перезаписывает индекс пользователей."""
+        raw = get_codec(pretty=True).dumps({"users": index})
+        _atomic_write(self._index_path, raw, fsync=True)
+
+    @contextmanager
+    def _index_locked(self) -> Iterator[None]:
+        """
+        Блокирует индекс от других потоков и процессов.
+
+        Индекс нужно перечитывать уже под блокировкой: иначе запись
+        параллельного процесса будет перезаписана. Без fcntl (Windows)
+        блокируются только потоки.
+        """
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(self._index_lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                # Закрытие дескриптора снимает блокировку
+                os.close(fd)
+
+    def list_users(self) -> List[str]:
+        """
+        Возвращает имена всех пользователей.
+
+        Returns:
+            Имена в порядке создания.
+        """
+        return list(self._read_index())
+
+    def has_user(self, username: str) -> bool:
+        """
+        Проверяет, есть ли раздел пользователя, не читая индекс.
+
+        Args:
+            username: Имя пользователя.
+
+        Returns:
+            True, если снимок раздела уже записан.
+        """
+        storage = self._storages.get(username)
+        if storage is not None:
+            return storage.filepath.exists()
+        if not username.strip():
+            return False
+        return (self.root / partition_name(username) / "data.json").exists()
+
+    def storage_for(self, username: str) -> FileStorage:
+        """
+        Возвращает хранилище раздела пользователя (без создания пользователя).
+
+        Args:
+            username: Имя пользователя.
+
+        Returns:
+            FileStorage раздела.
+
+        Raises:
+            ValueError: Если имя пустое.
+        """
+        if not username.strip():
+            raise ValueError("Имя пользователя не может быть пустым")
+
+        storage = self._storages.get(username)
+        if storage is not None:
+            return storage
+
+        with self._lock:
+            storage = self._storages.get(username)
+            if storage is None:
+                path = self.root / partition_name(username) / "data.json"
+                storage = FileStorage(path, **self.options)
+                self._storages[username] = storage
+        return storage
+
+    def get_user(self, username: str) -> User | None:
+        """
+        Загружает пользователя из его раздела.
+
+        Args:
+            username: Имя пользователя.
+
+        Returns:
+            Экземпляр User или None, если пользователя нет.
+        """
+        return self.storage_for(username).get_user()
+
+    def create_user(self, username: str) -> User:
+        """
+        Создает пользователя в новом разделе и добавляет его в индекс.
+
+        Args:
+            username: Имя пользователя.
+
+        Returns:
+            Созданный пользователь.
+
+        Raises:
+            ValueError: Если имя пустое или пользователь уже существует.
+        """
+        storage = self.storage_for(username)
+        with self._index_locked():
+            index = self._read_index()
+            if username in index or storage.has_user():
+                raise ValueError(f"Пользователь уже существует: {username}")
+            user = storage.create_user(username)
+            index[username] = storage.filepath.parent.name
+            self._write_index(index)
+        return user
+
+    @contextmanager
+    def session(self, username: str) -> Iterator[User]:
+        """
+        Контекст сессии пользователя с автосохранением (см. FileStorage.session).
+
+        В отличие от FileStorage.session, отсутствующий пользователь
+        создается с переданным именем, а не с именем "default".
+
+        Args:
+            username: Имя пользователя.
+
+        Yields:
+            User: объект пользователя для изменения.
+        """
+        storage = self.storage_for(username)
+        if not storage.has_user():
+            try:
+                self.create_user(username)
+            except ValueError:
+                # Пользователя уже создал параллельный запрос
+                pass
+        with storage.session() as user:
+            yield user
+
+    def migrate(self, filepath: str | Path) -> User | None:
+        """
+        Переносит пользователя из однопользовательского data.json в раздел.
+
+        Исходный файл не изменяется.
+
+        Args:
+            filepath: Путь к файлу FileStorage.
+
+        Returns:
+            Перенесенный пользователь или None, если в файле его нет.
+
+        Raises:
+            ValueError: Если пользователь с таким именем уже есть.
+        """
+        legacy = FileStorage(filepath).get_user()
+        if legacy is None:
+            return None
+
+        self.create_user(legacy.username)
+        storage = self.storage_for(legacy.username)
+        storage.update_user(User.from_dict(legacy.to_dict()))
+        return storage.get_user()
+
+    def __str__(self) -> str:
+        """Строковое представление хранилища."""
+        return f"MultiUserStorage({self.root})"
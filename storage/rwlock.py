@@ -0,0 +1,109 @@
+"""
+Модуль блокировки читателей/писателей для потоков одного процесса.
+
+Несколько потоков могут одновременно держать блокировку на чтение,
+на запись — только один и без читателей. Ожидающий писатель не
+пропускает новых читателей вперед, поэтому поток записи не голодает.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import threading
+
+
+class RWLock:
+    """
+    Реентерабельная блокировка читателей/писателей.
+
+    Поток, держащий блокировку на запись, может повторно брать ее
+    на запись и на чтение. Повышение чтения до записи не поддерживается:
+    два читателя, ждущие друг друга, заблокировались бы навсегда.
+    """
+
+    def __init__(self):
+        """Инициализация свободной блокировки."""
+        self._cond = threading.Condition(threading.Lock())
+        # Глубина вложенности чтения по идентификатору потока
+        self._readers: Dict[int, int] = {}
+        self._writer: int | None = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        """Берет блокировку на чтение (ждет, пока нет писателей)."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me or me in self._readers:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers[me] = 1
+
+    def release_read(self) -> None:
+        """Освобождает блокировку на чтение."""
+        me = threading.get_ident()
+        with self._cond:
+            depth = self._readers[me] - 1
+            if depth:
+                self._readers[me] = depth
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Берет блокировку на запись (ждет ухода читателей и писателя).
+
+        Raises:
+            RuntimeError: Если поток уже держит блокировку только на чтение.
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Нельзя повысить блокировку чтения до записи")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """Освобождает блокировку на запись."""
+        with self._cond:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Контекст блокировки на чтение."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Контекст блокировки на запись."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def __str__(self) -> str:
+        """Строковое представление блокировки."""
+        return f"RWLock(readers={len(self._readers)}, writer={self._writer is not None})"
@@ -0,0 +1,302 @@
+"""
+Модуль потокового чтения JSON-снимка хранилища.
+
+Файл читается кусками, а в памяти держится только текущий разбираемый
+элемент (тема, заметка, запись прогресса, пропускаемый список), поэтому
+обход очень больших data.json выполняется в постоянной памяти
+относительно числа тем.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterator, TextIO, Tuple
+
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class JsonStream:
+    """
+    Инкрементальный разборщик JSON поверх текстового файла.
+
+    Позволяет спускаться по ключам объектов и перебирать элементы
+    массивов, разбирая целиком только нужные значения.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int = CHUNK_SIZE):
+        """
+        Инициализация разборщика.
+
+        Args:
+            f: Открытый текстовый файл.
+            chunk_size: Размер читаемого куска (символы).
+        """
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int | None = None) -> bool:
+        """
+        Дочитывает следующий кусок файла в буфер.
+
+        Args:
+            size: Сколько символов прочитать (по умолчанию chunk_size).
+
+        Returns:
+            False, если файл закончился.
+        """
+        if self.eof:
+            return False
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Возвращает следующий значимый символ, пропуская пробелы.
+
+        Returns:
+            Символ или пустую строку в конце файла.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """
+        Пропускает ожидаемый символ.
+
+        Raises:
+            ValueError: Если встретился другой символ.
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Ожидался '{char}', получен '{found}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Разбирает следующее значение целиком.
+
+        Если значение не поместилось в буфер, буфер увеличивается
+        (вдвое за попытку) и разбор повторяется.
+
+        Returns:
+            Разобранное значение.
+        """
+        self.peek()
+        while True:
+            try:
+                result, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(max(self.chunk_size, len(self.buf))):
+                    raise
+                continue
+            # Число на границе буфера может быть неполным.
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return result
+
+    def items(self) -> Iterator[str]:
+        """
+        Перебирает ключи текущего объекта.
+
+        После получения ключа вызывающий код обязан прочитать значение
+        (value(), items(), elements() или skip()).
+
+        Yields:
+            Ключи объекта по порядку.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self) -> Iterator[None]:
+        """
+        Перебирает элементы текущего массива.
+
+        На каждом шаге вызывающий код обязан прочитать элемент.
+
+        Yields:
+            None перед каждым элементом.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield None
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def skip(self) -> None:
+        """
+        Пропускает следующее значение.
+
+        Значение разбирается целиком (это быстрее поэлементного обхода),
+        поэтому память ограничена размером одного пропускаемого значения.
+        """
+        self.value()
+
+    def find(self, *path: str) -> bool:
+        """
+        Спускается по ключам вложенных объектов.
+
+        Args:
+            path: Последовательность ключей, например ("user", "topics").
+
+        Returns:
+            True, если значение по пути найдено (оно следующее в потоке).
+        """
+        for key in path:
+            if self.peek() != "{":
+                return False
+            for name in self.items():
+                if name == key:
+                    break
+                self.skip()
+            else:
+                return False
+        return True
+
+
+def iter_topics(f: TextIO) -> Iterator[dict]:
+    """
+    Перебирает словари тем из снимка data.json.
+
+    Args:
+        f: Открытый файл снимка.
+
+    Yields:
+        Словарь темы в формате Topic.to_dict.
+    """
+    stream = JsonStream(f)
+    if not stream.find("user", "topics"):
+        return
+    for _ in stream.elements():
+        yield stream.value()
+
+
+def iter_topic_items(
+    f: TextIO, key: str, accept_title: Callable[[str], bool]
+) -> Iterator[Tuple[str, dict]]:
+    """
+    Перебирает элементы списка key ("notes", "resources", "progress") в темах.
+
+    Элементы разбираются по одному, без загрузки темы целиком. Название
+    темы должно идти в ее словаре раньше списка (так пишет Topic.to_dict);
+    иначе тема пропускается.
+
+    Args:
+        f: Открытый файл снимка.
+        key: Ключ списка внутри темы.
+        accept_title: Фильтр тем по названию.
+
+    Yields:
+        Пары (название темы, словарь элемента).
+    """
+    stream = JsonStream(f)
+    if not stream.find("user", "topics"):
+        return
+    for _ in stream.elements():
+        title = None
+        for name in stream.items():
+            if name == "title":
+                title = stream.value()
+            elif name == key and title is not None and accept_title(title):
+                for _ in stream.elements():
+                    yield title, stream.value()
+            else:
+                stream.skip()
+
+
+def read_summary(f: TextIO) -> dict | None:
+    """
+    Читает имя пользователя и количество тем из снимка data.json.
+
+    Если снимок начинается с заголовка "meta" (его пишет FileStorage),
+    читается только он; иначе темы пропускаются без создания объектов.
+
+    Args:
+        f: Открытый файл снимка.
+
+    Returns:
+        Словарь {"username": ..., "topics": ...} или None, если пользователя нет.
+
+    Raises:
+        ValueError: Если прочитанная часть файла повреждена или обрезана.
+    """
+    stream = JsonStream(f)
+    if stream.peek() != "{":
+        return None
+
+    for name in stream.items():
+        if name == "meta":
+            return stream.value()
+        if name != "user" or stream.peek() != "{":
+            stream.skip()
+            continue
+
+        summary = {}
+        for key in stream.items():
+            if key == "username":
+                summary["username"] = stream.value()
+            elif key == "topics":
+                count = 0
+                for _ in stream.elements():
+                    stream.skip()
+                    count += 1
+                summary["topics"] = count
+            else:
+                stream.skip()
+        if summary:
+            summary.setdefault("topics", 0)
+            return summary
+    return None
+
+
+def has_user(f: TextIO) -> bool:
+    """
+    Проверяет, что в снимке data.json есть пользователь.
+
+    Читается только начало файла (до имени пользователя включительно):
+    найденного ключа мало, значение тоже должно разбираться.
+
+    Args:
+        f: Открытый файл снимка.
+
+    Raises:
+        ValueError: Если файл поврежден или обрезан до имени пользователя.
+    """
+    stream = JsonStream(f)
+    if not stream.find("user", "username"):
+        return False
+    return isinstance(stream.value(), str)
@@ -0,0 +1,205 @@
+"""
+Тесты сервисов API на SQLite в памяти (без HTTP-сервера).
+
+Пакет app/ перекрыт корневым app.py (CLI), поэтому его модули
+импортируются через core.app_import.import_app.
+"""
+
+import asyncio
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+# AsyncSession SQLAlchemy работает через greenlet
+pytest.importorskip("greenlet")
+pytest.importorskip("pydantic")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core.app_import import import_app
+
+database = import_app("app.db.database")
+models = import_app("app.db.models")
+schemas = import_app("app.schemas.topic")
+topic_service = import_app("app.services.topic_service")
+item_service = import_app("app.services.item_service")
+
+
+def _run(scenario):
+    """Выполняет scenario(db) в сессии новой базы в памяти."""
+    async def main():
+        engine = database.create_async_sqlite_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(database.Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            async with sessions() as db:
+                return await scenario(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+async def _add_topics(db, titles):
+    """Создает темы в указанном порядке."""
+    for title in titles:
+        await topic_service.create_topic(db, schemas.TopicCreate(title=title))
+
+
+async def _all_pages(db, **query):
+    """Проходит все страницы списка тем по next_cursor."""
+    titles, pages, cursor = [], 0, None
+    while True:
+        topics, cursor = await topic_service.get_topics_page(db, cursor=cursor, **query)
+        titles.extend(t.title for t in topics)
+        pages += 1
+        if cursor is None:
+            return titles, pages
+
+
+def test_topics_keyset_pages_and_prefix():
+    """Тест курсорной пагинации, сортировки и фильтра по префиксу."""
+    titles = [f"Тема {i:02}" for i in range(25)] + ["SQL", "Python", "Темп"]
+
+    async def scenario(db):
+        await _add_topics(db, titles)
+        return (
+            await _all_pages(db, limit=10),
+            await _all_pages(db, limit=4, prefix="Тема 1", sort="-title"),
+            await _all_pages(db, limit=3, prefix="Тем", sort="title"),
+        )
+
+    by_id, by_prefix, by_title = _run(scenario)
+
+    assert by_id == (titles, 3)
+    assert by_prefix == ([f"Тема {i}" for i in range(19, 9, -1)], 3)
+    assert by_title[0] == sorted(t for t in titles if t.startswith("Тем"))
+
+
+def test_topics_page_rejects_bad_cursor():
+    """Тест: поврежденный курсор и курсор другой сортировки отклоняются."""
+    async def scenario(db):
+        await _add_topics(db, ["A", "B", "C"])
+        _, cursor = await topic_service.get_topics_page(db, limit=1, sort="title")
+        for bad, sort in [("не-курсор", "id"), (cursor, "id"), (cursor[:-2], "title")]:
+            with pytest.raises(ValueError):
+                await topic_service.get_topics_page(db, cursor=bad, sort=sort)
+
+    _run(scenario)
+
+
+def test_list_topics_route_returns_400_on_bad_cursor():
+    """Тест: эндпоинт списка тем отвечает 400 на некорректный курсор."""
+    fastapi = pytest.importorskip("fastapi")
+    topics_api = import_app("app.api.topics")
+
+    async def scenario(db):
+        with pytest.raises(fastapi.HTTPException) as error:
+            await topics_api.list_topics(limit=10, cursor="!!!", prefix=None, sort="id", db=db)
+        return error.value.status_code
+
+    assert _run(scenario) == 400
+
+
+def test_async_engine_applies_pragmas():
+    """Тест: асинхронный engine выполняет профиль PRAGMA на подключении."""
+    async def scenario(db):
+        values = {}
+        for name in ("foreign_keys", "busy_timeout", "temp_store"):
+            values[name] = await db.scalar(text(f"PRAGMA {name}"))
+        return values
+
+    # temp_store=MEMORY — значение 2
+    assert _run(scenario) == {"foreign_keys": 1, "busy_timeout": 5000, "temp_store": 2}
+
+
+def test_sqlite_pragmas_are_applied(tmp_path):
+    """Тест профиля SQLite: WAL, synchronous=NORMAL и замена параметров."""
+    tuning = import_app("app.db.sqlite_tuning")
+    apply_pragmas, sqlite_pragmas = tuning.apply_pragmas, tuning.sqlite_pragmas
+    connection = sqlite3.connect(tmp_path / "tracker.db")
+    pragmas = sqlite_pragmas(mmap_size=None, cache_size=-2000)
+    assert "mmap_size" not in pragmas
+    apply_pragmas(connection, pragmas)
+
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert connection.execute("PRAGMA cache_size").fetchone()[0] == -2000
+    assert connection.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    with pytest.raises(ValueError):
+        apply_pragmas(connection, {"journal_mode": "WAL; DROP TABLE topics"})
+    connection.close()
+
+
+def test_last_notes_and_resources_by_topic():
+    """Тест выборки последних N записей темы и продолжения по before."""
+    async def scenario(db):
+        await _add_topics(db, ["Python", "SQL"])
+        python, sql = (await topic_service.get_topics_page(db))[0]
+        for i in range(5):
+            await item_service.add_note(db, python.id, schemas.NoteCreate(text=f"Заметка {i}"))
+            await item_service.add_note(db, sql.id, schemas.NoteCreate(text=f"SQL {i}"))
+        link = schemas.ResourceCreate(res_type="link", content="https://docs.python.org/3/")
+        await item_service.add_resource(db, python.id, link)
+        with pytest.raises(ValueError):
+            await item_service.add_resource(
+                db, python.id, schemas.ResourceCreate(res_type="link", content="не ссылка")
+            )
+
+        first = await item_service.list_notes(db, python.id, limit=2)
+        rest = await item_service.list_notes(db, python.id, limit=10, before=first[-1].id)
+        resources = await item_service.list_resources(db, python.id)
+        return [n.text for n in first], [n.text for n in rest], [r.content for r in resources]
+
+    first, rest, resources = _run(scenario)
+
+    assert first == ["Заметка 4", "Заметка 3"]
+    assert rest == ["Заметка 2", "Заметка 1", "Заметка 0"]
+    assert resources == ["https://docs.python.org/3/"]
+
+
+def test_latest_progress_by_date():
+    """Тест: последняя запись прогресса выбирается по дате, а не по порядку вставки."""
+    async def scenario(db):
+        await _add_topics(db, ["Python", "SQL"])
+        python, sql = (await topic_service.get_topics_page(db))[0]
+        for day, percent in [(1, 10), (20, 60), (5, 30)]:
+            date = datetime(2024, 1, day)
+            db.add(models.ProgressModel(topic_id=python.id, percent=percent, date=date))
+        await db.commit()
+
+        latest = await item_service.get_latest_progress(db, python.id)
+        recent = await item_service.list_progress(db, python.id, limit=2)
+        missing = await item_service.get_latest_progress(db, sql.id)
+        return latest.percent, [p.percent for p in recent], missing
+
+    assert _run(scenario) == (60, [60, 30], None)
+
+
+def test_create_topic_conflict_returns_409():
+    """Тест: повторное название отклоняет уникальный индекс (ON CONFLICT), эндпоинт — 409."""
+    fastapi = pytest.importorskip("fastapi")
+    topics_api = import_app("app.api.topics")
+
+    async def scenario(db):
+        payload = schemas.TopicCreate(title="Python", description="Первая")
+        created = await topic_service.create_topic(db, payload)
+        duplicate = await topic_service.create_topic(
+            db, schemas.TopicCreate(title="Python", description="Вторая")
+        )
+        with pytest.raises(fastapi.HTTPException) as error:
+            await topics_api.create_topic(payload, db=db)
+        topics, _ = await topic_service.get_topics_page(db)
+        return created.id, duplicate, error.value.status_code, [t.description for t in topics]
+
+    topic_id, duplicate, status, descriptions = _run(scenario)
+
+    assert topic_id == 1
+    assert duplicate is None
+    assert status == 409
+    assert descriptions == ["Первая"]
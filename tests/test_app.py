@@ -82,7 +82,7 @@ def test_app_add_resource(capsys):
 
 def test_app_invalid_choice(capsys):
     """Неверный выбор."""
-    inputs = ["test_user", "9", "0"]
+    inputs = ["test_user", "99", "0"]
     
     with patch('sys.stdin', MockStdin(inputs)):
         from app import main
@@ -114,3 +114,44 @@ def test_app_ensure_user_exists(capsys):
     
     storage = FileStorage()
     assert storage.get_user().username == "test_new_user"
+
+
+def test_app_subcommands(capsys):
+    """Неинтерактивные команды без меню."""
+    from app import main
+    main(["add-topic", "Python OOP", "-d", "Основы ООП"])
+    main(["add-note", "python oop", "Наследование"])
+    main(["progress", "Python OOP", "40"])
+    main(["show", "Python OOP"])
+
+    captured = capsys.readouterr()
+    assert "Тема: Python OOP" in captured.out
+    assert "Наследование" in captured.out
+    assert "40%" in captured.out
+
+
+def test_app_batch_single_session(tmp_path, capsys):
+    """Пакетный режим: все команды файла — одна запись в хранилище."""
+    script = tmp_path / "commands.txt"
+    script.write_text(
+        "# комментарий\n"
+        'add-topic "Python OOP"\n'
+        'add-note "Python OOP" "Первая"\n'
+        'progress "Python OOP" 140\n'
+        'add-note "Нет такой" "Вторая"\n'
+        "list\n",
+        encoding="utf-8",
+    )
+
+    FileStorage("data/data.json").create_user("test_user")
+
+    from app import main
+    with patch.object(FileStorage, "_save", autospec=True, side_effect=FileStorage._save) as save:
+        main(["--batch", str(script)])
+    assert save.call_count == 1
+
+    captured = capsys.readouterr()
+    assert "Выполнено команд: 3, с ошибками: 2" in captured.out
+    storage = FileStorage()
+    with storage.session() as user:
+        assert [n.text for n in user.topics[0].notes] == ["Первая"]
@@ -0,0 +1,147 @@
+"""
+Тесты для доменных моделей и утилит.
+"""
+
+import pytest
+
+from core.progress_stats import ProgressColumns
+from core.search import SearchIndex, tokenize
+from core.utils import find_topic_by_title, validate_url, validate_urls
+from models.progress import ProgressEntry
+from models.topic import Topic
+from models.user import User
+
+
+def test_topic_title_index():
+    """Тест индекса тем по названию без учета регистра."""
+    user = User("test_user")
+    user.add_topic(Topic("Python OOP"))
+    user.add_topic(Topic("Базы данных"))
+
+    assert find_topic_by_title(user, "python oop") is user.topics[0]
+    assert find_topic_by_title(user, "БАЗЫ ДАННЫХ") is user.topics[1]
+    assert find_topic_by_title(user, "Go") is None
+
+    with pytest.raises(ValueError):
+        user.add_topic(Topic("PYTHON OOP"))
+
+
+def test_topic_title_index_follows_rename_and_from_dict():
+    """Тест: индекс обновляется при переименовании и загрузке из словаря."""
+    user = User.from_dict({"username": "u", "topics": [{"title": "SQL"}]})
+    assert user.get_topic("sql") is user.topics[0]
+
+    user.topics[0].title = "PostgreSQL"
+    assert user.get_topic("sql") is None
+    assert user.get_topic("postgresql") is user.topics[0]
+
+
+def test_search_index_ranking():
+    """Тест токенизации (кириллица/латиница) и ранжирования поиска."""
+    assert tokenize("Ёжик и Python-декораторы!") == ["ежик", "и", "python", "декораторы"]
+
+    index = SearchIndex()
+    index.add_topic({"title": "Python", "description": "Язык", "notes": [
+        {"text": "Декораторы и замыкания"},
+        {"text": "Декораторы, декораторы, декораторы"},
+    ]})
+    index.apply_changes([{"op": "add_resource", "title": "Python",
+                          "data": {"type": "text", "content": "Генераторы"}}])
+
+    hits = index.search("декораторы")
+    assert [(h.kind, h.position) for h in hits] == [("note", 1), ("note", 0)]
+    assert [(h.kind, h.position) for h in index.search("ГЕНЕРАТОРЫ")] == [("resource", 0)]
+    assert SearchIndex.from_dict(index.to_dict()).search("декораторы")[0].position == 1
+
+
+def test_timestamps_roundtrip_through_dict():
+    """Тест: время хранится числом, а в словаре остается исходная строка."""
+    from models.note import Note
+    from models.progress import ProgressEntry
+
+    note = Note.from_dict({"text": "t", "created_at": "2024-01-01T12:00:00"})
+    entry = ProgressEntry.from_dict({"percent": 5, "date": "2024-01-01"})
+
+    assert isinstance(note._created, int)
+    assert note.to_dict()["created_at"] == "2024-01-01T12:00:00"
+    assert entry.to_dict()["date"] == "2024-01-01"
+    assert not hasattr(note, "__dict__")
+
+
+def _progress_topics():
+    """Темы с растущим, пустым, завершенным и падающим прогрессом."""
+    growing = Topic("Растет")
+    for date, percent in [("2024-01-15", 30), ("2024-01-01T00:00:00", 10), ("2024-01-08T00:00:00", 20)]:
+        growing.add_progress(ProgressEntry(percent, date))
+    done = Topic("Готово")
+    done.add_progress(ProgressEntry(100, "2024-02-01T00:00:00"))
+    falling = Topic("Падает")
+    falling.add_progress(ProgressEntry(50, "2024-02-01T00:00:00"))
+    falling.add_progress(ProgressEntry(40, "2024-02-08T00:00:00"))
+    return [growing, Topic("Пусто"), done, falling]
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_progress_columns_analytics(use_numpy):
+    """Тест колоночной аналитики прогресса (с NumPy и без)."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    columns = ProgressColumns.build(_progress_topics(), use_numpy=use_numpy)
+
+    assert columns.latest() == [30, None, 100, 40]
+    assert columns.rate_per_week() == pytest.approx([10.0, None, None, -10.0])
+    assert columns.moving_average(2) == [[10.0, 15.0, 25.0], [], [100.0], [50.0, 45.0]]
+    assert columns.weeks_to_complete() == pytest.approx([7.0, None, 0.0, None])
+
+    growing = columns.summary()[0]
+    assert growing.entries == 3
+    assert growing.eta == "2024-03-04T00:00:00"
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_progress_columns_flat_history(use_numpy):
+    """Тест: у ровной истории нет прогноза (наклон МНК почти ноль, а не ноль)."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    flat = Topic("Ровно")
+    for day, percent in enumerate([30, 31, 32, 31, 30], start=1):
+        flat.add_progress(ProgressEntry(percent, f"2024-01-0{day}T00:00:00"))
+    columns = ProgressColumns.build([flat], use_numpy=use_numpy)
+
+    stats = columns.summary()[0]
+    assert abs(stats.rate_per_week) < 1e-9
+    assert stats.weeks_to_complete is None
+    assert stats.eta is None
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_progress_columns_apply_changes(use_numpy):
+    """Тест: колонки, дополненные журналом изменений, совпадают с собранными заново."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    user = User("Тест")
+    topics = _progress_topics()
+    for topic in topics[:2]:
+        user.add_topic(topic)
+    user.pop_changes()
+    columns = ProgressColumns.build(user.topics, use_numpy=use_numpy)
+    columns.summary()
+
+    user.add_topic(topics[3])
+    user.get_topic("пусто").add_progress(ProgressEntry(20, "2024-01-10T00:00:00"))
+    # Запись задним числом встает по времени, а не в конец
+    user.get_topic("Растет").add_progress(ProgressEntry(5, "2024-01-04T12:00:00"))
+    columns.apply_changes(user.pop_changes())
+
+    rebuilt = ProgressColumns.build(user.topics, use_numpy=use_numpy)
+    assert [s.to_dict() for s in columns.summary()] == [s.to_dict() for s in rebuilt.summary()]
+    assert columns.latest() == [30, 20, 40]
+
+
+def test_validate_urls_batch_uses_cache():
+    """Тест пакетной проверки URL и кэша результатов."""
+    validate_url.cache_clear()
+    urls = ["https://example.com/a", "ftp://example.com", "https://example.com/a", "http://localhost:8000"]
+
+    assert validate_urls(urls) == [True, False, True, True]
+    assert validate_url.cache_info().hits == 1
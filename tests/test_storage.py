@@ -2,9 +2,28 @@
 Тесты для модуля storage.
 """
 
+import gc
+import io
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import weakref
+
+import pytest
+
+from models.note import Note
+from models.progress import ProgressEntry
+from models.resource import Resource
 from models.user import User
 from models.topic import Topic
-from storage.file_storage import FileStorage
+from storage.binary_format import binary_to_json, json_to_binary
+from storage.file_storage import CODECS, ConcurrentModificationError, FileStorage, fcntl
+from storage.exporter import export_file, iter_export
+from storage.importer import import_file
+from storage.multi_user import MultiUserStorage
+from storage.streaming import JsonStream
 
 
 def test_create_user():
@@ -24,3 +43,719 @@ def test_autosave_context():
 
     reloaded_storage = FileStorage("tests/test_data.json")
     assert len(reloaded_storage.get_user().topics) == 1
+
+
+def test_journal_appends_changes_without_rewriting_snapshot(tmp_path):
+    """Тест журнала: изменения дописываются в лог, снимок не трогается."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path), journal=True)
+    with storage.session() as user:
+        user.add_topic(Topic("Python", "Основы"))
+    snapshot = path.read_text(encoding="utf-8")
+
+    with storage.session() as user:
+        user.topics[0].add_note(Note("Декораторы"))
+        user.username = "alice"
+
+    assert path.read_text(encoding="utf-8") == snapshot
+
+    reloaded = FileStorage(str(path)).get_user()
+    assert reloaded.username == "alice"
+    assert reloaded.topics[0].notes[0].text == "Декораторы"
+
+
+def test_journal_append_after_torn_write(tmp_path):
+    """Тест: записи после недописанной строки журнала не теряются."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path), journal=True)
+    with storage.session() as user:
+        user.add_topic(Topic("Python"))
+    journal = tmp_path / "data.json.journal"
+    with open(journal, "ab") as f:
+        f.write(b'{"op": "add_no')
+
+    storage = FileStorage(str(path), journal=True)
+    for text in ("Первая", "Вторая"):
+        with storage.session() as user:
+            user.get_topic("Python").add_note(Note(text))
+
+    reloaded = FileStorage(str(path), journal=True).get_user()
+    assert [n.text for n in reloaded.get_topic("Python").notes] == ["Первая", "Вторая"]
+
+
+def test_batched_fsync_is_deferred_not_dropped(tmp_path, monkeypatch):
+    """Тест политики "batched": отложенный fsync выполняется по таймеру и в close()."""
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+
+    storage = FileStorage(
+        str(tmp_path / "data.json"), journal=True, fsync="batched", fsync_interval=0.3
+    )
+    storage.create_user("test_user")
+    # Первая запись сбрасывается сразу: снимок и каталог
+    assert len(synced) == 2
+    synced.clear()
+    with storage.session() as user:
+        user.add_topic(Topic("Python"))
+    assert not synced and storage._sync_pending
+
+    # Таймер сбрасывает журнал и каталог, хотя новых записей нет
+    time.sleep(0.6)
+    assert len(synced) == 2 and not storage._sync_pending
+
+    # Интервал истек: запись сбрасывается сразу, следующая — откладывается
+    synced.clear()
+    with storage.session() as user:
+        user.add_topic(Topic("SQL"))
+    assert len(synced) == 1
+    synced.clear()
+    with storage.session() as user:
+        user.add_topic(Topic("Go"))
+    assert not synced
+    storage.close()
+    assert len(synced) == 2
+
+    # Снимок перед переименованием сбрасывается на диск и без таймера
+    synced.clear()
+    storage.compact()
+    assert len(synced) == 1
+
+
+def test_journal_compaction(tmp_path):
+    """Тест компактизации журнала в снимок."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path), journal=True, compact_every=2)
+    with storage.session() as user:
+        user.add_topic(Topic("Python"))
+        user.topics[0].add_progress(ProgressEntry(50))
+
+    assert not (tmp_path / "data.json.journal").exists()
+    assert len(FileStorage(str(path)).get_user().topics[0].progress) == 1
+
+
+def test_readonly_session_skips_save(tmp_path):
+    """Тест: сессия без изменений не перезаписывает файл."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path))
+    storage.create_user("test_user")
+    path.write_text(path.read_text(encoding="utf-8") + " ", encoding="utf-8")
+    marker = path.read_text(encoding="utf-8")
+
+    with storage.session() as user:
+        assert len(user.topics) == 0
+
+    assert path.read_text(encoding="utf-8") == marker
+
+
+def test_dirty_tracking_propagates_to_user():
+    """Тест: изменение записи отмечает тему и пользователя измененными."""
+    user = User.from_dict({"username": "u", "topics": [
+        {"title": "A", "notes": [{"text": "x", "created_at": "2024-01-01"}]},
+        {"title": "B"},
+    ]})
+    untouched = user.topics[1].to_dict()
+    assert not user.is_dirty
+
+    user.topics[0].notes[0].text = "y"
+
+    assert user.is_dirty
+    assert user.has_untracked_changes
+    assert user.to_dict()["topics"][0]["notes"][0]["text"] == "y"
+    assert user.topics[1].to_dict() is untouched
+
+
+def test_user_cached_between_sessions(tmp_path):
+    """Тест: пользователь кэшируется, пока файл не изменился извне."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path))
+    with storage.session() as user:
+        user.add_topic(Topic("Python"))
+
+    with storage.session() as again:
+        assert again is user
+
+    other = FileStorage(str(path))
+    with other.session() as user2:
+        user2.add_topic(Topic("SQL"))
+
+    reloaded = storage.get_user()
+    assert reloaded is not user
+    assert [t.title for t in reloaded.topics] == ["Python", "SQL"]
+
+
+def test_batch_groups_sessions_into_one_write(tmp_path):
+    """Тест: сессии внутри batch() записываются одним сохранением."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path), fsync="never")
+    storage.create_user("test_user")
+
+    with storage.batch():
+        with storage.session() as user:
+            user.add_topic(Topic("Python"))
+        with storage.session() as user:
+            user.add_topic(Topic("SQL"))
+        assert len(FileStorage(str(path)).get_user().topics) == 0
+
+    assert len(FileStorage(str(path)).get_user().topics) == 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_corrupted_file_is_preserved(tmp_path):
+    """Тест: поврежденный файл не затирается, а откладывается в .corrupt."""
+    path = tmp_path / "data.json"
+    path.write_text('{"user": {"username": "te', encoding="utf-8")
+
+    storage = FileStorage(str(path))
+
+    assert storage.get_user() is None
+    assert (tmp_path / "data.json.corrupt").exists()
+
+
+def test_codecs_roundtrip_and_compact_mode(tmp_path):
+    """Тест: все доступные кодеки читают данные друг друга."""
+    names = [name for name, (_, module) in CODECS.items() if module is not None]
+    assert "json" in names
+
+    for name in names:
+        path = tmp_path / f"{name}.json"
+        storage = FileStorage(str(path), codec=name, pretty=False)
+        with storage.session() as user:
+            user.add_topic(Topic("Тема", "Описание"))
+
+        assert b"\n" not in path.read_bytes()
+        reloaded = FileStorage(str(path), codec="json").get_user()
+        assert reloaded.topics[0].title == "Тема"
+
+
+def test_binary_format_and_converters(tmp_path):
+    """Тест бинарного формата и конвертации из/в data.json."""
+    bin_path = tmp_path / "data.bin"
+    storage = FileStorage(str(bin_path), format="binary")
+    with storage.session() as user:
+        topic = Topic("Python", "Основы")
+        user.add_topic(topic)
+        topic.add_resource(Resource("link", "https://example.com"))
+        topic.add_note(Note("Заметка"))
+        topic.add_progress(ProgressEntry(40))
+    expected = storage.get_user().to_dict()
+
+    json_path = tmp_path / "data.json"
+    binary_to_json(bin_path, json_path)
+    assert FileStorage(str(json_path)).get_user().to_dict() == expected
+
+    json_to_binary(json_path, tmp_path / "copy.bin")
+    assert (tmp_path / "copy.bin").read_bytes() == bin_path.read_bytes()
+    assert bin_path.stat().st_size < json_path.stat().st_size
+
+
+def test_lazy_topic_loading(tmp_path):
+    """Тест: содержимое темы загружается только при обращении к нему."""
+    path = tmp_path / "data.bin"
+    storage = FileStorage(str(path), format="binary")
+    with storage.session() as user:
+        topic = Topic("Python")
+        user.add_topic(topic)
+        topic.add_note(Note("Первая"))
+        topic.add_note(Note("Вторая"))
+
+    topic = FileStorage(str(path), format="binary").get_user().topics[0]
+    assert not topic.is_loaded
+    assert topic.note_count == 2
+    assert not topic.is_loaded
+
+    assert [n.text for n in topic.notes] == ["Первая", "Вторая"]
+    assert topic.is_loaded
+
+
+def test_streaming_iterators(tmp_path):
+    """Тест потокового обхода тем, заметок и прогресса."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path))
+    with storage.session() as user:
+        for title in ("Python", "SQL"):
+            topic = Topic(title)
+            user.add_topic(topic)
+            topic.add_note(Note(f"{title} заметка", "2024-01-01T10:00:00"))
+            topic.add_progress(ProgressEntry(10, "2024-01-01T10:00:00"))
+            topic.add_progress(ProgressEntry(90, "2024-03-01T10:00:00"))
+
+    fresh = FileStorage(str(path))
+    assert [t.title for t in fresh.iter_topics()] == ["Python", "SQL"]
+    assert [n.text for n in fresh.iter_notes("SQL")] == ["SQL заметка"]
+    progress = fresh.iter_progress("2024-02-01", title="Python")
+    assert [(t, p.percent) for t, p in progress] == [("Python", 90)]
+    # Название темы без учета регистра, как в User.get_topic
+    assert [n.text for n in fresh.iter_notes("python")] == ["Python заметка"]
+    assert [p.percent for _, p in fresh.iter_progress(title="sql")] == [10, 90]
+    assert fresh._user is None
+
+    # Тот же поиск без потокового чтения (пользователь в памяти)
+    fresh.get_user()
+    assert [n.text for n in fresh.iter_notes("PYTHON")] == ["Python заметка"]
+    assert [t for t, _ in fresh.iter_progress(title="sql")] == ["SQL", "SQL"]
+
+
+def test_json_stream_small_chunks():
+    """Тест инкрементального разбора на границах кусков."""
+    text = '{"a": [1, 22], "user": {"x": {"y": "}"}, "topics": [{"n": 12345}, [], "s"]}}'
+    stream = JsonStream(io.StringIO(text), chunk_size=3)
+    assert stream.find("user", "topics")
+    assert [stream.value() for _ in stream.elements()] == [{"n": 12345}, [], "s"]
+
+
+def test_search_index_is_persisted_and_updated(tmp_path):
+    """Тест: индекс поиска сохраняется рядом со снимком и обновляется журналом."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path), journal=True)
+    with storage.session() as user:
+        topic = Topic("Python")
+        user.add_topic(topic)
+        topic.add_note(Note("Изучить декораторы"))
+    storage.compact()
+
+    assert [h.text for h in storage.search("декораторы")] == ["Изучить декораторы"]
+    assert (tmp_path / "data.json.search").exists()
+
+    with storage.session() as user:
+        user.topics[0].add_resource(Resource("text", "Декораторы в стандартной библиотеке"))
+
+    fresh = FileStorage(str(path))
+    assert len(fresh.search("декораторы")) == 2
+
+
+def test_progress_stats_follow_sessions(tmp_path):
+    """Тест: колонки прогресса кэшируются и дополняются изменениями сессий."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(str(path), journal=True)
+    with storage.session() as user:
+        topic = Topic("Python")
+        user.add_topic(topic)
+        topic.add_progress(ProgressEntry(10, "2024-01-01T00:00:00"))
+    assert [s.latest for s in storage.progress_stats()] == [10]
+    columns = storage._progress
+
+    with storage.session() as user:
+        user.topics[0].add_progress(ProgressEntry(20, "2024-01-08T00:00:00"))
+        user.add_topic(Topic("SQL"))
+
+    stats = storage.progress_stats()
+    assert storage._progress is columns
+    assert [(s.title, s.latest) for s in stats] == [("Python", 20), ("SQL", None)]
+    assert stats[0].rate_per_week == pytest.approx(10.0)
+    assert [s.to_dict() for s in FileStorage(str(path)).progress_stats()] == [s.to_dict() for s in stats]
+
+
+def test_bulk_import_deduplicates_in_one_write(tmp_path):
+    """Тест пакетного импорта CSV и JSON Lines с дедупликацией."""
+    storage = FileStorage(tmp_path / "data.json")
+    with storage.session() as user:
+        user.add_topic(Topic("Python"))
+        user.topics[0].add_resource(Resource("link", "https://docs.python.org/3/"))
+
+    csv_path = tmp_path / "items.csv"
+    csv_path.write_text(
+        "topic,kind,type,content\n"
+        "python,resource,link,https://docs.python.org/3/\n"
+        "Python,resource,link,https://peps.python.org/\n"
+        "SQL,topic,,Базы данных\n"
+        "SQL,resource,link,not-a-url\n"
+        ",note,,без темы\n",
+        encoding="utf-8",
+    )
+    jsonl_path = tmp_path / "items.jsonl"
+    jsonl_path.write_text(
+        '{"topic": "SQL", "kind": "note", "content": "JOIN"}\n'
+        '{"topic": "SQL", "kind": "note", "content": "JOIN"}\n'
+        "{broken\n",
+        encoding="utf-8",
+    )
+
+    report = import_file(storage, csv_path)
+    assert (report.topics, report.resources, report.duplicates, report.invalid) == (1, 1, 1, 2)
+
+    report = import_file(storage, jsonl_path)
+    assert (report.notes, report.duplicates, report.invalid) == (1, 1, 1)
+
+    user = FileStorage(tmp_path / "data.json").get_user()
+    assert [r.content for r in user.get_topic("python").resources] == [
+        "https://docs.python.org/3/", "https://peps.python.org/",
+    ]
+    assert user.get_topic("SQL").description == "Базы данных"
+    assert [n.text for n in user.get_topic("SQL").notes] == ["JOIN"]
+
+
+def test_import_failing_midway_changes_nothing(tmp_path):
+    """Тест: ошибка чтения в середине файла не оставляет частичный импорт."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(path)
+    storage.create_user("test_user")
+    before = path.read_bytes()
+
+    csv_path = tmp_path / "items.csv"
+    rows = "".join(f"Тема {i % 5},note,,Заметка {i}\n" for i in range(3000))
+    header = "topic,kind,type,content\n"
+    csv_path.write_bytes((header + rows).encode("utf-8") + b"SQL,note,,\xff\xfe\n")
+
+    with pytest.raises(UnicodeDecodeError):
+        import_file(storage, csv_path, chunk_size=1000)
+
+    assert path.read_bytes() == before
+    assert FileStorage(path).get_user().topics == []
+    assert storage.get_user().topics == []
+
+
+def test_export_streams_and_roundtrips_through_import(tmp_path):
+    """Тест потокового экспорта и повторного импорта CSV/JSON Lines."""
+    storage = FileStorage(tmp_path / "data.json")
+    with storage.session() as user:
+        for i in range(3):
+            topic = Topic(f"Тема {i}", "Описание")
+            user.add_topic(topic)
+            topic.add_resource(Resource("link", f"https://example.com/{i}"))
+            topic.add_note(Note("Текст, с запятой", "2024-01-01T12:00:00"))
+            topic.add_progress(ProgressEntry(50, "2024-01-02T00:00:00"))
+
+    # Заголовок документа и по части на тему
+    chunks = list(iter_export(FileStorage(tmp_path / "data.json"), "markdown"))
+    assert len(chunks) == 4
+    assert "<https://example.com/1>" in chunks[2]
+
+    for suffix in (".csv", ".jsonl"):
+        export_file(FileStorage(tmp_path / "data.json"), tmp_path / f"out{suffix}")
+        restored = FileStorage(tmp_path / f"restored{suffix}.json")
+        report = import_file(restored, tmp_path / f"out{suffix}")
+        assert (report.topics, report.resources, report.notes, report.progress) == (3, 3, 3, 3)
+        assert report.invalid == 0
+
+        topic = restored.get_user().get_topic("Тема 2")
+        assert topic.description == "Описание"
+        assert topic.notes[0].to_dict() == {"text": "Текст, с запятой", "created_at": "2024-01-01T12:00:00"}
+        assert topic.progress[0].to_dict() == {"percent": 50, "date": "2024-01-02T00:00:00"}
+
+
+def test_summary_reads_header_without_topics(tmp_path):
+    """Тест легкого пути: имя и количество тем без загрузки пользователя."""
+    path = tmp_path / "data.json"
+    storage = FileStorage(path)
+    assert storage.summary() is None
+    assert not storage.has_user()
+
+    with storage.session() as user:
+        user.username = "test_user"
+        for i in range(3):
+            user.add_topic(Topic(f"Тема {i}"))
+
+    fresh = FileStorage(path)
+    assert fresh.has_user()
+    assert fresh.summary() == {"username": "test_user", "topics": 3}
+    assert fresh._user is None
+
+    # Старый снимок без заголовка "meta": темы пропускаются потоково
+    path.write_text(
+        '{"user": {"username": "old", "topics": [{"title": "a"}, {"title": "b"}]}}',
+        encoding="utf-8",
+    )
+    assert FileStorage(path).summary() == {"username": "old", "topics": 2}
+
+
+def test_truncated_snapshot_is_not_reported_as_user(tmp_path):
+    """Тест: обрезанный снимок не считается пользователем и уходит в .corrupt."""
+    path = tmp_path / "data.json"
+    path.write_text('{"user": {"username": "te', encoding="utf-8")
+    assert not FileStorage(path).has_user()
+    assert (tmp_path / "data.json.corrupt").exists()
+
+    path.write_text('{"meta": {"username": "test_user", "topi', encoding="utf-8")
+    assert FileStorage(path).summary() is None
+    assert not path.exists()
+
+
+def test_multi_user_partitions_are_isolated(tmp_path):
+    """Тест разделов: сохранение одного пользователя не трогает других."""
+    users = MultiUserStorage(tmp_path / "users")
+    with users.session("Анна") as anna:
+        anna.add_topic(Topic("Python"))
+    with users.session("bob") as bob:
+        bob.add_topic(Topic("Go"))
+
+    anna_file = users.storage_for("Анна").filepath
+    bob_file = users.storage_for("bob").filepath
+    assert anna_file != bob_file
+    bob_stamp = bob_file.stat().st_mtime_ns
+
+    with users.session("Анна") as anna:
+        anna.topics[0].add_note(Note("Генераторы"))
+
+    assert bob_file.stat().st_mtime_ns == bob_stamp
+    assert users.list_users() == ["Анна", "bob"]
+
+    fresh = MultiUserStorage(tmp_path / "users")
+    assert fresh.get_user("Анна").username == "Анна"
+    assert [t.title for t in fresh.get_user("bob").topics] == ["Go"]
+    with pytest.raises(ValueError):
+        fresh.create_user("bob")
+
+
+def _concurrent_user_creator(root: str, worker: int, users: int) -> None:
+    """Процесс для стресс-теста: создает своих пользователей в общем индексе."""
+    storage = MultiUserStorage(root, fsync="never")
+    for i in range(users):
+        storage.create_user(f"user-{worker}-{i}")
+
+
+@pytest.mark.skipif(fcntl is None, reason="нужен fcntl")
+def test_multi_user_index_survives_concurrent_processes(tmp_path):
+    """Стресс-тест: параллельные процессы создают пользователей без потерь в индексе."""
+    workers, users = 6, 10
+    root = str(tmp_path / "users")
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=_concurrent_user_creator, args=(root, w, users)) for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+    assert all(process.exitcode == 0 for process in processes)
+
+    storage = MultiUserStorage(root)
+    expected = {f"user-{w}-{i}" for w in range(workers) for i in range(users)}
+    assert set(storage.list_users()) == expected
+    assert all(storage.has_user(name) for name in expected)
+    assert not storage.has_user("нет такого")
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_multi_user_migrate_legacy_file(tmp_path, journal):
+    """Тест переноса однопользовательского data.json в раздел."""
+    legacy = FileStorage(tmp_path / "data.json")
+    legacy.create_user("old_user")
+    with legacy.session() as user:
+        user.add_topic(Topic("SQL", "Базы данных"))
+
+    users = MultiUserStorage(tmp_path / "users", journal=journal)
+    users.migrate(tmp_path / "data.json")
+
+    user = MultiUserStorage(tmp_path / "users", journal=journal).get_user("old_user")
+    assert user.get_topic("sql").description == "Базы данных"
+
+
+def test_concurrent_sessions_merge_by_topic(tmp_path):
+    """Тест объединения изменений двух экземпляров, открывших один файл."""
+    path = tmp_path / "data.json"
+    FileStorage(path).create_user("test_user")
+    first, second = FileStorage(path), FileStorage(path)
+    # Второй экземпляр прочитал файл до того, как первый его изменил
+    stale = second.get_user()
+
+    with first.session() as user:
+        topic = Topic("Python")
+        topic.add_note(Note("Первая"))
+        user.add_topic(topic)
+    topic = Topic("python")
+    topic.add_note(Note("Вторая"))
+    stale.add_topic(topic)
+    second.update_user(stale)
+
+    topics = FileStorage(path).get_user().topics
+    assert [t.title for t in topics] == ["Python"]
+    assert [n.text for n in topics[0].notes] == ["Первая", "Вторая"]
+
+    stale = first.get_user()
+    with second.session() as user:
+        user.topics[0].description = "Правка вне журнала"
+    stale.topics[0].description = "Конфликт"
+    with pytest.raises(ConcurrentModificationError):
+        first.update_user(stale)
+    assert first.get_user().topics[0].description == "Правка вне журнала"
+
+
+def _concurrent_writer(path: str, journal: bool, worker: int, sessions: int) -> None:
+    """Процесс для стресс-теста: добавляет заметки в общую и свою тему."""
+    storage = FileStorage(path, journal=journal, compact_every=7, fsync="never")
+    for i in range(sessions):
+        with storage.session() as user:
+            shared = user.get_topic("Общая")
+            if shared is None:
+                shared = Topic("Общая")
+                user.add_topic(shared)
+            shared.add_note(Note(f"{worker}-{i}"))
+            own = user.get_topic(f"Процесс {worker}")
+            if own is None:
+                own = Topic(f"Процесс {worker}")
+                user.add_topic(own)
+            own.add_progress(ProgressEntry(i))
+
+
+@pytest.mark.skipif(fcntl is None, reason="нужен fcntl")
+@pytest.mark.parametrize("journal", [False, True])
+def test_concurrent_writer_processes_lose_nothing(tmp_path, journal):
+    """Стресс-тест: параллельные процессы пишут в один файл без потерь."""
+    workers, sessions = 6, 30
+    path = str(tmp_path / "data.json")
+    FileStorage(path, journal=journal).create_user("test_user")
+
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=_concurrent_writer, args=(path, journal, w, sessions))
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+    assert all(process.exitcode == 0 for process in processes)
+
+    user = FileStorage(path).get_user()
+    assert len(user.topics) == workers + 1
+    notes = sorted(n.text for n in user.get_topic("Общая").notes)
+    assert notes == sorted(f"{w}-{i}" for w in range(workers) for i in range(sessions))
+    for w in range(workers):
+        assert len(user.get_topic(f"Процесс {w}").progress) == sessions
+
+
+def _concurrent_searcher(path: str, rounds: int) -> None:
+    """Процесс для стресс-теста: заново строит и сохраняет поисковый индекс."""
+    index_path = f"{path}.search"
+    for _ in range(rounds):
+        try:
+            os.unlink(index_path)
+        except FileNotFoundError:
+            pass
+        assert FileStorage(path).search("декораторы")
+
+
+@pytest.mark.skipif(fcntl is None, reason="нужен fcntl")
+def test_concurrent_search_index_writes(tmp_path):
+    """Стресс-тест: процессы одновременно сохраняют поисковый индекс."""
+    path = str(tmp_path / "data.json")
+    with FileStorage(path).session() as user:
+        for t in range(50):
+            topic = Topic(f"Тема {t}")
+            user.add_topic(topic)
+            topic.add_note(Note(f"Декораторы и генераторы {t}"))
+
+    ctx = multiprocessing.get_context("fork")
+    processes = [ctx.Process(target=_concurrent_searcher, args=(path, 30)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+    assert all(process.exitcode == 0 for process in processes)
+
+    assert len(FileStorage(path).search("декораторы", limit=100)) == 50
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_threadsafe_sessions_with_background_flush(tmp_path, monkeypatch):
+    """Тест потокобезопасного режима: параллельные сессии и фоновая запись."""
+    path = tmp_path / "data.json"
+    FileStorage(path).create_user("test_user")
+    storage = FileStorage(path, journal=True, flush_interval=0.05)
+    writes = []
+    append = storage._journal.append
+    monkeypatch.setattr(
+        storage._journal, "append", lambda records, **kw: writes.append(1) or append(records, **kw)
+    )
+
+    def writer(worker: int) -> None:
+        for i in range(50):
+            with storage.session() as user:
+                topic = user.get_topic("Общая")
+                if topic is None:
+                    topic = Topic("Общая")
+                    user.add_topic(topic)
+                topic.add_note(Note(f"{worker}-{i}"))
+            with storage.reading() as user:
+                assert user.get_topic("Общая") is not None
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    storage.close()
+
+    notes = FileStorage(path).get_user().get_topic("Общая").notes
+    assert len(notes) == 8 * 50
+    assert len(writes) < 8 * 50
+
+
+def test_closed_storage_is_released(tmp_path):
+    """Тест: после close() хук atexit не удерживает хранилище в памяти."""
+    path = tmp_path / "data.json"
+    FileStorage(path).create_user("test_user")
+    refs = []
+    for _ in range(3):
+        storage = FileStorage(path, flush_interval=0.05)
+        storage.close()
+        storage.close()
+        refs.append(weakref.ref(storage))
+    del storage
+    gc.collect()
+
+    assert all(ref() is None for ref in refs)
+
+
+def test_threadsafe_readers_run_in_parallel(tmp_path):
+    """Тест блокировки: читатели не ждут друг друга, пока нет писателя."""
+    storage = FileStorage(tmp_path / "data.json", threadsafe=True)
+    storage.create_user("test_user")
+    both_inside = threading.Barrier(2, timeout=5)
+    errors = []
+
+    def reader() -> None:
+        with storage.reading() as user:
+            try:
+                both_inside.wait()
+            except threading.BrokenBarrierError as exc:
+                errors.append(exc)
+            assert user.username == "test_user"
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+    with storage.reading():
+        with pytest.raises(RuntimeError):
+            with storage.session():
+                pass
+
+
+def test_threadsafe_readers_see_full_lazy_topics(tmp_path):
+    """Тест ленивой загрузки тем параллельными читателями."""
+    path = tmp_path / "data.json"
+    with FileStorage(path).session() as user:
+        for t in range(50):
+            topic = Topic(f"Тема {t}")
+            for i in range(200):
+                topic.add_note(Note(f"Заметка {i}"))
+            user.add_topic(topic)
+
+    # Частое переключение потоков, чтобы гонка проявлялась стабильно
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(5):
+            storage = FileStorage(path, threadsafe=True)
+            totals = []
+            start = threading.Barrier(4, timeout=5)
+
+            def reader() -> None:
+                with storage.reading() as user:
+                    start.wait()
+                    totals.append(sum(len(t.notes) for t in user.topics))
+
+            threads = [threading.Thread(target=reader) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert totals == [50 * 200] * 4
+    finally:
+        sys.setswitchinterval(interval)
+